@@ -37,7 +37,8 @@ options:
   name:
     description:
       - Name of the table.
-    required: true
+      - Required unless C(tables) is given.
+    required: false
   hash_key_name:
     description:
       - Name of the hash key.
@@ -71,6 +72,40 @@ options:
       - Write throughput capacity (units) to provision.
     required: false
     default: 1
+  tables:
+    description:
+      - List of tables to manage in one run, as dictionaries with the keys name, state, hash_key_name,
+        hash_key_type, range_key_name, range_key_type, read_capacity, write_capacity and indexes. Keys left out
+        take the value of the module option of the same name.
+      - indexes is a list of global secondary indexes, as dictionaries with the keys name, type (C(global_all),
+        C(global_keys_only) or C(global_include)), hash_key_name, hash_key_type, range_key_name, range_key_type,
+        includes, read_capacity and write_capacity. Missing indexes are added and the throughput of existing ones
+        is updated; indexes that are not listed are left alone.
+      - Creates, updates and deletes of different tables run side by side, at most C(max_concurrent) at a time,
+        and are waited for with one shared polling loop. The result lists the seconds each table took to become
+        active.
+    required: false
+    default: null
+    version_added: "2.1"
+  wait:
+    description:
+      - With C(tables), wait until every table is active or deleted.
+      - Tables needing several steps, such as an update followed by new indexes, are always followed until their last step has been sent.
+    required: false
+    default: true
+    version_added: "2.1"
+  wait_timeout:
+    description:
+      - How many seconds to wait for the tables.
+    required: false
+    default: 600
+    version_added: "2.1"
+  max_concurrent:
+    description:
+      - How many tables may be created, updated or deleted at the same time. AWS allows 10 by default.
+    required: false
+    default: 10
+    version_added: "2.1"
   region:
     description:
       - The AWS region to use. If not specified then the value of the EC2_REGION environment variable, if any, is used.
@@ -104,6 +139,26 @@ EXAMPLES = '''
     name: my-table
     region: us-east-1
     state: absent
+
+# Create the tables of a tenant side by side and wait for them
+- dynamodb_table:
+    region: us-east-1
+    hash_key_name: id
+    tables:
+      - name: tenant1-users
+      - name: tenant1-orders
+        range_key_name: create_time
+        range_key_type: NUMBER
+        read_capacity: 5
+        write_capacity: 5
+        indexes:
+          - name: by-user
+            type: global_keys_only
+            hash_key_name: user_id
+            read_capacity: 2
+            write_capacity: 2
+      - name: tenant0-orders
+        state: absent
 '''
 
 RETURN = '''
@@ -112,13 +167,21 @@ table_status:
     returned: success
     type: string
     sample: ACTIVE
+tables:
+    description: With C(tables), the actions taken on each table, its status and the seconds it took to become active or be deleted.
+    returned: success
+    type: list
+    sample: [{"name": "tenant1-users", "actions": ["create"], "changed": true, "table_status": "ACTIVE", "seconds": 21.4}]
 '''
 
+import time
+
 try:
     import boto
     import boto.dynamodb2
     from boto.dynamodb2.table import Table
     from boto.dynamodb2.fields import HashKey, RangeKey
+    from boto.dynamodb2.fields import GlobalAllIndex, GlobalKeysOnlyIndex, GlobalIncludeIndex
     from boto.dynamodb2.types import STRING, NUMBER, BINARY
     from boto.exception import BotoServerError, NoAuthHandlerFound, JSONResponseError
     HAS_BOTO = True
@@ -133,6 +196,19 @@ DYNAMO_TYPE_MAP = {
     'BINARY': BINARY
 }
 
+INDEX_TYPE_MAP = {
+    'global_all': GlobalAllIndex,
+    'global_keys_only': GlobalKeysOnlyIndex,
+    'global_include': GlobalIncludeIndex,
+}
+
+TABLE_SPEC_KEYS = ['state', 'hash_key_name', 'hash_key_type', 'range_key_name', 'range_key_type',
+                   'read_capacity', 'write_capacity']
+
+# seconds between two polls of the tables being changed
+POLL_DELAY = 2
+POLL_MAX_DELAY = 20
+
 
 def create_or_update_dynamo_table(connection, module):
     table_name = module.params.get('name')
@@ -246,21 +322,197 @@ def has_throughput_changed(table, new_throughput):
            new_throughput['write'] != table.throughput['write']
 
 
+def key_schema(spec):
+    schema = [HashKey(spec['hash_key_name'], DYNAMO_TYPE_MAP.get(spec.get('hash_key_type') or 'STRING'))]
+    if spec.get('range_key_name'):
+        schema.append(RangeKey(spec['range_key_name'], DYNAMO_TYPE_MAP.get(spec.get('range_key_type') or 'STRING')))
+    return schema
+
+
+def global_index(spec):
+    throughput = {'read': int(spec.get('read_capacity', 1)), 'write': int(spec.get('write_capacity', 1))}
+    index_type = spec.get('type', 'global_all')
+    kwargs = {}
+    if index_type == 'global_include':
+        kwargs['includes'] = spec.get('includes', [])
+    return INDEX_TYPE_MAP[index_type](spec['name'], parts=key_schema(spec), throughput=throughput, **kwargs)
+
+
+def describe_table(connection, table_name):
+    try:
+        return connection.describe_table(table_name)['Table']
+    except JSONResponseError, e:
+        if e.message and e.message.startswith('Requested resource not found'):
+            return None
+        raise
+
+
+def table_settled(description):
+    if description is None or description['TableStatus'] != 'ACTIVE':
+        return False
+    for index in description.get('GlobalSecondaryIndexes', []):
+        if index.get('IndexStatus', 'ACTIVE') != 'ACTIVE' or index.get('Backfilling'):
+            return False
+    return True
+
+
+def table_specs(module):
+    specs = []
+    for entry in module.params.get('tables'):
+        if not isinstance(entry, dict) or not entry.get('name'):
+            module.fail_json(msg='Each entry of tables must be a dictionary with a name.')
+        spec = dict((key, module.params.get(key)) for key in TABLE_SPEC_KEYS)
+        spec.update(entry)
+        if spec['state'] not in ('present', 'absent'):
+            module.fail_json(msg='Invalid state %s for table %s.' % (spec['state'], spec['name']))
+        for index in spec.get('indexes') or []:
+            if not index.get('name') or not index.get('hash_key_name') or \
+                    index.get('type', 'global_all') not in INDEX_TYPE_MAP:
+                module.fail_json(msg='Each index of table %s needs a name, a hash_key_name and a type of %s.' %
+                                     (spec['name'], ', '.join(INDEX_TYPE_MAP)))
+        specs.append(spec)
+    return specs
+
+
+def plan_table(spec, description):
+    """ Returns the steps for one table, each step waits for the previous one """
+    if spec['state'] == 'absent':
+        if description is None:
+            return []
+        return [('delete', None)]
+
+    indexes = spec.get('indexes') or []
+    throughput = {'read': int(spec['read_capacity']), 'write': int(spec['write_capacity'])}
+    if description is None:
+        if not spec.get('hash_key_name'):
+            raise ValueError('hash_key_name is required to create table %s' % spec['name'])
+        return [('create', dict(throughput=throughput, global_indexes=[global_index(i) for i in indexes]))]
+
+    steps = []
+    current = description['ProvisionedThroughput']
+    current_indexes = dict((index['IndexName'], index) for index in description.get('GlobalSecondaryIndexes', []))
+    index_throughput = {}
+    for index in indexes:
+        existing = current_indexes.get(index['name'])
+        if existing is None:
+            # DynamoDB adds one global secondary index per update
+            steps.append(('add_index', global_index(index)))
+            continue
+        wanted = {'read': int(index.get('read_capacity', 1)), 'write': int(index.get('write_capacity', 1))}
+        if wanted['read'] != existing['ProvisionedThroughput']['ReadCapacityUnits'] or \
+                wanted['write'] != existing['ProvisionedThroughput']['WriteCapacityUnits']:
+            index_throughput[index['name']] = wanted
+
+    # DynamoDB rejects an update that sends the table's unchanged throughput
+    if throughput['read'] == current['ReadCapacityUnits'] and throughput['write'] == current['WriteCapacityUnits']:
+        throughput = None
+    if throughput or index_throughput:
+        steps.insert(0, ('update', dict(throughput=throughput, global_indexes=index_throughput or None)))
+    return steps
+
+
+def run_table_step(connection, spec, step):
+    action, args = step
+    table = Table(spec['name'], connection=connection)
+    if action == 'create':
+        Table.create(spec['name'], schema=key_schema(spec), throughput=args['throughput'],
+                     global_indexes=args['global_indexes'] or None, connection=connection)
+    elif action == 'update':
+        table.update(throughput=args['throughput'], global_indexes=args['global_indexes'])
+    elif action == 'add_index':
+        table.create_global_secondary_index(args)
+    elif action == 'delete':
+        connection.delete_table(spec['name'])
+
+
+def batch_dynamo_tables(connection, module):
+    wait = module.params.get('wait')
+    deadline = time.time() + module.params.get('wait_timeout')
+    max_concurrent = max(module.params.get('max_concurrent'), 1)
+
+    results = []
+    pending = []
+    try:
+        for spec in table_specs(module):
+            try:
+                steps = plan_table(spec, describe_table(connection, spec['name']))
+            except ValueError, e:
+                module.fail_json(msg=str(e))
+            result = dict(name=spec['name'], actions=[step[0] for step in steps], changed=bool(steps))
+            results.append(result)
+            if steps:
+                pending.append((spec, steps, result))
+
+        if module.check_mode:
+            module.exit_json(changed=bool(pending), tables=results)
+
+        in_flight = []
+        delay = POLL_DELAY
+        while pending or in_flight:
+            # start as many tables as AWS lets change at the same time
+            while pending and len(in_flight) < max_concurrent:
+                spec, steps, result = pending.pop(0)
+                run_table_step(connection, spec, steps.pop(0))
+                in_flight.append((spec, steps, result, time.time()))
+
+            # without wait, tables are still followed until their last step has been sent
+            if not wait and not pending and not [flight for flight in in_flight if flight[1]]:
+                break
+            if time.time() >= deadline:
+                module.fail_json(msg='Timed out waiting for tables %s' % ', '.join(f[0]['name'] for f in in_flight),
+                                 tables=results)
+            time.sleep(delay)
+
+            progressed = False
+            for flight in list(in_flight):
+                spec, steps, result, started = flight
+                description = describe_table(connection, spec['name'])
+                if spec['state'] == 'absent':
+                    done = description is None
+                else:
+                    done = table_settled(description)
+                if not done:
+                    continue
+                progressed = True
+                if steps:
+                    run_table_step(connection, spec, steps.pop(0))
+                    continue
+                in_flight.remove(flight)
+                result['seconds'] = round(time.time() - started, 1)
+                result['table_status'] = description['TableStatus'] if description else 'DELETED'
+            delay = POLL_DELAY if progressed else min(delay * 2, POLL_MAX_DELAY)
+
+        for spec, steps, result, started in in_flight:
+            result['table_status'] = 'DELETING' if spec['state'] == 'absent' else 'UPDATING'
+
+    except BotoServerError:
+        module.fail_json(msg='Failed to create/update/delete dynamo tables due to error: ' + traceback.format_exc(),
+                         tables=results)
+
+    module.exit_json(changed=any(result['changed'] for result in results), tables=results)
+
+
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(dict(
         state=dict(default='present', choices=['present', 'absent']),
-        name=dict(required=True, type='str'),
-        hash_key_name=dict(required=True, type='str'),
+        name=dict(type='str'),
+        hash_key_name=dict(type='str'),
         hash_key_type=dict(default='STRING', type='str', choices=['STRING', 'NUMBER', 'BINARY']),
         range_key_name=dict(type='str'),
         range_key_type=dict(default='STRING', type='str', choices=['STRING', 'NUMBER', 'BINARY']),
         read_capacity=dict(default=1, type='int'),
         write_capacity=dict(default=1, type='int'),
+        tables=dict(type='list'),
+        wait=dict(default=True, type='bool'),
+        wait_timeout=dict(default=600, type='int'),
+        max_concurrent=dict(default=10, type='int'),
     ))
 
     module = AnsibleModule(
         argument_spec=argument_spec,
+        required_one_of=[['name', 'tables']],
+        mutually_exclusive=[['name', 'tables']],
         supports_check_mode=True)
 
     if not HAS_BOTO:
@@ -277,7 +529,11 @@ def main():
         module.fail_json(msg=str(e))
 
     state = module.params.get('state')
-    if state == 'present':
+    if module.params.get('tables'):
+        batch_dynamo_tables(connection, module)
+    elif state == 'present':
+        if not module.params.get('hash_key_name'):
+            module.fail_json(msg='hash_key_name is required when state=present')
         create_or_update_dynamo_table(connection, module)
     elif state == 'absent':
         delete_dynamo_table(connection, module)
@@ -29,8 +29,17 @@ options:
   region:
     description:
       - the destination region that AMI should be copied to
-    required: true
+      - Required unless C(regions) is given.
+    required: false
     aliases: ['aws_region', 'ec2_region', 'dest_region']
+  regions:
+    description:
+      - List of destination regions to copy the AMI to at the same time, instead of C(region).
+      - All copies are started at once and, with C(wait), polled together; each copy is tagged as soon as it is available.
+      - The image id, state and copy duration of every region is returned in C(images).
+    required: false
+    default: null
+    version_added: "2.1"
   source_image_id:
     description:
       - the id of the image in source region that should be copied
@@ -78,10 +87,23 @@ EXAMPLES = '''
     tags: '{"Name":"SuperService-new-AMI", "type":"SuperService"}'
     wait: yes
   register: image_id
+
+# Roll a golden image out to several regions at once
+- local_action:
+    module: ec2_ami_copy
+    source_region: eu-west-1
+    regions: [ us-east-1, us-west-2, ap-southeast-1, sa-east-1 ]
+    source_image_id: ami-xxxxxxx
+    name: golden-image
+    tags: '{"Name":"golden-image"}'
+    wait: yes
+    wait_timeout: 3600
+  register: images
 '''
 
 
 import sys
+import threading
 import time
 
 try:
@@ -95,6 +117,10 @@ except ImportError:
 if not HAS_BOTO:
     module.fail_json(msg='boto required for this module')
 
+# Copies take minutes, so polling starts slowly and backs off further
+POLL_DELAY = 5
+POLL_MAX_DELAY = 60
+
 def copy_image(module, ec2):
     """
     Copies an AMI
@@ -170,6 +196,106 @@ def wait_until_image_is_recognized(module, ec2, wait_timeout, image_id, wait):
         module.fail_json(msg="timed out waiting for image to be recognized")
 
 
+def copy_image_to_regions(module, regions, boto_params):
+    """
+    Copies an AMI to several regions at once
+
+    module : AnsibleModule object
+    regions: destination regions
+    boto_params: connection parameters shared by every region
+    """
+
+    params = {'source_region': module.params.get('source_region'),
+              'source_image_id': module.params.get('source_image_id'),
+              'name': module.params.get('name'),
+              'description': module.params.get('description')
+    }
+    tags = module.params.get('tags')
+    wait_timeout = int(module.params.get('wait_timeout'))
+
+    copies = [dict(region=region) for region in regions]
+
+    def start(copy):
+        try:
+            copy['ec2'] = connect_to_aws(boto.ec2, copy['region'], **boto_params)
+            copy['started'] = time.time()
+            copy['image_id'] = copy['ec2'].copy_image(**params).image_id
+        except boto.exception.BotoServerError, e:
+            copy['error'] = "%s: %s" % (e.error_code, e.error_message)
+        except Exception, e:
+            copy['error'] = str(e)
+
+    threads = [threading.Thread(target=start, args=(copy,)) for copy in copies]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if module.params.get('wait'):
+        wait_until_images_are_copied(copies, wait_timeout, tags)
+    else:
+        for copy in copies:
+            if 'image_id' in copy:
+                tag_copy(copy, tags)
+
+    images = []
+    for copy in copies:
+        image = dict(region=copy['region'], image_id=copy.get('image_id'), state=copy.get('state', 'image_id' in copy and 'pending' or None))
+        for key in ('seconds', 'error'):
+            if key in copy:
+                image[key] = copy[key]
+        images.append(image)
+    image_ids = dict((image['region'], image['image_id']) for image in images if image['image_id'])
+
+    failed = [image for image in images if 'error' in image]
+    if failed:
+        module.fail_json(msg="AMI copy failed in %s" % ', '.join(image['region'] for image in failed),
+                         changed=bool(image_ids), image_ids=image_ids, images=images)
+    module.exit_json(msg="AMI copy operation complete", image_ids=image_ids, images=images, changed=True)
+
+
+def tag_copy(copy, tags):
+    if tags:
+        try:
+            copy['ec2'].create_tags([copy['image_id']], tags)
+        except Exception as e:
+            copy['error'] = str(e)
+
+
+# wait for every copy with one poller, tagging each as soon as it is available
+def wait_until_images_are_copied(copies, wait_timeout, tags):
+    deadline = time.time() + wait_timeout
+    delay = POLL_DELAY
+    pending = [copy for copy in copies if 'image_id' in copy]
+    while pending:
+        for copy in list(pending):
+            try:
+                img = copy['ec2'].get_image(copy['image_id'])
+            except boto.exception.EC2ResponseError, e:
+                # This exception we expect initially right after registering the copy with EC2 API
+                if 'InvalidAMIID.NotFound' not in e.error_code:
+                    copy['error'] = "%s: %s" % (e.error_code, e.error_message)
+                    pending.remove(copy)
+                continue
+            if img is None:
+                # DescribeImages can come back empty right after CopyImage too
+                continue
+            copy['state'] = img.state
+            if img.state == 'available':
+                copy['seconds'] = round(time.time() - copy['started'], 1)
+                tag_copy(copy, tags)
+                pending.remove(copy)
+            elif img.state != 'pending':
+                copy['error'] = "image is %s" % img.state
+                pending.remove(copy)
+        if not pending or time.time() >= deadline:
+            break
+        time.sleep(min(delay, max(deadline - time.time(), 0)))
+        delay = min(delay * 2, POLL_MAX_DELAY)
+    for copy in pending:
+        copy['error'] = "timed out waiting for image to be copied"
+
+
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(dict(
@@ -179,10 +305,15 @@ def main():
         description=dict(default=""),
         wait=dict(type='bool', default=False),
         wait_timeout=dict(default=1200),
-        tags=dict(type='dict')))
+        tags=dict(type='dict'),
+        regions=dict(type='list')))
 
     module = AnsibleModule(argument_spec=argument_spec)
 
+    if module.params.get('regions'):
+        region, ec2_url, boto_params = get_aws_connection_info(module)
+        copy_image_to_regions(module, module.params.get('regions'), boto_params)
+
     try:
         ec2 = ec2_connect(module)
     except boto.exception.NoAuthHandlerFound, e:
@@ -28,6 +28,25 @@ options:
     required: false
     default: null
     aliases: ['elb_ids', 'ec2_elbs']
+  tags:
+    description:
+      - Add the tags of each ELB, fetched with DescribeTags for 20 ELBs per call.
+    required: false
+    default: false
+    version_added: "2.1"
+  instance_health:
+    description:
+      - Add the health of the instances behind each ELB, fetched with DescribeInstanceHealth calls spread over C(workers) threads.
+      - If the call fails for some ELBs the module fails, and those ELBs carry the error in C(instance_health_error) instead.
+    required: false
+    default: false
+    version_added: "2.1"
+  workers:
+    description:
+      - Number of concurrent DescribeInstanceHealth calls.
+    required: false
+    default: 8
+    version_added: "2.1"
 extends_documentation_fragment: aws
 '''
 
@@ -68,8 +87,17 @@ EXAMPLES = '''
     msg: "{{ item.dns_name }}"
   with_items: elb_facts.elbs
 
+# Gather facts about all ELBs with their tags and instance health
+- action:
+    module: ec2_elb_facts
+    tags: yes
+    instance_health: yes
+  register: elb_facts
+
 '''
 
+import threading
+import time
 import xml.etree.ElementTree as ET
 
 try:
@@ -79,6 +107,9 @@ try:
 except ImportError:
     HAS_BOTO = False
 
+# DescribeTags takes at most 20 load balancer names
+TAGS_BATCH_SIZE = 20
+
 
 def get_error_message(xml_string):
 
@@ -147,28 +178,169 @@ def get_elb_info(elb):
     return elb_info
 
 
-def list_elb(connection, module):
+class ApiCalls(object):
+    """ Times AWS calls, per action """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def call(self, action, func, *args, **kwargs):
+        started = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.time() - started
+            with self.lock:
+                stats = self.stats.setdefault(action, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+                stats['calls'] += 1
+                stats['seconds'] += elapsed
+                stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+
+    def report(self):
+        report = {}
+        for action, stats in self.stats.items():
+            report[action] = {
+                'calls': stats['calls'],
+                'seconds': round(stats['seconds'], 3),
+                'avg_seconds': round(stats['seconds'] / stats['calls'], 3),
+                'max_seconds': round(stats['max_seconds'], 3),
+            }
+        return report
+
+
+def get_all_elbs(connection, api_calls, elb_names):
+    elbs = []
+    marker = None
+    while True:
+        page = api_calls.call('DescribeLoadBalancers', connection.get_all_load_balancers,
+                              elb_names, marker=marker)
+        elbs.extend(page)
+        marker = getattr(page, 'next_marker', None)
+        if not marker:
+            return elbs
+
+
+def strip_namespace(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def describe_tags(connection, elb_names):
+    # boto has no call for the ELB DescribeTags action
+    params = {}
+    for i, name in enumerate(elb_names):
+        params['LoadBalancerNames.member.%d' % (i + 1)] = name
+    response = connection.make_request('DescribeTags', params)
+    body = response.read()
+    if response.status != 200:
+        raise BotoServerError(response.status, response.reason, body)
+
+    tags = {}
+    for element in ET.fromstring(body).getiterator():
+        if strip_namespace(element.tag) != 'TagDescriptions':
+            continue
+        for description in element:
+            fields = dict((strip_namespace(child.tag), child) for child in description)
+            elb_tags = {}
+            if 'Tags' in fields:
+                for tag in fields['Tags']:
+                    tag_fields = dict((strip_namespace(child.tag), child.text) for child in tag)
+                    elb_tags[tag_fields.get('Key')] = tag_fields.get('Value') or ''
+            tags[fields['LoadBalancerName'].text] = elb_tags
+    return tags
+
+
+def get_elb_tags(connection, api_calls, elb_names):
+    tags = {}
+    for i in range(0, len(elb_names), TAGS_BATCH_SIZE):
+        batch = elb_names[i:i + TAGS_BATCH_SIZE]
+        tags.update(api_calls.call('DescribeTags', describe_tags, connection, batch))
+    return tags
+
+
+def get_instance_health(connect, api_calls, elb_names, workers):
+    health = {}
+    errors = {}
+
+    def worker(names):
+        # boto connections are not shared between threads
+        connection = None
+        for name in names:
+            try:
+                if connection is None:
+                    connection = connect()
+                states = api_calls.call('DescribeInstanceHealth', connection.describe_instance_health, name)
+                health[name] = [{
+                    'instance_id': state.instance_id,
+                    'state': state.state,
+                    'reason_code': state.reason_code,
+                    'description': state.description,
+                } for state in states]
+            except Exception as e:
+                errors[name] = e
+
+    workers = max(min(workers, len(elb_names)), 1)
+    threads = [threading.Thread(target=worker, args=(elb_names[n::workers],)) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # messages are extracted here, so a body that fails to parse is not lost in a thread
+    for name, e in errors.items():
+        if isinstance(e, BotoServerError):
+            errors[name] = get_error_message(e.args[2]) or str(e)
+        else:
+            errors[name] = str(e)
+    return health, errors
+
+
+def list_elb(connection, connect, module):
     elb_names = module.params.get("names")
     if not elb_names:
         elb_names = None
 
+    api_calls = ApiCalls()
     try:
-        all_elbs = connection.get_all_load_balancers(elb_names)
+        all_elbs = get_all_elbs(connection, api_calls, elb_names)
     except BotoServerError as e:
         module.fail_json(msg=get_error_message(e.args[2]))
 
     elb_array = []
     for elb in all_elbs:
         elb_array.append(get_elb_info(elb))
+    names = [elb['name'] for elb in elb_array]
 
-    module.exit_json(elbs=elb_array)
+    if module.params.get('tags') and names:
+        try:
+            tags = get_elb_tags(connection, api_calls, names)
+        except BotoServerError as e:
+            module.fail_json(msg=get_error_message(e.args[2]))
+        for elb in elb_array:
+            elb['tags'] = tags.get(elb['name'], {})
+
+    if module.params.get('instance_health') and names:
+        health, errors = get_instance_health(connect, api_calls, names, module.params.get('workers'))
+        for elb in elb_array:
+            if elb['name'] in errors:
+                elb['instance_health_error'] = errors[elb['name']]
+            else:
+                elb['instance_health'] = health[elb['name']]
+        if errors:
+            module.fail_json(msg="Failed to describe the instance health of %d of %d ELBs" % (len(errors), len(names)),
+                             elbs=elb_array, api_calls=api_calls.report())
+
+    module.exit_json(elbs=elb_array, api_calls=api_calls.report())
 
 
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            names={'default': None, 'type': 'list'}
+            names={'default': None, 'type': 'list'},
+            tags={'default': False, 'type': 'bool'},
+            instance_health={'default': False, 'type': 'bool'},
+            workers={'default': 8, 'type': 'int'},
         )
     )
 
@@ -179,15 +351,18 @@ def main():
 
     region, ec2_url, aws_connect_params = get_aws_connection_info(module)
 
-    if region:
-        try:
-            connection = connect_to_aws(boto.ec2.elb, region, **aws_connect_params)
-        except (boto.exception.NoAuthHandlerFound, StandardError), e:
-            module.fail_json(msg=str(e))
-    else:
+    if not region:
         module.fail_json(msg="region must be specified")
 
-    list_elb(connection, module)
+    def connect():
+        return connect_to_aws(boto.ec2.elb, region, **aws_connect_params)
+
+    try:
+        connection = connect()
+    except (boto.exception.NoAuthHandlerFound, StandardError), e:
+        module.fail_json(msg=str(e))
+
+    list_elb(connection, connect, module)
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.ec2 import *
@@ -75,6 +75,26 @@ options:
     description:
       - By default, interfaces perform source/destination checks. NAT instances however need this check to be disabled. You can only specify this flag when the interface is being modified, not on creation.
     required: false  
+  interfaces:
+    description:
+      - List of existing interfaces to attach, detach or move between instances in one run, instead of eni_id. Each entry takes eni_id, instance_id ('None' to detach), device_index and force_detach, the last two falling back to the module's values.
+      - An interface already attached to its instance_id is only moved when the entry sets a different device_index. Attaching needs a device_index of 1 or more, from the entry or the module.
+      - All interfaces are described with one call. Interfaces are first detached, then attached, concurrently, and each phase waits for every interface with one describe call per poll.
+    required: false
+    default: null
+    version_added: "2.1"
+  wait_timeout:
+    description:
+      - With interfaces, how many seconds to wait for each of the detach and attach phases.
+    required: false
+    default: 300
+    version_added: "2.1"
+  workers:
+    description:
+      - With interfaces, how many attach or detach calls are made at the same time.
+    required: false
+    default: 10
+    version_added: "2.1"
 extends_documentation_fragment: aws
 '''
 
@@ -128,8 +148,22 @@ EXAMPLES = '''
     eni_id: {{ "eni.interface.id" }}
     delete_on_termination: true
 
+# Fail over: move interfaces to the standby instance and detach another
+- ec2_eni:
+    force_detach: yes
+    interfaces:
+      - eni_id: eni-xxxxxxx
+        instance_id: i-yyyyyyy
+        device_index: 1
+      - eni_id: eni-zzzzzzz
+        instance_id: i-yyyyyyy
+        device_index: 2
+      - eni_id: eni-wwwwwww
+        instance_id: None
+
 '''
 
+import threading
 import time
 import xml.etree.ElementTree as ET
 import re
@@ -174,18 +208,21 @@ def get_eni_info(interface):
     
     return interface_info
     
+def eni_has_status(eni, status):
+
+    # If the status is detached we just need attachment to disappear
+    if eni.attachment is None:
+        return status == "detached"
+    return status == "attached" and eni.attachment.status == "attached"
+
+
 def wait_for_eni(eni, status):
     
     while True:
         time.sleep(3)
         eni.update()
-        # If the status is detached we just need attachment to disappear
-        if eni.attachment is None:
-            if status == "detached":
-                break
-        else:
-            if status == "attached" and eni.attachment.status == "attached":
-                break
+        if eni_has_status(eni, status):
+            break
         
     
 def create_eni(connection, module):
@@ -346,6 +383,161 @@ def get_sec_group_list(groups):
     return remote_security_groups
 
 
+def describe_enis(connection, eni_ids):
+
+    # A filter, unlike a list of ids, doesn't fail the whole call when one interface is missing
+    all_eni = connection.get_all_network_interfaces(filters={'network-interface-id': eni_ids})
+    return dict((eni.id, eni) for eni in all_eni)
+
+
+def wait_for_enis(connection, eni_ids, status, deadline):
+    """ Polls all the interfaces with one describe call per round, returning those that didn't reach status """
+
+    pending = list(eni_ids)
+    delay = 1
+    while pending:
+        enis = describe_enis(connection, pending)
+        pending = [eni_id for eni_id in pending if eni_id in enis and not eni_has_status(enis[eni_id], status)]
+        if not pending or time.time() >= deadline:
+            break
+        time.sleep(min(delay, max(deadline - time.time(), 0)))
+        delay = min(delay * 2, 10)
+    return pending
+
+
+def change_enis(connect, func, specs, workers):
+    """ Calls func(connection, spec) for the specs on up to workers threads, each with its own connection,
+    and returns the error message of every spec that failed, by interface id """
+
+    errors = {}
+
+    def worker(indexes):
+        connection = None
+        for i in indexes:
+            try:
+                if connection is None:
+                    connection = connect()
+                func(connection, specs[i])
+            except BotoServerError as e:
+                errors[specs[i]['eni_id']] = get_error_message(e.body) or str(e)
+            except Exception as e:
+                errors[specs[i]['eni_id']] = str(e)
+
+    workers = max(min(workers, len(specs)), 1)
+    threads = [threading.Thread(target=worker, args=(range(n, len(specs), workers),)) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def eni_specs(module):
+
+    specs = []
+    for entry in module.params.get("interfaces"):
+        if not isinstance(entry, dict) or not entry.get("eni_id") or "instance_id" not in entry:
+            module.fail_json(msg="each of interfaces needs an eni_id and an instance_id, got %s" % entry)
+        instance_id = entry["instance_id"]
+        if instance_id == 'None':
+            instance_id = None
+        # Only an explicit device_index is compared with the current attachment
+        device_index = entry.get("device_index")
+        if device_index is not None:
+            device_index = int(device_index)
+            if device_index == 0 and instance_id is not None:
+                module.fail_json(msg="%s can not be attached at device_index 0, the instance's primary interface" % entry["eni_id"])
+        specs.append(dict(eni_id=entry["eni_id"],
+                          instance_id=instance_id,
+                          device_index=device_index,
+                          force_detach=module.boolean(entry.get("force_detach", module.params.get("force_detach")))))
+    eni_ids = [spec['eni_id'] for spec in specs]
+    duplicates = sorted(set(eni_id for eni_id in eni_ids if eni_ids.count(eni_id) > 1))
+    if duplicates:
+        module.fail_json(msg="interfaces lists %s more than once" % ', '.join(duplicates))
+    return specs
+
+
+def batch_attach_enis(connection, connect, module):
+
+    specs = eni_specs(module)
+    eni_ids = [spec['eni_id'] for spec in specs]
+    wait_timeout = module.params.get("wait_timeout")
+    workers = module.params.get("workers")
+
+    try:
+        enis = describe_enis(connection, eni_ids)
+    except BotoServerError as e:
+        module.fail_json(msg=get_error_message(e.args[2]))
+
+    errors = {}
+    to_detach = []
+    to_attach = []
+    for spec in specs:
+        eni = enis.get(spec['eni_id'])
+        if eni is None:
+            errors[spec['eni_id']] = "The networkInterface ID '%s' does not exist" % spec['eni_id']
+            continue
+        attachment = eni.attachment
+        if spec['instance_id'] is None:
+            if attachment is not None:
+                to_detach.append(spec)
+        elif attachment is not None and attachment.instance_id == spec['instance_id'] and spec['device_index'] in (None, int(attachment.device_index)):
+            continue
+        elif spec['device_index'] is None and int(module.params.get("device_index")) == 0:
+            errors[spec['eni_id']] = "device_index must be set to attach the interface to %s" % spec['instance_id']
+        else:
+            if spec['device_index'] is None:
+                spec['device_index'] = int(module.params.get("device_index"))
+            # Moving an interface means detaching it first
+            if attachment is not None:
+                to_detach.append(spec)
+            to_attach.append(spec)
+
+    changed_ids = set()
+
+    # Detach everything before attaching, so interfaces can be swapped between instances
+    def detach(connection, spec):
+        connection.detach_network_interface(enis[spec['eni_id']].attachment.id, spec['force_detach'])
+
+    def attach(connection, spec):
+        connection.attach_network_interface(spec['eni_id'], spec['instance_id'], spec['device_index'])
+
+    for func, specs_to_change, status in ((detach, to_detach, "detached"), (attach, to_attach, "attached")):
+        specs_to_change = [spec for spec in specs_to_change if spec['eni_id'] not in errors]
+        if not specs_to_change:
+            continue
+        errors.update(change_enis(connect, func, specs_to_change, workers))
+        started = [spec['eni_id'] for spec in specs_to_change if spec['eni_id'] not in errors]
+        changed_ids.update(started)
+        try:
+            for eni_id in wait_for_enis(connection, started, status, time.time() + wait_timeout):
+                errors[eni_id] = "timed out waiting for the interface to be %s" % status
+        except BotoServerError as e:
+            module.fail_json(msg=get_error_message(e.args[2]), changed=bool(changed_ids))
+
+    try:
+        enis = describe_enis(connection, eni_ids)
+    except BotoServerError as e:
+        module.fail_json(msg=get_error_message(e.args[2]), changed=bool(changed_ids))
+
+    interfaces = []
+    for eni_id in eni_ids:
+        if eni_id in enis:
+            interface = get_eni_info(enis[eni_id])
+        else:
+            interface = {'id': eni_id}
+        interface['changed'] = eni_id in changed_ids
+        if eni_id in errors:
+            interface['error'] = errors[eni_id]
+        interfaces.append(interface)
+
+    changed = bool(changed_ids)
+    if errors:
+        module.fail_json(msg="Failed to update %d of %d interfaces" % (len(errors), len(eni_ids)), changed=changed, interfaces=interfaces)
+    module.exit_json(changed=changed, interfaces=interfaces)
+
+
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
@@ -360,11 +552,15 @@ def main():
             state = dict(default='present', choices=['present', 'absent']),
             force_detach = dict(default='no', type='bool'),
             source_dest_check = dict(default=None, type='bool'),
-            delete_on_termination = dict(default=None, type='bool')
+            delete_on_termination = dict(default=None, type='bool'),
+            interfaces = dict(type='list'),
+            wait_timeout = dict(default=300, type='int'),
+            workers = dict(default=10, type='int')
         )
     )
     
-    module = AnsibleModule(argument_spec=argument_spec)
+    module = AnsibleModule(argument_spec=argument_spec,
+                           mutually_exclusive = [ [ 'eni_id', 'interfaces' ] ])
 
     if not HAS_BOTO:
         module.fail_json(msg='boto required for this module')
@@ -382,7 +578,11 @@ def main():
     state = module.params.get("state")
     eni_id = module.params.get("eni_id")
 
-    if state == 'present':
+    if module.params.get("interfaces"):
+        if state != 'present':
+            module.fail_json(msg="interfaces can only be given with state=present")
+        batch_attach_enis(connection, lambda: connect_to_aws(boto.ec2, region, **aws_connect_params), module)
+    elif state == 'present':
         if eni_id is None:
             if module.params.get("subnet_id") is None:
                 module.fail_json(msg="subnet_id must be specified when state=present")
@@ -292,22 +292,28 @@ def rename_key(d, old_key, new_key):
     del d[old_key]
 
 
-def index_of_matching_route(route_spec, routes_to_match):
-    for i, route in enumerate(routes_to_match):
-        if route_spec_matches_route(route_spec, route):
-            return i
+def index_routes(routes):
+    # a route table holds at most one route per destination CIDR
+    return dict((route.destination_cidr_block, route) for route in routes
+                if route.destination_cidr_block is not None)
 
 
-def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
-                  check_mode):
-    routes_to_match = list(route_table.routes)
-    route_specs_to_create = []
+def plan_routes(route_table, route_specs, propagating_vgw_ids):
+    routes_by_destination = index_routes(route_table.routes)
+    plan = {'create': [], 'replace': [], 'delete': []}
+    seen = set()
     for route_spec in route_specs:
-        i = index_of_matching_route(route_spec, routes_to_match)
-        if i is None:
-            route_specs_to_create.append(route_spec)
-        else:
-            del routes_to_match[i]
+        destination = route_spec['destination_cidr_block']
+        if destination in seen:
+            raise AnsibleRouteTableException(
+                'Route destination {0} is given more than once'.format(destination))
+        seen.add(destination)
+
+        route = routes_by_destination.pop(destination, None)
+        if route is None:
+            plan['create'].append(route_spec)
+        elif not route_spec_matches_route(route_spec, route):
+            plan['replace'].append(route_spec)
 
     # NOTE: As of boto==2.38.0, the origin of a route is not available
     # (for example, whether it came from a gateway with route propagation
@@ -315,64 +321,74 @@ def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
     # correct than checking whether the route uses a propagating VGW.
     # The current logic will leave non-propagated routes using propagating
     # VGWs in place.
-    routes_to_delete = [r for r in routes_to_match
-                        if r.gateway_id != 'local'
-                        and r.gateway_id not in propagating_vgw_ids]
-
-    changed = routes_to_delete or route_specs_to_create
-    if changed:
-        for route_spec in route_specs_to_create:
-            vpc_conn.create_route(route_table.id,
-                                  dry_run=check_mode,
-                                  **route_spec)
-
-        for route in routes_to_delete:
-            vpc_conn.delete_route(route_table.id,
-                                  route.destination_cidr_block,
-                                  dry_run=check_mode)
+    plan['delete'] = [r for r in routes_by_destination.values()
+                      if r.gateway_id != 'local'
+                      and r.gateway_id not in propagating_vgw_ids]
+    return plan
+
+
+def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
+                  check_mode):
+    plan = plan_routes(route_table, route_specs, propagating_vgw_ids or [])
+
+    for route_spec in plan['create']:
+        vpc_conn.create_route(route_table.id,
+                              dry_run=check_mode,
+                              **route_spec)
+
+    for route_spec in plan['replace']:
+        vpc_conn.replace_route(route_table.id,
+                               dry_run=check_mode,
+                               **route_spec)
+
+    for route in plan['delete']:
+        vpc_conn.delete_route(route_table.id,
+                              route.destination_cidr_block,
+                              dry_run=check_mode)
+
+    changed = bool(plan['create'] or plan['replace'] or plan['delete'])
     return {'changed': changed}
 
 
-def ensure_subnet_association(vpc_conn, vpc_id, route_table_id, subnet_id,
-                              check_mode):
-    route_tables = vpc_conn.get_all_route_tables(
-        filters={'association.subnet_id': subnet_id, 'vpc_id': vpc_id}
-    )
-    for route_table in route_tables:
-        if route_table.id is None:
-            continue
+def get_subnet_associations(vpc_conn, vpc_id):
+    # one query for the associations of every subnet of the VPC
+    associations = {}
+    for route_table in vpc_conn.get_all_route_tables(filters={'vpc_id': vpc_id}):
         for a in route_table.associations:
-            if a.subnet_id == subnet_id:
-                if route_table.id == route_table_id:
-                    return {'changed': False, 'association_id': a.id}
-                else:
-                    if check_mode:
-                        return {'changed': True}
-                    vpc_conn.disassociate_route_table(a.id)
-
-    association_id = vpc_conn.associate_route_table(route_table_id, subnet_id)
-    return {'changed': True, 'association_id': association_id}
+            if a.subnet_id:
+                associations[a.subnet_id] = (route_table.id, a.id)
+    return associations
 
 
 def ensure_subnet_associations(vpc_conn, vpc_id, route_table, subnets,
                                check_mode):
-    current_association_ids = [a.id for a in route_table.associations]
-    new_association_ids = []
-    changed = False
-    for subnet in subnets:
-        result = ensure_subnet_association(
-            vpc_conn, vpc_id, route_table.id, subnet.id, check_mode)
-        changed = changed or result['changed']
-        if changed and check_mode:
-            return {'changed': True}
-        new_association_ids.append(result['association_id'])
+    associations = get_subnet_associations(vpc_conn, vpc_id)
+    subnet_ids = set(subnet.id for subnet in subnets)
 
-    to_delete = [a_id for a_id in current_association_ids
-                 if a_id not in new_association_ids]
+    to_associate = []
+    to_move = []
+    for subnet_id in sorted(subnet_ids):
+        current = associations.get(subnet_id)
+        if current is None:
+            to_associate.append(subnet_id)
+        elif current[0] != route_table.id:
+            to_move.append(current[1])
+
+    to_delete = [a_id for subnet_id, (rt_id, a_id) in associations.items()
+                 if rt_id == route_table.id and subnet_id not in subnet_ids]
+
+    changed = bool(to_associate or to_move or to_delete)
+    if check_mode:
+        return {'changed': changed}
+
+    for subnet_id in to_associate:
+        vpc_conn.associate_route_table(route_table.id, subnet_id)
+
+    for a_id in to_move:
+        vpc_conn.replace_route_table_association_with_assoc(a_id, route_table.id)
 
     for a_id in to_delete:
-        changed = True
-        vpc_conn.disassociate_route_table(a_id, dry_run=check_mode)
+        vpc_conn.disassociate_route_table(a_id)
 
     return {'changed': changed}
 
@@ -508,6 +524,8 @@ def ensure_route_table_present(connection, module):
             changed = changed or result['changed']
         except EC2ResponseError as e:
             module.fail_json(msg=e.message)
+        except AnsibleRouteTableException as e:
+            module.fail_json(msg=e.args[0])
 
     if propagating_vgw_ids is not None:
         result = ensure_propagation(connection, route_table,
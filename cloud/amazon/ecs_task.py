@@ -20,6 +20,7 @@ module: ecs_task
 short_description: run, start or stop a task in ecs
 description:
     - Creates or deletes instances of task definitions.
+    - Can stop every task of a family or started by the same caller, and wait for the tasks it runs, starts or stops to reach their target status.
 version_added: "2.0"
 author: Mark Chance(@Java1Guy)
 options:
@@ -43,11 +44,31 @@ options:
     count:
         description:
             - How many new instances to start
+            - Counts above 10, the most ECS runs in one call, are launched in several calls.
         required: False
     task:
         description:
             - The task to stop
+            - When omitted with C(operation=stop), every running task matching C(family) and C(started_by) is stopped.
         required: False
+    family:
+        description:
+            - With C(operation=stop) and no C(task), stop every running task of this task definition family.
+        required: False
+        version_added: "2.1"
+    wait:
+        description:
+            - Wait for the tasks to reach RUNNING (C(run) and C(start)) or STOPPED (C(stop)).
+            - Tasks are tracked with batched describe calls, and each task's start latency and failure reason is returned.
+        required: False
+        default: False
+        version_added: "2.1"
+    wait_timeout:
+        description:
+            - How many seconds to wait for the tasks.
+        required: False
+        default: 600
+        version_added: "2.1"
     container_instances:
         description:
             - The list of container instances on which to deploy the task
@@ -55,6 +76,7 @@ options:
     started_by:
         description:
             - A value showing who or what started the task (for informational purposes)
+            - With C(operation=stop) and no C(task), only tasks started by this value are stopped.
         required: False
 '''
 
@@ -88,13 +110,40 @@ EXAMPLES = '''
       cluster: console-sample-app-static-cluster
       task_definition: console-sample-app-static-taskdef
       task: "arn:aws:ecs:us-west-2:172139249013:task/3f8353d1-29a8-4689-bbf6-ad79937ffe8a"
+
+- name: Run 50 batch tasks and wait until they are all running
+  ecs_task:
+      operation: run
+      cluster: batch-cluster
+      task_definition: batch-job
+      count: 50
+      started_by: nightly
+      wait: yes
+
+- name: Stop every task started by the nightly run and wait until they have stopped
+  ecs_task:
+      operation: stop
+      cluster: batch-cluster
+      family: batch-job
+      started_by: nightly
+      wait: yes
 '''
 RETURN = '''
 task:
     description: details about the tast that was started
     type: complex
     sample: "TODO: include sample"
+tasks:
+    description: status of every task run, started or stopped, with the start latency and failure reason of each when C(wait) is set
+    type: list
+    sample: [{"arn": "arn:aws:ecs:us-west-2:172139249013:task/3f8353d1-29a8-4689-bbf6-ad79937ffe8a", "last_status": "RUNNING", "start_latency": 4.2, "seconds": 10.1}]
+failures:
+    description: tasks ECS could not place or describe, with the reason given
+    type: list
+    sample: [{"arn": "arn:aws:ecs:us-west-2:172139249013:container-instance/79c23f22-876c-438a-bddf-55c98a3538a8", "reason": "RESOURCE:MEMORY"}]
 '''
+import time
+
 try:
     import json
     import boto
@@ -109,6 +158,12 @@ try:
 except ImportError:
     HAS_BOTO3 = False
 
+# The most tasks ECS runs, or describes, in one call
+RUN_TASK_BATCH = 10
+DESCRIBE_TASKS_BATCH = 100
+POLL_DELAY = 2
+POLL_MAX_DELAY = 20
+
 class EcsExecManager:
     """Handles ECS Tasks"""
 
@@ -123,29 +178,59 @@ class EcsExecManager:
         except boto.exception.NoAuthHandlerFound, e:
             self.module.fail_json(msg="Can't authorize connection - "+str(e))
 
+    def list_task_arns(self, cluster, family=None, started_by=None, status='RUNNING'):
+        args = dict(desiredStatus=status)
+        if cluster:
+            args['cluster'] = cluster
+        if family:
+            args['family'] = family
+        if started_by:
+            args['startedBy'] = started_by
+        arns = []
+        while True:
+            response = self.ecs.list_tasks(**args)
+            arns.extend(response['taskArns'])
+            if not response.get('nextToken'):
+                return arns
+            args['nextToken'] = response['nextToken']
+
     def list_tasks(self, cluster_name, service_name, status):
-        response = self.ecs.list_tasks(
-            cluster=cluster_name,
-            family=service_name,
-            desiredStatus=status
-        )
-        if len(response['taskArns'])>0:
-            for c in response['taskArns']:
-                if c.endswith(service_name):
-                    return c
+        for c in self.list_task_arns(cluster_name, family=service_name, status=status):
+            if c.endswith(service_name):
+                return c
         return None
 
+    def describe_tasks(self, cluster, arns):
+        tasks = []
+        failures = []
+        for i in range(0, len(arns), DESCRIBE_TASKS_BATCH):
+            args = dict(tasks=arns[i:i + DESCRIBE_TASKS_BATCH])
+            if cluster:
+                args['cluster'] = cluster
+            response = self.ecs.describe_tasks(**args)
+            tasks.extend(response['tasks'])
+            failures.extend(response['failures'])
+        return tasks, failures
+
     def run_task(self, cluster, task_definition, overrides, count, startedBy):
         if overrides is None:
             overrides = dict()
-        response = self.ecs.run_task(
-            cluster=cluster,
-            taskDefinition=task_definition,
-            overrides=overrides,
-            count=count,
-            startedBy=startedBy)
+        tasks = []
+        failures = []
+        remaining = count or 1
+        while remaining > 0:
+            batch = min(remaining, RUN_TASK_BATCH)
+            response = self.ecs.run_task(
+                cluster=cluster,
+                taskDefinition=task_definition,
+                overrides=overrides,
+                count=batch,
+                startedBy=startedBy)
+            tasks.extend(response['tasks'])
+            failures.extend(response['failures'])
+            remaining -= batch
         # include tasks and failures
-        return response['tasks']
+        return tasks, failures
 
     def start_task(self, cluster, task_definition, overrides, container_instances, startedBy):
         args = dict()
@@ -161,12 +246,54 @@ class EcsExecManager:
             args['startedBy']=startedBy
         response = self.ecs.start_task(**args)
         # include tasks and failures
-        return response['tasks']
+        return response['tasks'], response['failures']
 
     def stop_task(self, cluster, task):
         response = self.ecs.stop_task(cluster=cluster, task=task)
         return response['task']
 
+    def wait_for_tasks(self, cluster, arns, target_status, timeout):
+        """ Polls the tasks until each has reached target_status or stopped, returning their reports and any describe failures """
+        started = time.time()
+        deadline = started + timeout
+        delay = POLL_DELAY
+        pending = set(arns)
+        tasks = dict()
+        seconds = dict()
+        failures = []
+        while True:
+            described, missing = self.describe_tasks(cluster, sorted(pending))
+            for task in described:
+                tasks[task['taskArn']] = task
+                if task['lastStatus'] in (target_status, 'STOPPED'):
+                    pending.discard(task['taskArn'])
+                    seconds[task['taskArn']] = time.time() - started
+            for failure in missing:
+                failures.append(dict(arn=failure.get('arn'), reason=failure.get('reason')))
+                pending.discard(failure.get('arn'))
+            if not pending or time.time() >= deadline:
+                break
+            time.sleep(min(delay, max(deadline - time.time(), 0)))
+            delay = min(delay * 2, POLL_MAX_DELAY)
+        reports = [task_report(tasks[arn], target_status, seconds.get(arn)) for arn in arns if arn in tasks]
+        return reports, failures
+
+
+def task_report(task, target_status, seconds):
+    report = dict(arn=task['taskArn'], last_status=task['lastStatus'])
+    if task.get('createdAt') and task.get('startedAt'):
+        report['start_latency'] = round((task['startedAt'] - task['createdAt']).total_seconds(), 3)
+    if seconds is not None:
+        report['seconds'] = round(seconds, 3)
+    if task['lastStatus'] != target_status:
+        if seconds is None:
+            report['failure'] = "timed out waiting for %s" % target_status
+        else:
+            reasons = [c['reason'] for c in task.get('containers', []) if c.get('reason')]
+            report['failure'] = '; '.join([task.get('stoppedReason') or 'task stopped'] + reasons)
+    return report
+
+
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(dict(
@@ -177,7 +304,10 @@ def main():
         count=dict(required=False, type='int' ), # R
         task=dict(required=False, type='str' ), # P*
         container_instances=dict(required=False, type='list'), # S*
-        started_by=dict(required=False, type='str' ) # R S
+        started_by=dict(required=False, type='str' ), # R S P
+        family=dict(required=False, type='str' ), # P
+        wait=dict(required=False, default=False, type='bool'), # R S P
+        wait_timeout=dict(required=False, default=600, type='int') # R S P
     ))
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
@@ -205,29 +335,36 @@ def main():
         status_type = "RUNNING"
 
     if module.params['operation'] == 'stop':
-        if not 'task' in module.params and module.params['task'] is None:
-            module.fail_json(msg="To stop a task, a task must be specified")
+        if module.params['task'] is None and module.params['family'] is None and module.params['started_by'] is None:
+            module.fail_json(msg="To stop a task, a task, or the family or started_by of the tasks to stop, must be specified")
         if not 'task_definition' in module.params and module.params['task_definition'] is None:
             module.fail_json(msg="To stop a task, a task definition must be specified")
         task_to_list = module.params['task_definition']
         status_type = "STOPPED"
 
     service_mgr = EcsExecManager(module)
-    existing = service_mgr.list_tasks(module.params['cluster'], task_to_list, status_type)
+    bulk_stop = module.params['operation'] == 'stop' and module.params['task'] is None
+    if bulk_stop:
+        existing = None
+    else:
+        existing = service_mgr.list_tasks(module.params['cluster'], task_to_list, status_type)
 
     results = dict(changed=False)
+    # ARNs of the tasks this call runs, starts or stops
+    launched = []
     if module.params['operation'] == 'run':
         if existing:
             # TBD - validate the rest of the details
             results['task']=existing
         else:
             if not module.check_mode:
-                results['task'] = service_mgr.run_task(
+                results['task'], results['failures'] = service_mgr.run_task(
                     module.params['cluster'],
                     module.params['task_definition'],
                     module.params['overrides'],
                     module.params['count'],
                     module.params['started_by'])
+                launched = [task['taskArn'] for task in results['task']]
             results['changed'] = True
 
     elif module.params['operation'] == 'start':
@@ -236,15 +373,28 @@ def main():
             results['task']=existing
         else:
             if not module.check_mode:
-                results['task'] = service_mgr.start_task(
+                results['task'], results['failures'] = service_mgr.start_task(
                     module.params['cluster'],
                     module.params['task_definition'],
                     module.params['overrides'],
                     module.params['container_instances'],
                     module.params['started_by']
                 )
+                launched = [task['taskArn'] for task in results['task']]
             results['changed'] = True
 
+    elif bulk_stop:
+        # every running task of the family or caller, across all pages
+        launched = service_mgr.list_task_arns(
+            module.params['cluster'],
+            family=module.params['family'],
+            started_by=module.params['started_by'])
+        if launched and not module.check_mode:
+            for arn in launched:
+                service_mgr.stop_task(module.params['cluster'], arn)
+        results['tasks'] = [dict(arn=arn) for arn in launched]
+        results['changed'] = bool(launched)
+
     elif module.params['operation'] == 'stop':
         if existing:
             results['task']=existing
@@ -256,8 +406,21 @@ def main():
                     module.params['cluster'],
                     module.params['task']
                 )
+                launched = [results['task']['taskArn']]
             results['changed'] = True
 
+    if module.params['wait'] and launched and not module.check_mode:
+        if module.params['operation'] == 'stop':
+            target_status = 'STOPPED'
+        else:
+            target_status = 'RUNNING'
+        results['tasks'], failures = service_mgr.wait_for_tasks(
+            module.params['cluster'], launched, target_status, module.params['wait_timeout'])
+        results['failures'] = results.get('failures', []) + failures
+        failed = [task for task in results['tasks'] if 'failure' in task]
+        if failed or failures:
+            module.fail_json(msg="%d of %d tasks did not reach %s" % (len(failed) + len(failures), len(launched), target_status), **results)
+
     module.exit_json(**results)
 
 # import module snippets
@@ -22,6 +22,8 @@ description:
   - Creates and deletes DNS Health checks in Amazons Route53 service
   - Only the port, resource_path, string_match and request_interval are
     considered when updating existing health-checks.
+  - Existing health-checks are listed once, page by page, and matched on
+    their ip_address, fqdn, type and request_interval.
 version_added: "2.0"
 options:
   state:
@@ -45,7 +47,8 @@ options:
     description:
       - The type of health check that you want to create, which indicates how
         Amazon Route 53 determines whether an endpoint is healthy.
-    required: true
+      - Required unless every entry of C(health_checks) sets it.
+    required: false
     choices: [ 'HTTP', 'HTTPS', 'HTTP_STR_MATCH', 'HTTPS_STR_MATCH', 'TCP' ]
   resource_path:
     description:
@@ -88,6 +91,24 @@ options:
     required: true
     default: 3
     choices: [ 1, 2, 3, 4, 5, 6, 7, 8, 9, 10 ]
+  health_checks:
+    description:
+      - List of health-checks to create, update or delete in one run. Each
+        entry takes the same keys as the module (state, ip_address, port,
+        type, resource_path, fqdn, string_match, request_interval and
+        failure_threshold), falling back to the module's values.
+      - The changes are made concurrently, and the id, action and any error
+        of each health-check is returned in C(health_checks).
+    required: false
+    default: null
+    version_added: "2.1"
+  workers:
+    description:
+      - With C(health_checks), how many health-checks are created, updated or
+        deleted at the same time.
+    required: false
+    default: 10
+    version_added: "2.1"
 author: "zimbatm (@zimbatm)"
 extends_documentation_fragment: aws
 '''
@@ -121,8 +142,20 @@ EXAMPLES = '''
     state: absent
     fqdn: host1.example.com
 
+# Check every web host, in one run
+- route53_health_check:
+    state: present
+    type: HTTP
+    resource_path: /status
+    health_checks:
+      - fqdn: web1.example.com
+      - fqdn: web2.example.com
+      - fqdn: web3.example.com
+        port: 8080
+
 '''
 
+import threading
 import time
 import uuid
 
@@ -136,23 +169,47 @@ try:
 except ImportError:
     HAS_BOTO = False
 
+HEALTH_CHECK_TYPES = ['HTTP', 'HTTPS', 'HTTP_STR_MATCH', 'HTTPS_STR_MATCH', 'TCP']
+REQUEST_INTERVALS = [10, 30]
+FAILURE_THRESHOLDS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+# Options an entry of health_checks can set
+HEALTH_CHECK_OPTIONS = ['state', 'ip_address', 'port', 'type', 'resource_path', 'fqdn',
+                        'string_match', 'request_interval', 'failure_threshold']
+
 # Things that can't get changed:
 #  protocol
 #  ip_address or domain
 #  request_interval
 #  string_match if not previously enabled
-def find_health_check(conn, wanted):
+def health_check_key(ip_addr, fqdn, hc_type, request_interval):
+    """The immutable values identifying a health check"""
+    return (ip_addr, fqdn, hc_type, str(request_interval))
+
+def index_health_checks(conn):
+    """Lists every health check, following the pagination markers, keyed by health_check_key"""
+    index = {}
+    marker = None
+    while True:
+        # dict lookups on the response do not recurse like attribute access does
+        listing = conn.get_list_health_checks(marker=marker)['ListHealthChecksResponse']
+        for check in listing['HealthChecks']:
+            config = check.HealthCheckConfig
+            key = health_check_key(config.get('IPAddress'), config.get('FullyQualifiedDomainName'), config.get('Type'), config.get('RequestInterval'))
+            # keep the first match, as the linear search did
+            index.setdefault(key, check)
+        if listing.get('IsTruncated') != 'true':
+            return index
+        marker = listing['NextMarker']
+
+def find_health_check(index, wanted):
     """Searches for health checks that have the exact same set of immutable values"""
-    for check in conn.get_list_health_checks().HealthChecks:
-        config = check.HealthCheckConfig
-        if config.get('IPAddress') == wanted.ip_addr and config.get('FullyQualifiedDomainName') == wanted.fqdn and config.get('Type') == wanted.hc_type and config.get('RequestInterval') == str(wanted.request_interval):
-            return check
-    return None
+    return index.get(health_check_key(wanted.ip_addr, wanted.fqdn, wanted.hc_type, wanted.request_interval))
 
 def to_health_check(config):
     return HealthCheck(
         config.get('IPAddress'),
-        config.get('Port'),
+        config.get('Port') and int(config.get('Port')),
         config.get('Type'),
         config.get('ResourcePath'),
         fqdn=config.get('FullyQualifiedDomainName'),
@@ -262,37 +319,32 @@ def update_health_check(conn, health_check_id, health_check_version, health_chec
     h.parse(body)
     return e
 
-def main():
-    argument_spec = ec2_argument_spec()
-    argument_spec.update(dict(
-            state               = dict(choices=['present', 'absent'], default='present'),
-            ip_address          = dict(),
-            port                = dict(type='int'),
-            type                = dict(required=True, choices=['HTTP', 'HTTPS', 'HTTP_STR_MATCH', 'HTTPS_STR_MATCH', 'TCP']),
-            resource_path       = dict(),
-            fqdn                = dict(),
-            string_match        = dict(),
-            request_interval    = dict(type='int', choices=[10, 30], default=30),
-            failure_threshold   = dict(type='int', choices=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], default=3),
-        )
-    )
-    module = AnsibleModule(argument_spec=argument_spec)
-
-    if not HAS_BOTO:
-        module.fail_json(msg='boto 2.27.0+ required for this module')
+def wanted_health_check(params):
+    """Validates the options of one health check, returning the HealthCheck they describe"""
+    type_in = params.get('type')
+    port_in = params.get('port')
+    string_match_in = params.get('string_match')
+    try:
+        if port_in is not None:
+            port_in = int(port_in)
+        request_interval_in = int(params.get('request_interval'))
+        failure_threshold_in = int(params.get('failure_threshold'))
+    except (TypeError, ValueError):
+        raise ValueError("parameters 'port', 'request_interval' and 'failure_threshold' must be integers")
 
-    state_in              = module.params.get('state')
-    ip_addr_in            = module.params.get('ip_address')
-    port_in               = module.params.get('port')
-    type_in               = module.params.get('type')
-    resource_path_in      = module.params.get('resource_path')
-    fqdn_in               = module.params.get('fqdn')
-    string_match_in       = module.params.get('string_match')
-    request_interval_in   = module.params.get('request_interval')
-    failure_threshold_in  = module.params.get('failure_threshold')
+    if params.get('state') not in ('present', 'absent'):
+        raise ValueError("parameter 'state' must be one of present, absent")
+    if type_in is None:
+        raise ValueError("parameter 'type' is required")
+    if type_in not in HEALTH_CHECK_TYPES:
+        raise ValueError("parameter 'type' must be one of %s" % ', '.join(HEALTH_CHECK_TYPES))
+    if request_interval_in not in REQUEST_INTERVALS:
+        raise ValueError("parameter 'request_interval' must be 10 or 30")
+    if failure_threshold_in not in FAILURE_THRESHOLDS:
+        raise ValueError("parameter 'failure_threshold' must be between 1 and 10")
 
-    if ip_addr_in is None and fqdn_in is None:
-        module.fail_json(msg="parameter 'ip_address' or 'fqdn' is required")
+    if params.get('ip_address') is None and params.get('fqdn') is None:
+        raise ValueError("parameter 'ip_address' or 'fqdn' is required")
 
     # Default port
     if port_in is None:
@@ -301,29 +353,39 @@ def main():
       elif type_in in ['HTTPS', 'HTTPS_STR_MATCH']:
         port_in = 443
       else:
-        module.fail_json(msg="parameter 'port' is required for 'type' TCP")
+        raise ValueError("parameter 'port' is required for 'type' TCP")
 
     # string_match in relation with type
     if type_in in ['HTTP_STR_MATCH', 'HTTPS_STR_MATCH']:
         if string_match_in is None:
-            module.fail_json(msg="parameter 'string_match' is required for the HTTP(S)_STR_MATCH types")
+            raise ValueError("parameter 'string_match' is required for the HTTP(S)_STR_MATCH types")
         elif len(string_match_in) > 255:
-            module.fail_json(msg="parameter 'string_match' is limited to 255 characters max")
+            raise ValueError("parameter 'string_match' is limited to 255 characters max")
     elif string_match_in:
-        module.fail_json(msg="parameter 'string_match' argument is only for the HTTP(S)_STR_MATCH types")
+        raise ValueError("parameter 'string_match' argument is only for the HTTP(S)_STR_MATCH types")
 
-    region, ec2_url, aws_connect_kwargs = get_aws_connection_info(module)
-    # connect to the route53 endpoint
-    try:
-        conn = Route53Connection(**aws_connect_kwargs)
-    except boto.exception.BotoServerError, e:
-        module.fail_json(msg = e.error_message)
+    return HealthCheck(params.get('ip_address'), port_in, type_in, params.get('resource_path'), params.get('fqdn'),
+                       string_match_in, request_interval_in, failure_threshold_in)
 
+def health_check_specs(module):
+    """Returns (state, HealthCheck) for each health check to manage, entries falling back to the module's options"""
+    specs = []
+    for entry in module.params.get('health_checks') or [dict()]:
+        params = dict((option, module.params.get(option)) for option in HEALTH_CHECK_OPTIONS)
+        params.update(entry)
+        try:
+            specs.append((params['state'], wanted_health_check(params)))
+        except ValueError, e:
+            if module.params.get('health_checks'):
+                module.fail_json(msg="%s in health_checks entry %s" % (e, entry))
+            module.fail_json(msg=str(e))
+    return specs
+
+def reconcile_health_check(conn, index, state_in, wanted_config):
     changed = False
     action = None
     check_id = None
-    wanted_config = HealthCheck(ip_addr_in, port_in, type_in, resource_path_in, fqdn_in, string_match_in, request_interval_in, failure_threshold_in)
-    existing_check = find_health_check(conn, wanted_config)
+    existing_check = find_health_check(index, wanted_config)
     if existing_check:
         check_id = existing_check.Id
         existing_config = to_health_check(existing_check.HealthCheckConfig)
@@ -335,7 +397,7 @@ def main():
             changed = True
         else:
             diff = health_check_diff(existing_config, wanted_config)
-            if not diff:
+            if diff:
                 action = "update"
                 update_health_check(conn, existing_check.Id, int(existing_check.HealthCheckVersion), wanted_config)
                 changed = True
@@ -344,10 +406,91 @@ def main():
             action = "delete"
             conn.delete_health_check(check_id)
             changed = True
-    else:
-        module.fail_json(msg = "Logic Error: Unknown state")
 
-    module.exit_json(changed=changed, health_check=dict(id=check_id), action=action)
+    return dict(id=check_id, action=action, changed=changed)
+
+def reconcile_health_checks(connect, index, specs, workers):
+    """Reconciles the specs on up to workers threads, each with its own connection, and returns their results in order"""
+    results = [None] * len(specs)
+
+    def worker(indexes):
+        conn = None
+        for i in indexes:
+            state_in, wanted_config = specs[i]
+            try:
+                if conn is None:
+                    conn = connect()
+                results[i] = reconcile_health_check(conn, index, state_in, wanted_config)
+            except boto.exception.BotoServerError, e:
+                results[i] = dict(id=None, action=None, changed=False, error=e.error_message or e.body)
+            except Exception, e:
+                results[i] = dict(id=None, action=None, changed=False, error=str(e))
+
+    workers = max(min(workers, len(specs)), 1)
+    threads = [threading.Thread(target=worker, args=(range(n, len(specs), workers),)) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def main():
+    argument_spec = ec2_argument_spec()
+    argument_spec.update(dict(
+            state               = dict(choices=['present', 'absent'], default='present'),
+            ip_address          = dict(),
+            port                = dict(type='int'),
+            type                = dict(choices=HEALTH_CHECK_TYPES),
+            resource_path       = dict(),
+            fqdn                = dict(),
+            string_match        = dict(),
+            request_interval    = dict(type='int', choices=REQUEST_INTERVALS, default=30),
+            failure_threshold   = dict(type='int', choices=FAILURE_THRESHOLDS, default=3),
+            health_checks       = dict(type='list'),
+            workers             = dict(type='int', default=10),
+        )
+    )
+    module = AnsibleModule(argument_spec=argument_spec)
+
+    if not HAS_BOTO:
+        module.fail_json(msg='boto 2.27.0+ required for this module')
+
+    specs = health_check_specs(module)
+
+    # An entry matching another one would be created twice
+    keys = set()
+    for state_in, wanted_config in specs:
+        key = health_check_key(wanted_config.ip_addr, wanted_config.fqdn, wanted_config.hc_type, wanted_config.request_interval)
+        if key in keys:
+            module.fail_json(msg="health_checks lists %s/%s %s every %ss more than once" % (key[0], key[1], key[2], key[3]))
+        keys.add(key)
+
+    region, ec2_url, aws_connect_kwargs = get_aws_connection_info(module)
+    # connect to the route53 endpoint
+    try:
+        conn = Route53Connection(**aws_connect_kwargs)
+    except boto.exception.BotoServerError, e:
+        module.fail_json(msg = e.error_message)
+
+    try:
+        index = index_health_checks(conn)
+    except boto.exception.BotoServerError, e:
+        module.fail_json(msg = e.error_message)
+
+    if not module.params.get('health_checks'):
+        state_in, wanted_config = specs[0]
+        try:
+            result = reconcile_health_check(conn, index, state_in, wanted_config)
+        except boto.exception.BotoServerError, e:
+            module.fail_json(msg = e.error_message)
+        module.exit_json(changed=result['changed'], health_check=dict(id=result['id']), action=result['action'])
+
+    results = reconcile_health_checks(lambda: Route53Connection(**aws_connect_kwargs), index, specs, module.params.get('workers'))
+    changed = any(result['changed'] for result in results)
+    failed = [result for result in results if 'error' in result]
+    if failed:
+        module.fail_json(msg="Failed to reconcile %d of %d health checks" % (len(failed), len(results)), changed=changed, health_checks=results)
+    module.exit_json(changed=changed, health_checks=results)
 
 # import module snippets
 from ansible.module_utils.basic import *
@@ -46,10 +46,53 @@ options:
             - Comment associated with the zone
         required: false
         default: ''
+    records:
+        description:
+            - Record sets the zone should hold, for example when migrating a zone. Each entry takes C(record), C(type), C(ttl) (default 3600), C(value) (a list) and C(state) (C(present), the default, or C(absent)).
+            - Only the record sets that are missing or differ are changed. The changes are submitted in batches of at most 1000 records.
+            - Only valid with C(state=present).
+        required: false
+        default: null
+        version_added: "2.1"
+    wait:
+        description:
+            - Wait until the record set changes are in sync on all Route53 DNS servers.
+        required: false
+        default: no
+        version_added: "2.1"
+    wait_timeout:
+        description:
+            - How many seconds to wait for the record set changes.
+        required: false
+        default: 300
+        version_added: "2.1"
 extends_documentation_fragment: aws
 author: "Christopher Troup (@minichate)"
 '''
 
+EXAMPLES = '''
+# Create a public zone
+- route53_zone:
+    zone: example.com.
+    comment: this is an example
+
+# Migrate the records of a zone and wait until they are served
+- route53_zone:
+    zone: example.com.
+    records:
+      - record: www.example.com.
+        type: A
+        ttl: 300
+        value: [ 192.0.2.10, 192.0.2.11 ]
+      - record: example.com.
+        type: MX
+        value: [ "10 mail.example.com." ]
+      - record: old.example.com.
+        type: CNAME
+        state: absent
+    wait: yes
+'''
+
 import time
 
 try:
@@ -57,11 +100,133 @@ try:
     import boto.ec2
     from boto import route53
     from boto.route53 import Route53Connection
+    from boto.route53.record import ResourceRecordSets
     from boto.route53.zone import Zone
     HAS_BOTO = True
 except ImportError:
     HAS_BOTO = False
 
+# Route53 accepts at most 1000 ResourceRecord elements in one ChangeResourceRecordSets request
+MAX_CHANGE_RECORDS = 1000
+
+
+def normalize_name(name):
+    return name.lower().replace('\\052', '*').rstrip('.') + '.'
+
+
+def list_hosted_zones_by_name(conn, dns_name):
+    """Lists the hosted zones named dns_name, following the pagination markers"""
+    zones = []
+    params = {'dnsname': dns_name}
+    while True:
+        response = conn.make_request('GET', '/%s/hostedzonesbyname' % conn.Version, params=params)
+        body = response.read()
+        boto.log.debug(body)
+        if response.status >= 300:
+            raise boto.route53.exception.DNSServerError(response.status, response.reason, body)
+        e = boto.jsonresponse.Element(list_marker='HostedZones', item_marker=('HostedZone',))
+        h = boto.jsonresponse.XmlHandler(e, None)
+        h.parse(body)
+        listing = e['ListHostedZonesByNameResponse']
+        for r53zone in listing['HostedZones']:
+            # zones are listed in name order, starting at dns_name
+            if normalize_name(r53zone['Name']) != normalize_name(dns_name):
+                return zones
+            zones.append(r53zone)
+        if listing.get('IsTruncated') != 'true':
+            return zones
+        params = {'dnsname': listing['NextDNSName'], 'hostedzoneid': listing['NextHostedZoneId']}
+
+
+def zone_vpcs(zone_details):
+    # this is to deal with this boto bug: https://github.com/boto/boto/pull/2882
+    if isinstance(zone_details['VPCs'], dict):
+        return [zone_details['VPCs']['VPC']]
+    else: # Forward compatibility for when boto fixes that bug
+        return zone_details['VPCs']
+
+
+def find_zone(conn, zone_in, vpc_id):
+    """Returns the id and GetHostedZone details of the zone named zone_in, preferring the private zone of vpc_id, then a public zone, or None"""
+    public_zone = None
+    private_zone = None
+    for r53zone in list_hosted_zones_by_name(conn, zone_in):
+        zone_id = r53zone['Id'].replace('/hostedzone/', '')
+        private = r53zone.get('Config', {}).get('PrivateZone') == 'true'
+        if not private:
+            public_zone = public_zone or (zone_id, None)
+            continue
+        if not vpc_id:
+            private_zone = private_zone or (zone_id, None)
+            continue
+        # only private zones of the right name need their VPCs looked up
+        zone_details = conn.get_hosted_zone(zone_id)['GetHostedZoneResponse']
+        if 'VPCs' in zone_details and vpc_id in [v['VPCId'] for v in zone_vpcs(zone_details)]:
+            return zone_id, zone_details
+    return public_zone or private_zone
+
+
+def record_changes(conn, zone_id, records):
+    """Returns the (action, name, type, ttl, values) changes that bring the zone's record sets in line with records"""
+    existing = {}
+    for rrset in conn.get_all_rrsets(zone_id):
+        if rrset.identifier is None and rrset.alias_dns_name is None:
+            existing[(normalize_name(rrset.name), rrset.type)] = rrset
+
+    changes = []
+    for record in records:
+        name = normalize_name(record['record'])
+        current = existing.get((name, record['type']))
+        if record.get('state', 'present') == 'absent':
+            if current is not None:
+                changes.append(('DELETE', current.name, current.type, current.ttl, current.resource_records))
+            continue
+        values = record.get('value')
+        if not isinstance(values, list):
+            values = [v.strip() for v in str(values).split(',')]
+        ttl = str(record.get('ttl', 3600))
+        if current is None or str(current.ttl) != ttl or sorted(current.resource_records) != sorted(values):
+            changes.append(('UPSERT', name, record['type'], ttl, values))
+    return changes
+
+
+def submit_changes(conn, zone_id, changes):
+    """Submits the changes in as few ChangeResourceRecordSets requests as the limits allow, returning their change ids"""
+    change_ids = []
+    batch = None
+    size = 0
+    for action, name, rtype, ttl, values in changes:
+        # an UPSERT counts as a DELETE and a CREATE
+        weight = len(values) * (2 if action == 'UPSERT' else 1)
+        if batch is not None and size + weight > MAX_CHANGE_RECORDS:
+            change_ids.append(commit_changes(batch))
+            batch = None
+        if batch is None:
+            batch = ResourceRecordSets(conn, zone_id)
+            size = 0
+        change = batch.add_change(action, name, rtype, ttl)
+        for value in values:
+            change.add_value(value)
+        size += weight
+    if batch is not None:
+        change_ids.append(commit_changes(batch))
+    return change_ids
+
+
+def commit_changes(batch):
+    result = batch.commit()
+    return result['ChangeResourceRecordSetsResponse']['ChangeInfo']['Id'].replace('/change/', '')
+
+
+def wait_for_changes(conn, change_ids, wait_timeout):
+    deadline = time.time() + wait_timeout
+    for change_id in change_ids:
+        while conn.get_change(change_id)['GetChangeResponse']['ChangeInfo']['Status'] != 'INSYNC':
+            if time.time() >= deadline:
+                return False
+            time.sleep(5)
+    return True
+
 
 def main():
     argument_spec = ec2_argument_spec()
@@ -70,7 +235,10 @@ def main():
             state=dict(default='present', choices=['present', 'absent']),
             vpc_id=dict(default=None),
             vpc_region=dict(default=None),
-            comment=dict(default='')))
+            comment=dict(default=''),
+            records=dict(type='list'),
+            wait=dict(type='bool', default=False),
+            wait_timeout=dict(type='int', default=300)))
     module = AnsibleModule(argument_spec=argument_spec)
 
     if not HAS_BOTO:
@@ -81,6 +249,15 @@ def main():
     vpc_id = module.params.get('vpc_id')
     vpc_region = module.params.get('vpc_region')
     comment = module.params.get('comment')
+    records = module.params.get('records')
+
+    if records and state != 'present':
+        module.fail_json(msg="records can only be given with state=present")
+    for record in records or []:
+        if not isinstance(record, dict) or 'record' not in record or 'type' not in record:
+            module.fail_json(msg="each of records needs a record and a type, got %s" % record)
+        if record.get('state', 'present') == 'present' and record.get('value') is None:
+            module.fail_json(msg="record %s needs a value" % record['record'])
 
     private_zone = vpc_id is not None and vpc_region is not None
 
@@ -92,22 +269,10 @@ def main():
     except boto.exception.BotoServerError, e:
         module.fail_json(msg=e.error_message)
 
-    results = conn.get_all_hosted_zones()
-    zones = {}
-
-    for r53zone in results['ListHostedZonesResponse']['HostedZones']:
-        zone_id = r53zone['Id'].replace('/hostedzone/', '')
-        zone_details = conn.get_hosted_zone(zone_id)['GetHostedZoneResponse']
-        if vpc_id and 'VPCs' in zone_details:
-            # this is to deal with this boto bug: https://github.com/boto/boto/pull/2882
-            if isinstance(zone_details['VPCs'], dict):
-                if zone_details['VPCs']['VPC']['VPCId'] == vpc_id:
-                    zones[r53zone['Name']] = zone_id
-            else: # Forward compatibility for when boto fixes that bug
-                if vpc_id in [v['VPCId'] for v in zone_details['VPCs']]:
-                    zones[r53zone['Name']] = zone_id
-        else:
-            zones[r53zone['Name']] = zone_id
+    try:
+        zone = find_zone(conn, zone_in, vpc_id)
+    except boto.exception.BotoServerError, e:
+        module.fail_json(msg=e.error_message)
 
     record = {
         'private_zone': private_zone,
@@ -115,48 +280,54 @@ def main():
         'vpc_region': vpc_region,
         'comment': comment,
     }
+    changed = False
 
-    if state == 'present' and zone_in in zones:
+    if state == 'present' and zone is not None:
+        zone_id, details = zone
         if private_zone:
-            details = conn.get_hosted_zone(zones[zone_in])
-
-            if 'VPCs' not in details['GetHostedZoneResponse']:
+            if details is None:
                 module.fail_json(
                     msg="Can't change VPC from public to private"
                 )
 
-            vpc_details = details['GetHostedZoneResponse']['VPCs']['VPC']
-            current_vpc_id = vpc_details['VPCId']
+            vpc_details = [v for v in zone_vpcs(details) if v['VPCId'] == vpc_id][0]
             current_vpc_region = vpc_details['VPCRegion']
 
-            if current_vpc_id != vpc_id:
-                module.fail_json(
-                    msg="Can't change VPC ID once a zone has been created"
-                )
             if current_vpc_region != vpc_region:
                 module.fail_json(
                     msg="Can't change VPC Region once a zone has been created"
                 )
 
-        record['zone_id'] = zones[zone_in]
-        record['name'] = zone_in
-        module.exit_json(changed=False, set=record)
-
     elif state == 'present':
         result = conn.create_hosted_zone(zone_in, **record)
         hosted_zone = result['CreateHostedZoneResponse']['HostedZone']
         zone_id = hosted_zone['Id'].replace('/hostedzone/', '')
-        record['zone_id'] = zone_id
-        record['name'] = zone_in
-        module.exit_json(changed=True, set=record)
+        changed = True
 
-    elif state == 'absent' and zone_in in zones:
-        conn.delete_hosted_zone(zones[zone_in])
+    elif state == 'absent' and zone is not None:
+        conn.delete_hosted_zone(zone[0])
         module.exit_json(changed=True)
 
     elif state == 'absent':
         module.exit_json(changed=False)
 
+    record['zone_id'] = zone_id
+    record['name'] = zone_in
+
+    if not records:
+        module.exit_json(changed=changed, set=record)
+
+    try:
+        changes = record_changes(conn, zone_id, records)
+        change_ids = submit_changes(conn, zone_id, changes)
+    except boto.exception.BotoServerError, e:
+        module.fail_json(msg=e.error_message or e.body, changed=changed, set=record)
+
+    if module.params.get('wait') and not wait_for_changes(conn, change_ids, module.params.get('wait_timeout')):
+        module.fail_json(msg="Timed out waiting for record changes %s" % ', '.join(change_ids), changed=True, set=record, change_ids=change_ids)
+
+    module.exit_json(changed=changed or bool(changes), set=record, changes=len(changes), change_ids=change_ids)
+
 from ansible.module_utils.basic import *
 from ansible.module_utils.ec2 import *
 
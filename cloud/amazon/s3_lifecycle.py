@@ -30,7 +30,27 @@ options:
   name:
     description:
       - "Name of the s3 bucket"
-    required: true
+      - "Required unless C(buckets) or C(bucket_pattern) is given."
+    required: false
+  buckets:
+    description:
+      - "List of buckets to apply the rule to in one run, instead of C(name)."
+    required: false
+    default: null
+    version_added: "2.1"
+  bucket_pattern:
+    description:
+      - "Shell-style pattern, such as C(logs-*), selecting the buckets of the account to apply the rule to, instead of C(name)."
+      - "Matching buckets in other regions are read and written through a connection to their own region."
+    required: false
+    default: null
+    version_added: "2.1"
+  workers:
+    description:
+      - "With C(buckets) or C(bucket_pattern), how many buckets are read and written at the same time. Only buckets whose configuration differs are written, and the result lists the changes and seconds taken for every bucket."
+    required: false
+    default: 10
+    version_added: "2.1"
   expiration_date:
     description:
       - "Indicates the lifetime of the objects that are subject to the rule by the date they will expire. The value must be ISO-8601 format, the time must be midnight and a GMT timezone must be specified."
@@ -130,12 +150,23 @@ EXAMPLES = '''
     name: mybucket
     prefix: /logs/
     state: absent
+
+# Expire logs after 30 days in every bucket whose name starts with logs-
+- s3_lifecycle:
+    bucket_pattern: "logs-*"
+    expiration_days: 30
+    prefix: /logs/
+    status: enabled
+    state: present
     
 '''
 
 import xml.etree.ElementTree as ET
 import copy
 import datetime
+import fnmatch
+import threading
+import time
 
 try:
     import dateutil.parser
@@ -152,9 +183,8 @@ try:
 except ImportError:
     HAS_BOTO = False
 
-def create_lifecycle_rule(connection, module):
+def build_rule(module):
 
-    name = module.params.get("name")
     expiration_date = module.params.get("expiration_date")
     expiration_days = module.params.get("expiration_days")
     prefix = module.params.get("prefix")
@@ -163,21 +193,6 @@ def create_lifecycle_rule(connection, module):
     storage_class = module.params.get("storage_class")
     transition_date = module.params.get("transition_date")
     transition_days = module.params.get("transition_days")
-    changed = False
-
-    try:
-        bucket = connection.get_bucket(name)
-    except S3ResponseError, e:
-        module.fail_json(msg=e.message)
-
-    # Get the bucket's current lifecycle rules
-    try:
-        current_lifecycle_obj = bucket.get_lifecycle_config()
-    except S3ResponseError, e:
-        if e.error_code == "NoSuchLifecycleConfiguration":
-            current_lifecycle_obj = Lifecycle()
-        else:
-            module.fail_json(msg=e.message)
 
     # Create expiration
     if expiration_days is not None:
@@ -196,7 +211,23 @@ def create_lifecycle_rule(connection, module):
         transition_obj = None
 
     # Create rule
-    rule = Rule(rule_id, prefix, status.title(), expiration_obj, transition_obj)
+    return Rule(rule_id, prefix, status.title(), expiration_obj, transition_obj)
+
+
+def get_lifecycle(bucket):
+
+    # Get the bucket's current lifecycle rules
+    try:
+        return bucket.get_lifecycle_config()
+    except S3ResponseError, e:
+        if e.error_code == "NoSuchLifecycleConfiguration":
+            return Lifecycle()
+        raise
+
+
+def merge_lifecycle_rule(current_lifecycle_obj, rule):
+
+    changed = False
 
     # Create lifecycle
     lifecycle_obj = Lifecycle()
@@ -223,6 +254,9 @@ def create_lifecycle_rule(connection, module):
                     lifecycle_obj.append(rule)
                     changed = True
                     appended = True
+            else:
+                # Keep the other rules of the bucket
+                lifecycle_obj.append(existing_rule)
         # If nothing appended then append now as the rule must not exist
         if not appended:
             lifecycle_obj.append(rule)
@@ -231,11 +265,67 @@ def create_lifecycle_rule(connection, module):
         lifecycle_obj.append(rule)
         changed = True
 
-    # Write lifecycle to bucket
-    try:
+    return lifecycle_obj, changed
+
+
+def remove_lifecycle_rule(current_lifecycle_obj, rule_id, prefix):
+
+    changed = False
+
+    # Create lifecycle
+    lifecycle_obj = Lifecycle()
+    
+    # Check if rule exists
+    # If an ID exists, use that otherwise compare based on prefix
+    if rule_id is not None:
+        for existing_rule in current_lifecycle_obj:
+            if rule_id == existing_rule.id:
+                # We're not keeping the rule (i.e. deleting) so mark as changed
+                changed = True
+            else:
+                lifecycle_obj.append(existing_rule)
+    else:
+        for existing_rule in current_lifecycle_obj:
+            if prefix == existing_rule.prefix:
+                # We're not keeping the rule (i.e. deleting) so mark as changed
+                changed = True
+            else:
+                lifecycle_obj.append(existing_rule)
+
+    return lifecycle_obj, changed
+
+
+def write_lifecycle(bucket, lifecycle_obj):
+
+    # Write lifecycle to bucket or, if there no rules left, delete lifecycle configuration
+    if lifecycle_obj:
         bucket.configure_lifecycle(lifecycle_obj)
+    else:
+        bucket.delete_lifecycle_configuration()
+
+
+def create_lifecycle_rule(connection, module):
+
+    name = module.params.get("name")
+
+    try:
+        bucket = connection.get_bucket(name)
     except S3ResponseError, e:
         module.fail_json(msg=e.message)
+
+    try:
+        current_lifecycle_obj = get_lifecycle(bucket)
+    except S3ResponseError, e:
+        module.fail_json(msg=e.message)
+
+    lifecycle_obj, changed = merge_lifecycle_rule(current_lifecycle_obj, build_rule(module))
+
+    # Write lifecycle to bucket
+    if changed and not module.check_mode:
+        try:
+            bucket.configure_lifecycle(lifecycle_obj)
+        except S3ResponseError, e:
+            module.fail_json(msg=e.message)
         
     module.exit_json(changed=changed)
 
@@ -289,7 +379,6 @@ def destroy_lifecycle_rule(connection, module):
     name = module.params.get("name")
     prefix = module.params.get("prefix")
     rule_id = module.params.get("rule_id")
-    changed = False
 
     if prefix is None:
         prefix = ""
@@ -299,46 +388,103 @@ def destroy_lifecycle_rule(connection, module):
     except S3ResponseError, e:
         module.fail_json(msg=e.message)
 
-    # Get the bucket's current lifecycle rules
     try:
-        current_lifecycle_obj = bucket.get_lifecycle_config()
+        current_lifecycle_obj = get_lifecycle(bucket)
     except S3ResponseError, e:
-        if e.error_code == "NoSuchLifecycleConfiguration":
-            module.exit_json(changed=changed)
-        else:
+        module.fail_json(msg=e.message)
+
+    lifecycle_obj, changed = remove_lifecycle_rule(current_lifecycle_obj, rule_id, prefix)
+
+    if changed and not module.check_mode:
+        try:
+            write_lifecycle(bucket, lifecycle_obj)
+        except BotoServerError, e:
             module.fail_json(msg=e.message)
+        
+    module.exit_json(changed=changed)
+
+
+def for_each_bucket(connect, names, func, workers):
+    """ Runs func(bucket) for the named buckets on up to workers threads and returns its result for each, in order """
+
+    results = [None] * len(names)
+
+    def worker(indexes):
+        # the connections of this thread, one per bucket location
+        connections = {}
+        for i in indexes:
+            started = time.time()
+            try:
+                result = func(get_regional_bucket(connections, connect, names[i]))
+            except Exception, e:
+                result = dict(name=names[i], changed=False, error=getattr(e, 'message', None) or str(e))
+            result['seconds'] = round(time.time() - started, 3)
+            results[i] = result
+
+    workers = max(min(workers, len(names)), 1)
+    threads = [threading.Thread(target=worker, args=(range(n, len(names), workers),)) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def get_regional_bucket(connections, connect, name):
+    """ Returns bucket name through a connection to the region it lives in, cached in connections by location """
+
+    if None not in connections:
+        connections[None] = connect()
+    location = connections[None].get_bucket(name, validate=False).get_location()
+    if location not in connections:
+        # 'EU' is the legacy location constraint of eu-west-1
+        connections[location] = connect({'EU': 'eu-west-1'}.get(location, location))
+    # validate=False skips the extra request checking that the bucket exists
+    return connections[location].get_bucket(name, validate=False)
+
+
+def select_buckets(connection, module):
+
+    buckets = module.params.get("buckets")
+    if buckets is not None:
+        if not buckets:
+            module.fail_json(msg="buckets must list at least one bucket")
+        return buckets
+    pattern = module.params.get("bucket_pattern")
+    return [bucket.name for bucket in connection.get_all_buckets() if fnmatch.fnmatch(bucket.name, pattern)]
+
+
+def batch_lifecycle_rule(connection, connect, module):
+
+    state = module.params.get("state")
+    prefix = module.params.get("prefix")
+    rule_id = module.params.get("rule_id")
+    if state == 'present':
+        rule = build_rule(module)
+    elif prefix is None:
+        prefix = ""
 
-    # Create lifecycle
-    lifecycle_obj = Lifecycle()
-    
-    # Check if rule exists
-    # If an ID exists, use that otherwise compare based on prefix
-    if rule_id is not None:
-        for existing_rule in current_lifecycle_obj:
-            if rule_id == existing_rule.id:
-                # We're not keeping the rule (i.e. deleting) so mark as changed
-                changed = True
-            else:
-                lifecycle_obj.append(existing_rule)
-    else:
-        for existing_rule in current_lifecycle_obj:
-            if prefix == existing_rule.prefix:
-                # We're not keeping the rule (i.e. deleting) so mark as changed
-                changed = True
-            else:
-                lifecycle_obj.append(existing_rule)
-                
-    
-    # Write lifecycle to bucket or, if there no rules left, delete lifecycle configuration
     try:
-        if lifecycle_obj:
-            bucket.configure_lifecycle(lifecycle_obj)
-        else:
-            bucket.delete_lifecycle_configuration()
-    except BotoServerError, e:
+        bucket_names = select_buckets(connection, module)
+    except S3ResponseError, e:
         module.fail_json(msg=e.message)
-        
-    module.exit_json(changed=changed)
+
+    def reconcile(bucket):
+        current_lifecycle_obj = get_lifecycle(bucket)
+        if state == 'present':
+            lifecycle_obj, changed = merge_lifecycle_rule(current_lifecycle_obj, copy.deepcopy(rule))
+        else:
+            lifecycle_obj, changed = remove_lifecycle_rule(current_lifecycle_obj, rule_id, prefix)
+        if changed and not module.check_mode:
+            write_lifecycle(bucket, lifecycle_obj)
+        return dict(name=bucket.name, changed=changed)
+
+    results = for_each_bucket(connect, bucket_names, reconcile, module.params.get("workers"))
+    changed = any(result['changed'] for result in results)
+    failed = [result for result in results if 'error' in result]
+    if failed:
+        module.fail_json(msg="Failed to update %d of %d buckets" % (len(failed), len(results)), changed=changed, buckets=results)
+    module.exit_json(changed=changed, buckets=results)
     
 
 def main():
@@ -346,7 +492,10 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            name = dict(required=True),
+            name = dict(required=False),
+            buckets = dict(required=False, type='list'),
+            bucket_pattern = dict(required=False),
+            workers = dict(default=10, type='int'),
             expiration_days = dict(default=None, required=False, type='int'),
             expiration_date = dict(default=None, required=False, type='str'),
             prefix = dict(default=None, required=False),
@@ -361,12 +510,15 @@ def main():
     )
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of = [ [ 'name', 'buckets', 'bucket_pattern' ] ],
                            mutually_exclusive = [
+                                                 [ 'name', 'buckets', 'bucket_pattern' ],
                                                  [ 'expiration_days', 'expiration_date' ],
                                                  [ 'expiration_days', 'transition_date' ],
                                                  [ 'transition_days', 'transition_date' ],
                                                  [ 'transition_days', 'expiration_date' ]                 
-                                                 ]
+                                                 ],
+                           supports_check_mode=True
                            )
 
     if not HAS_BOTO:
@@ -384,11 +536,16 @@ def main():
         # Boto uses symbolic names for locations but region strings will
         # actually work fine for everything except us-east-1 (US Standard)
         location = region
-    try:
+
+    def connect(location=location):
         connection = boto.s3.connect_to_region(location, is_secure=True, calling_format=OrdinaryCallingFormat(), **aws_connect_params)
         # use this as fallback because connect_to_region seems to fail in boto + non 'classic' aws accounts in some cases
         if connection is None:
             connection = boto.connect_s3(**aws_connect_params)
+        return connection
+
+    try:
+        connection = connect()
     except (boto.exception.NoAuthHandlerFound, StandardError), e:
         module.fail_json(msg=str(e))
 
@@ -409,7 +566,9 @@ def main():
         except ValueError, e:
             module.fail_json(msg="expiration_date is not a valid ISO-8601 format. The time must be midnight and a timezone of GMT must be included")
         
-    if state == 'present':
+    if not module.params.get("name"):
+        batch_lifecycle_rule(connection, connect, module)
+    elif state == 'present':
         create_lifecycle_rule(connection, module)
     elif state == 'absent':
         destroy_lifecycle_rule(connection, module)
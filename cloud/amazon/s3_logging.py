@@ -25,7 +25,27 @@ options:
   name:
     description:
       - "Name of the s3 bucket."
-    required: true
+      - "Required unless C(buckets) or C(bucket_pattern) is given."
+    required: false
+  buckets:
+    description:
+      - "List of buckets whose logging is managed in one run, instead of C(name)."
+    required: false
+    default: null
+    version_added: "2.1"
+  bucket_pattern:
+    description:
+      - "Shell-style pattern, such as C(web-*), selecting the buckets of the account whose logging is managed, instead of C(name)."
+      - "Matching buckets in other regions are read and written through a connection to their own region. Their logging target must still be in the same region as they are."
+    required: false
+    default: null
+    version_added: "2.1"
+  workers:
+    description:
+      - "With C(buckets) or C(bucket_pattern), how many buckets are read and written at the same time. Only buckets whose logging differs are written, and the result lists the changes and seconds taken for every bucket."
+    required: false
+    default: 10
+    version_added: "2.1"
   region:
     description:
      - "AWS region to create the bucket in. If not set then the value of the AWS_REGION and EC2_REGION environment variables are checked, followed by the aws_region and ec2_region settings in the Boto config file.  If none of those are set the region defaults to the S3 Location: US Standard."
@@ -65,9 +85,20 @@ EXAMPLES = '''
   s3_logging:
     name: mywebsite.com
     state: absent
+
+- name: Log every web bucket to s3 bucket mylogs
+  s3_logging:
+    bucket_pattern: "web-*"
+    target_bucket: mylogs
+    target_prefix: logs/
+    state: present
     
 '''
 
+import fnmatch
+import threading
+import time
+
 try:
     import boto.ec2
     from boto.s3.connection import OrdinaryCallingFormat, Location
@@ -108,10 +139,10 @@ def enable_bucket_logging(connection, module):
                     module.fail_json(msg="the logging target bucket must be in the same region as the bucket being logged")
                 else:
                     module.fail_json(msg=e.message)
-            target_bucket_obj.set_as_logging_target()
-
-            bucket.enable_logging(target_bucket, target_prefix)
             changed = True
+            if not module.check_mode:
+                target_bucket_obj.set_as_logging_target()
+                bucket.enable_logging(target_bucket, target_prefix)
 
     except S3ResponseError as e:
         module.fail_json(msg=e.message)
@@ -127,12 +158,116 @@ def disable_bucket_logging(connection, module):
     try:
         bucket = connection.get_bucket(bucket_name)
         if not compare_bucket_logging(bucket, None, None):
-            bucket.disable_logging()
             changed = True
+            if not module.check_mode:
+                bucket.disable_logging()
     except S3ResponseError as e:
         module.fail_json(msg=e.message)
    
     module.exit_json(changed=changed)
+
+
+def for_each_bucket(connect, names, func, workers):
+    """ Runs func(bucket) for the named buckets on up to workers threads and returns its result for each, in order """
+
+    results = [None] * len(names)
+
+    def worker(indexes):
+        # the connections of this thread, one per bucket location
+        connections = {}
+        for i in indexes:
+            started = time.time()
+            try:
+                result = func(get_regional_bucket(connections, connect, names[i]))
+            except Exception as e:
+                result = dict(name=names[i], changed=False, error=getattr(e, 'message', None) or str(e))
+            result['seconds'] = round(time.time() - started, 3)
+            results[i] = result
+
+    workers = max(min(workers, len(names)), 1)
+    threads = [threading.Thread(target=worker, args=(range(n, len(names), workers),)) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def get_regional_bucket(connections, connect, name):
+    """ Returns bucket name through a connection to the region it lives in, cached in connections by location """
+
+    if None not in connections:
+        connections[None] = connect()
+    location = connections[None].get_bucket(name, validate=False).get_location()
+    if location not in connections:
+        # 'EU' is the legacy location constraint of eu-west-1
+        connections[location] = connect({'EU': 'eu-west-1'}.get(location, location))
+    # validate=False skips the extra request checking that the bucket exists
+    return connections[location].get_bucket(name, validate=False)
+
+
+def select_buckets(connection, module):
+
+    buckets = module.params.get("buckets")
+    if buckets is not None:
+        if not buckets:
+            module.fail_json(msg="buckets must list at least one bucket")
+        return buckets
+    pattern = module.params.get("bucket_pattern")
+    return [bucket.name for bucket in connection.get_all_buckets() if fnmatch.fnmatch(bucket.name, pattern)]
+
+
+def batch_bucket_logging(connection, connect, module):
+
+    state = module.params.get("state")
+    if state == 'present':
+        target_bucket = module.params.get("target_bucket")
+        target_prefix = module.params.get("target_prefix")
+    else:
+        target_bucket = target_prefix = None
+
+    try:
+        bucket_names = select_buckets(connection, module)
+    except S3ResponseError as e:
+        module.fail_json(msg=e.message)
+
+    # Read every bucket's logging status first, so the target bucket is only prepared when something will change
+    def compare(bucket):
+        return dict(name=bucket.name, changed=not compare_bucket_logging(bucket, target_bucket, target_prefix))
+
+    results = for_each_bucket(connect, bucket_names, compare, module.params.get("workers"))
+    pending = [result['name'] for result in results if result['changed'] and 'error' not in result]
+
+    if pending and state == 'present' and not module.check_mode:
+        # Before we can enable logging we must give the log-delivery group WRITE and READ_ACP permissions to the target bucket
+        try:
+            target_bucket_obj = connection.get_bucket(target_bucket)
+            target_bucket_obj.set_as_logging_target()
+        except S3ResponseError as e:
+            if e.status == 301:
+                module.fail_json(msg="the logging target bucket must be in the same region as the bucket being logged")
+            else:
+                module.fail_json(msg=e.message)
+
+    def update(bucket):
+        if state == 'present':
+            bucket.enable_logging(target_bucket, target_prefix)
+        else:
+            bucket.disable_logging()
+        return dict(name=bucket.name, changed=True)
+
+    if pending and not module.check_mode:
+        # Report each bucket's read and write time together
+        by_name = dict((result['name'], result) for result in results)
+        for updated in for_each_bucket(connect, pending, update, module.params.get("workers")):
+            updated['seconds'] = round(updated['seconds'] + by_name[updated['name']]['seconds'], 3)
+            by_name[updated['name']].update(updated)
+
+    changed = any(result['changed'] for result in results)
+    failed = [result for result in results if 'error' in result]
+    if failed:
+        module.fail_json(msg="Failed to update logging of %d of %d buckets" % (len(failed), len(results)), changed=changed, buckets=results)
+    module.exit_json(changed=changed, buckets=results)
     
     
 def main():
@@ -140,14 +275,20 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            name = dict(required=True),
+            name = dict(required=False),
+            buckets = dict(required=False, type='list'),
+            bucket_pattern = dict(required=False),
+            workers = dict(default=10, type='int'),
             target_bucket = dict(required=False, default=None),
             target_prefix = dict(required=False, default=""),
             state = dict(required=False, default='present', choices=['present', 'absent'])
         )
     )
     
-    module = AnsibleModule(argument_spec=argument_spec)
+    module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of = [ [ 'name', 'buckets', 'bucket_pattern' ] ],
+                           mutually_exclusive = [ [ 'name', 'buckets', 'bucket_pattern' ] ],
+                           supports_check_mode=True)
 
     if not HAS_BOTO:
         module.fail_json(msg='boto required for this module')
@@ -161,18 +302,25 @@ def main():
         # Boto uses symbolic names for locations but region strings will
         # actually work fine for everything except us-east-1 (US Standard)
         location = region
-    try:
+
+    def connect(location=location):
         connection = boto.s3.connect_to_region(location, is_secure=True, calling_format=OrdinaryCallingFormat(), **aws_connect_params)
         # use this as fallback because connect_to_region seems to fail in boto + non 'classic' aws accounts in some cases
         if connection is None:
             connection = boto.connect_s3(**aws_connect_params)
+        return connection
+
+    try:
+        connection = connect()
     except (boto.exception.NoAuthHandlerFound, StandardError), e:
         module.fail_json(msg=str(e))
 
 
     state = module.params.get("state")
 
-    if state == 'present':
+    if not module.params.get("name"):
+        batch_bucket_logging(connection, connect, module)
+    elif state == 'present':
         enable_bucket_logging(connection, module)
     elif state == 'absent':
         disable_bucket_logging(connection, module)
@@ -30,8 +30,30 @@ author: "Kevin Carter (@cloudnull)"
 options:
     name:
         description:
-          - Name of a container.
-        required: true
+          - Name of a container. Either I(name) or I(containers) is
+            required.
+        required: false
+    containers:
+        version_added: "2.1"
+        description:
+          - A list of existing container names to bring to I(state) in
+            parallel. Only the C(started), C(stopped), C(restarted) and
+            C(frozen) states are supported and containers are not created.
+            Mutually exclusive with I(name).
+        required: false
+    workers:
+        version_added: "2.1"
+        description:
+          - Maximum number of containers changed concurrently when
+            I(containers) is used.
+        required: false
+        default: 8
+    timeout:
+        version_added: "2.1"
+        description:
+          - Number of seconds to wait for a container to reach a new state.
+        required: false
+        default: 60
     backing_store:
         choices:
           - dir
@@ -149,11 +171,21 @@ options:
         choices:
           - gzip
           - bzip2
+          - xz
+          - zstd
           - none
         description:
           - Type of compression to use when creating an archive of a running
-            container.
+            container. Parallel compressors (pigz, lbzip2 or pbzip2) are used
+            in place of gzip and bzip2 when they are installed.
         default: gzip
+    archive_threads:
+        version_added: "2.1"
+        description:
+          - Number of threads the compressor may use when creating an
+            archive. C(0) uses every available CPU.
+        required: false
+        default: 0
     state:
         choices:
           - started
@@ -193,7 +225,9 @@ notes:
   - If "archive" is **true** the system will attempt to create a compressed
     tarball of the running container. The "archive" option supports LVM backed
     containers and will create a snapshot of the running container when
-    creating the archive.
+    creating the archive. The archive is streamed from the container rootfs,
+    or its snapshot, straight into the compressor. The size of the archive
+    and the rate at which it was written are returned with the archive path.
   - If your distro does not have a package for "python2-lxc", which is a
     requirement for this module, it can be installed from source at
     "https://github.com/lxc/python2-lxc" or installed via pip using the package
@@ -244,7 +278,8 @@ EXAMPLES = """
 
 # Create an lvm container, run a complex command in it, add additional
 # configuration to it, create an archive of it, and finally leave the container
-# in a frozen state. The container archive will be compressed using bzip2
+# in a frozen state. The container archive will be compressed using xz on
+# four threads
 - name: Create a frozen lvm container
   lxc_container:
     name: test-container-lvm
@@ -264,7 +299,8 @@ EXAMPLES = """
       - "lxc.aa_profile=unconfined"
       - "lxc.cgroup.devices.allow=a *:* rmw"
     archive: true
-    archive_compression: bzip2
+    archive_compression: xz
+    archive_threads: 4
   register: lvm_container_info
 
 - name: Debug info on container "test-container-lvm"
@@ -362,6 +398,14 @@ EXAMPLES = """
     name: test-container-new-archive-destroyed-clone
     state: started
 
+- name: Start many existing containers at once
+  lxc_container:
+    containers:
+      - test-container-stopped
+      - test-container-new-archive-destroyed-clone
+    state: started
+    workers: 16
+
 - name: Destroy a container
   lxc_container:
     name: "{{ item }}"
@@ -382,6 +426,11 @@ EXAMPLES = """
 """
 
 
+import multiprocessing
+import Queue
+import re
+import threading
+
 try:
     import lxc
 except ImportError:
@@ -391,19 +440,28 @@ else:
 
 
 # LXC_COMPRESSION_MAP is a map of available compression types when creating
-# an archive of a container.
+# an archive of a container. The programs are tried in order and the first one
+# found on the host is used to compress the stream written by tar.
 LXC_COMPRESSION_MAP = {
     'gzip': {
         'extension': 'tar.tgz',
-        'argument': '-czf'
+        'programs': ['pigz -p %(threads)d', 'gzip']
     },
     'bzip2': {
         'extension': 'tar.bz2',
-        'argument': '-cjf'
+        'programs': ['lbzip2 -n %(threads)d', 'pbzip2 -p%(threads)d', 'bzip2']
+    },
+    'xz': {
+        'extension': 'tar.xz',
+        'programs': ['xz -T %(threads)d']
+    },
+    'zstd': {
+        'extension': 'tar.zst',
+        'programs': ['zstd -T%(threads)d']
     },
     'none': {
         'extension': 'tar',
-        'argument': '-cf'
+        'programs': []
     }
 }
 
@@ -482,6 +540,16 @@ LXC_ANSIBLE_STATES = {
 }
 
 
+# LXC_BULK_STATES is a map of the states available when managing a list of
+# containers and the lxc state each container is waited on to reach.
+LXC_BULK_STATES = {
+    'started': 'RUNNING',
+    'stopped': 'STOPPED',
+    'restarted': 'RUNNING',
+    'frozen': 'FROZEN'
+}
+
+
 # This is used to attach to a running container and execute commands from
 # within the container on the host.  This will provide local access to a
 # container without using SSH.  The template will attempt to work within the
@@ -556,6 +624,10 @@ def create_script(command):
         os.remove(script_file)
 
 
+class LxcContainerStateError(Exception):
+    pass
+
+
 class LxcContainerManagement(object):
     def __init__(self, module):
         """Management of LXC containers via Ansible.
@@ -568,6 +640,7 @@ class LxcContainerManagement(object):
         self.state_change = False
         self.lxc_vg = None
         self.container_name = self.module.params['name']
+        self.timeout = self.module.params.get('timeout')
         self.container = self.get_container_bind()
         self.archive_info = None
         self.clone_info = None
@@ -922,22 +995,24 @@ class LxcContainerManagement(object):
             self.container.attach_wait(create_script, container_command)
             self.state_change = True
 
-    def _container_startup(self, timeout=60):
+    def _container_startup(self, timeout=None):
         """Ensure a container is started.
 
-        :param timeout: Time before the destroy operation is abandoned.
+        :param timeout: Time before the start operation is abandoned.
         :type timeout: ``int``
         """
 
+        if timeout is None:
+            timeout = self.timeout
+
         self.container = self.get_container_bind()
-        for _ in xrange(timeout):
-            if self._get_state() != 'running':
-                self.container.start()
-                self.state_change = True
-                # post startup sleep for 1 second.
-                time.sleep(1)
-            else:
-                return True
+        if self._get_state() == 'running':
+            return True
+
+        self.container.start()
+        self.state_change = True
+        if self.container.wait('RUNNING', timeout):
+            return True
         else:
             self.failure(
                 lxc_container=self._container_data(),
@@ -949,6 +1024,49 @@ class LxcContainerManagement(object):
                     ' state.' % self.container_name
             )
 
+    def _container_wait(self, state, method):
+        """Wait for a container to reach a state, failing if it does not.
+
+        :param state: lxc state to wait for, such as "STOPPED".
+        :type state: ``str``
+        :param method: Name of the operation for the failure message.
+        :type method: ``str``
+        """
+
+        if not self.container.wait(state, self.timeout):
+            self.failure(
+                lxc_container=self._container_data(),
+                error='Failed to %s container [ %s ]' % (
+                    method, self.container_name
+                ),
+                rc=1,
+                msg='The container [ %s ] did not become %s within %s'
+                    ' seconds.' % (
+                        self.container_name, state.lower(), self.timeout
+                    )
+            )
+
+    def _container_ensure_created(self, method):
+        """Create the container if it does not exist.
+
+        :param method: Name of the operation for the failure message.
+        :type method: ``str``
+        """
+
+        if self._container_exists(container_name=self.container_name):
+            return
+
+        self._create()
+        self.container = self.get_container_bind()
+        if not self._container_exists(container_name=self.container_name):
+            self.failure(
+                error='Failed to %s container' % method,
+                rc=1,
+                msg='The container [ %s ] failed to %s. Check to lxc is'
+                    ' available and that the container is in a functional'
+                    ' state.' % (self.container_name, method)
+            )
+
     def _check_archive(self):
         """Create a compressed archive of a container.
 
@@ -956,9 +1074,7 @@ class LxcContainerManagement(object):
         """
 
         if self.module.params.get('archive') in BOOLEANS_TRUE:
-            self.archive_info = {
-                'archive': self._container_create_tar()
-            }
+            self.archive_info = self._container_create_tar()
 
     def _check_clone(self):
         """Create a compressed archive of a container.
@@ -977,33 +1093,27 @@ class LxcContainerManagement(object):
                     'cloned': False
                 }
 
-    def _destroyed(self, timeout=60):
-        """Ensure a container is destroyed.
-
-        :param timeout: Time before the destroy operation is abandoned.
-        :type timeout: ``int``
-        """
+    def _destroyed(self):
+        """Ensure a container is destroyed."""
 
-        for _ in xrange(timeout):
-            if not self._container_exists(container_name=self.container_name):
-                break
+        if not self._container_exists(container_name=self.container_name):
+            return
 
-            # Check if the container needs to have an archive created.
-            self._check_archive()
+        # Check if the container needs to have an archive created.
+        self._check_archive()
 
-            # Check if the container is to be cloned
-            self._check_clone()
+        # Check if the container is to be cloned
+        self._check_clone()
 
-            if self._get_state() != 'stopped':
-                self.state_change = True
-                self.container.stop()
+        if self._get_state() != 'stopped':
+            self.state_change = True
+            self.container.stop()
+            self._container_wait('STOPPED', 'destroy')
 
-            if self.container.destroy():
-                self.state_change = True
+        if self.container.destroy():
+            self.state_change = True
 
-            # post destroy attempt sleep for 1 second.
-            time.sleep(1)
-        else:
+        if self._container_exists(container_name=self.container_name):
             self.failure(
                 lxc_container=self._container_data(),
                 error='Failed to destroy container'
@@ -1014,148 +1124,105 @@ class LxcContainerManagement(object):
                     ' functional state.' % self.container_name
             )
 
-    def _frozen(self, count=0):
+    def _frozen(self):
         """Ensure a container is frozen.
 
         If the container does not exist the container will be created.
-
-        :param count: number of times this command has been called by itself.
-        :type count: ``int``
         """
 
-        self.check_count(count=count, method='frozen')
-        if self._container_exists(container_name=self.container_name):
-            self._execute_command()
+        self._container_ensure_created(method='frozen')
+        self._execute_command()
 
-            # Perform any configuration updates
-            self._config()
+        # Perform any configuration updates
+        self._config()
 
-            container_state = self._get_state()
-            if container_state == 'frozen':
-                pass
-            elif container_state == 'running':
-                self.container.freeze()
-                self.state_change = True
-            else:
+        container_state = self._get_state()
+        if container_state != 'frozen':
+            if container_state != 'running':
                 self._container_startup()
-                self.container.freeze()
-                self.state_change = True
+            self.container.freeze()
+            self._container_wait('FROZEN', 'freeze')
+            self.state_change = True
 
-            # Check if the container needs to have an archive created.
-            self._check_archive()
+        # Check if the container needs to have an archive created.
+        self._check_archive()
 
-            # Check if the container is to be cloned
-            self._check_clone()
-        else:
-            self._create()
-            count += 1
-            self._frozen(count)
+        # Check if the container is to be cloned
+        self._check_clone()
 
-    def _restarted(self, count=0):
+    def _restarted(self):
         """Ensure a container is restarted.
 
         If the container does not exist the container will be created.
-
-        :param count: number of times this command has been called by itself.
-        :type count: ``int``
         """
 
-        self.check_count(count=count, method='restart')
-        if self._container_exists(container_name=self.container_name):
-            self._execute_command()
+        self._container_ensure_created(method='restart')
+        self._execute_command()
 
-            # Perform any configuration updates
-            self._config()
+        # Perform any configuration updates
+        self._config()
 
-            if self._get_state() != 'stopped':
-                self.container.stop()
-                self.state_change = True
+        if self._get_state() != 'stopped':
+            self.container.stop()
+            self._container_wait('STOPPED', 'restart')
+            self.state_change = True
 
-            # Run container startup
-            self._container_startup()
+        # Run container startup
+        self._container_startup()
 
-            # Check if the container needs to have an archive created.
-            self._check_archive()
+        # Check if the container needs to have an archive created.
+        self._check_archive()
 
-            # Check if the container is to be cloned
-            self._check_clone()
-        else:
-            self._create()
-            count += 1
-            self._restarted(count)
+        # Check if the container is to be cloned
+        self._check_clone()
 
-    def _stopped(self, count=0):
+    def _stopped(self):
         """Ensure a container is stopped.
 
         If the container does not exist the container will be created.
-
-        :param count: number of times this command has been called by itself.
-        :type count: ``int``
         """
 
-        self.check_count(count=count, method='stop')
-        if self._container_exists(container_name=self.container_name):
-            self._execute_command()
+        self._container_ensure_created(method='stop')
+        self._execute_command()
 
-            # Perform any configuration updates
-            self._config()
+        # Perform any configuration updates
+        self._config()
 
-            if self._get_state() != 'stopped':
-                self.container.stop()
-                self.state_change = True
+        if self._get_state() != 'stopped':
+            self.container.stop()
+            self._container_wait('STOPPED', 'stop')
+            self.state_change = True
 
-            # Check if the container needs to have an archive created.
-            self._check_archive()
+        # Check if the container needs to have an archive created.
+        self._check_archive()
 
-            # Check if the container is to be cloned
-            self._check_clone()
-        else:
-            self._create()
-            count += 1
-            self._stopped(count)
+        # Check if the container is to be cloned
+        self._check_clone()
 
-    def _started(self, count=0):
+    def _started(self):
         """Ensure a container is started.
 
         If the container does not exist the container will be created.
-
-        :param count: number of times this command has been called by itself.
-        :type count: ``int``
         """
 
-        self.check_count(count=count, method='start')
-        if self._container_exists(container_name=self.container_name):
-            container_state = self._get_state()
-            if container_state == 'running':
-                pass
-            elif container_state == 'frozen':
-                self._unfreeze()
-            elif not self._container_startup():
-                self.failure(
-                    lxc_container=self._container_data(),
-                    error='Failed to start container'
-                          ' [ %s ]' % self.container_name,
-                    rc=1,
-                    msg='The container [ %s ] failed to start. Check to lxc is'
-                        ' available and that the container is in a functional'
-                        ' state.' % self.container_name
-                )
+        self._container_ensure_created(method='start')
+        container_state = self._get_state()
+        if container_state == 'frozen':
+            self._unfreeze()
+        elif container_state != 'running':
+            self._container_startup()
 
-            # Return data
-            self._execute_command()
+        # Return data
+        self._execute_command()
 
-            # Perform any configuration updates
-            self._config()
+        # Perform any configuration updates
+        self._config()
 
-            # Check if the container needs to have an archive created.
-            self._check_archive()
+        # Check if the container needs to have an archive created.
+        self._check_archive()
 
-            # Check if the container is to be cloned
-            self._check_clone()
-        else:
-            self._create()
-            count += 1
-            self._started(count)
+        # Check if the container is to be cloned
+        self._check_clone()
 
     def _get_lxc_vg(self):
         """Return the name of the Volume Group used in LXC."""
@@ -1323,11 +1390,48 @@ class LxcContainerManagement(object):
                     % (vg, lv_name, mount_point)
             )
 
-    def _create_tar(self, source_dir):
-        """Create an archive of a given ``source_dir`` to ``output_path``.
+    def _compress_program(self):
+        """Return the compressor command used for the archive, if any.
+
+        :returns: compressor command or None when no compression is wanted.
+        :rtype: ``str``
+        """
+
+        archive_compression = self.module.params.get('archive_compression')
+        programs = LXC_COMPRESSION_MAP[archive_compression]['programs']
+        if not programs:
+            return None
+
+        threads = self.module.params.get('archive_threads')
+        if not threads:
+            threads = multiprocessing.cpu_count()
+
+        for program in programs:
+            if self.module.get_bin_path(program.split()[0]):
+                return program % {'threads': threads}
+        else:
+            self.failure(
+                error='Compressor not found',
+                rc=1,
+                msg='None of the compressors for [ %s ] are available: %s'
+                    % (archive_compression, ', '.join(
+                        [i.split()[0] for i in programs]
+                    ))
+            )
+
+    def _create_tar(self, container_dir, rootfs_dir):
+        """Stream an archive of a container into a compressed tarball.
 
-        :param source_dir:  Path to the directory to be archived.
-        :type source_dir: ``str``
+        The container configuration is read from ``container_dir`` and the
+        root file system from ``rootfs_dir``; both are written by a single tar
+        process feeding the compressor, so nothing is copied beforehand.
+
+        :param container_dir: Path to the container configuration directory.
+        :type container_dir: ``str``
+        :param rootfs_dir: Path to the root file system to be archived.
+        :type rootfs_dir: ``str``
+        :returns: archive information
+        :rtype: ``dict``
         """
 
         archive_path = self.module.params.get('archive_path')
@@ -1348,14 +1452,38 @@ class LxcContainerManagement(object):
 
         build_command = [
             self.module.get_bin_path('tar', True),
-            '--directory=%s' % os.path.realpath(
-                os.path.expanduser(source_dir)
-            ),
-            compression_type['argument'],
-            archive_name,
-            '.'
+            '--create',
+            '--totals',
+            '--file=%s' % archive_name
         ]
 
+        compress_program = self._compress_program()
+        if compress_program:
+            build_command.append(
+                "--use-compress-program='%s'" % compress_program
+            )
+
+        # Everything in the container directory but the rootfs, which is
+        # read from the snapshot or mount when the container has one.
+        container_files = [
+            i for i in sorted(os.listdir(container_dir)) if i != 'rootfs'
+        ]
+        if container_files:
+            build_command.append('--directory=%s' % container_dir)
+            build_command.extend(container_files)
+
+        rootfs_dir = os.path.realpath(os.path.expanduser(rootfs_dir))
+        rootfs_name = os.path.basename(rootfs_dir)
+        if rootfs_name != 'rootfs':
+            build_command.append(
+                "--transform='s,^%s(/|$),rootfs\\1,x'" % re.escape(rootfs_name)
+            )
+        build_command.extend([
+            '--directory=%s' % os.path.dirname(rootfs_dir),
+            rootfs_name
+        ])
+
+        start_time = time.time()
         rc, stdout, err = self._run_command(
             build_command=build_command,
             unsafe_shell=True
@@ -1367,8 +1495,23 @@ class LxcContainerManagement(object):
                 msg='failed to create tar archive',
                 command=' '.join(build_command)
             )
+        elapsed = max(time.time() - start_time, 0.001)
+
+        # tar reports the size of the uncompressed stream with --totals.
+        total_bytes = re.search(r'Total bytes written: (\d+)', err)
+        if total_bytes:
+            total_bytes = int(total_bytes.group(1))
+        else:
+            total_bytes = 0
 
-        return archive_name
+        return {
+            'archive': archive_name,
+            'archive_size': os.path.getsize(archive_name),
+            'archive_data_size': total_bytes,
+            'archive_seconds': round(elapsed, 3),
+            'archive_throughput': int(total_bytes / elapsed),
+            'archive_compressor': compress_program or 'none'
+        }
 
     def _lvm_lv_remove(self, lv_name):
         """Remove an LV.
@@ -1392,43 +1535,6 @@ class LxcContainerManagement(object):
                 command=' '.join(build_command)
             )
 
-    def _rsync_data(self, container_path, temp_dir):
-        """Sync the container directory to the temp directory.
-
-        :param container_path: path to the container container
-        :type container_path: ``str``
-        :param temp_dir: path to the temporary local working directory
-        :type temp_dir: ``str``
-        """
-        # This loop is created to support overlayfs archives. This should
-        # squash all of the layers into a single archive.
-        fs_paths = container_path.split(':')
-        if 'overlayfs' in fs_paths:
-            fs_paths.pop(fs_paths.index('overlayfs'))
-
-        for fs_path in fs_paths:
-            # Set the path to the container data
-            fs_path = os.path.dirname(fs_path)
-
-            # Run the sync command
-            build_command = [
-                self.module.get_bin_path('rsync', True),
-                '-aHAX',
-                fs_path,
-                temp_dir
-            ]
-            rc, stdout, err = self._run_command(
-                build_command,
-                unsafe_shell=True
-            )
-            if rc != 0:
-                self.failure(
-                    err=err,
-                    rc=rc,
-                    msg='failed to perform archive',
-                    command=' '.join(build_command)
-                )
-
     def _unmount(self, mount_point):
         """Unmount a file system.
 
@@ -1481,32 +1587,36 @@ class LxcContainerManagement(object):
 
         The process is as follows:
             * Stop or Freeze the container
-            * Create temporary dir
-            * Copy container and config to temporary directory
             * If LVM backed:
                 * Create LVM snapshot of LV backing the container
                 * Mount the snapshot to tmpdir/rootfs
+                * Restore the state of the container
+            * If overlayfs backed:
+                * Mount the overlay to tmpdir/rootfs
+            * Stream the config and rootfs through tar into the compressor
             * Restore the state of the container
-            * Create tar of tmpdir
             * Clean up
+
+        :returns: archive information
+        :rtype: ``dict``
         """
 
         # Create a temp dir
         temp_dir = tempfile.mkdtemp()
 
-        # Set the name of the working dir, temp + container_name
-        work_dir = os.path.join(temp_dir, self.container_name)
-
         # LXC container rootfs
         lxc_rootfs = self.container.get_config_item('lxc.rootfs')
 
+        # The directory holding the container configuration
+        container_dir = os.path.dirname(self.container.config_file_name)
+
         # Test if the containers rootfs is a block device
         block_backed = lxc_rootfs.startswith(os.path.join(os.sep, 'dev'))
 
         # Test if the container is using overlayfs
         overlayfs_backed = lxc_rootfs.startswith('overlayfs')
 
-        mount_point = os.path.join(work_dir, 'rootfs')
+        mount_point = os.path.join(temp_dir, 'rootfs')
 
         # Set the snapshot name if needed
         snapshot_name = '%s_lxc_snapshot' % self.container_name
@@ -1520,9 +1630,6 @@ class LxcContainerManagement(object):
                 else:
                     self.container.stop()
 
-            # Sync the container data from the container_path to work_dir
-            self._rsync_data(lxc_rootfs, temp_dir)
-
             if block_backed:
                 if snapshot_name not in self._lvm_lv_list():
                     if not os.path.exists(mount_point):
@@ -1538,6 +1645,10 @@ class LxcContainerManagement(object):
                         snapshot_size_gb=size
                     )
 
+                    # The snapshot is copy-on-write, the container can carry
+                    # on running while the archive is read from it.
+                    self._restore_state(container_state)
+
                     # Mount snapshot
                     self._lvm_lv_mount(
                         lv_name=snapshot_name,
@@ -1551,17 +1662,27 @@ class LxcContainerManagement(object):
                             ' up old snapshot of containers before continuing.'
                             % snapshot_name
                     )
+                rootfs_dir = mount_point
             elif overlayfs_backed:
+                if not os.path.exists(mount_point):
+                    os.makedirs(mount_point)
+
                 lowerdir, upperdir = lxc_rootfs.split(':')[1:]
                 self._overlayfs_mount(
                     lowerdir=lowerdir,
                     upperdir=upperdir,
                     mount_point=mount_point
                 )
+                rootfs_dir = mount_point
+            else:
+                rootfs_dir = lxc_rootfs
 
             # Set the state as changed and set a new fact
             self.state_change = True
-            return self._create_tar(source_dir=work_dir)
+            return self._create_tar(
+                container_dir=container_dir,
+                rootfs_dir=rootfs_dir
+            )
         finally:
             if block_backed or overlayfs_backed:
                 # unmount snapshot
@@ -1572,24 +1693,24 @@ class LxcContainerManagement(object):
                 self._lvm_lv_remove(snapshot_name)
 
             # Restore original state of container
-            if container_state == 'running':
-                if self._get_state() == 'frozen':
-                    self.container.unfreeze()
-                else:
-                    self.container.start()
+            self._restore_state(container_state)
 
             # Remove tmpdir
             shutil.rmtree(temp_dir)
 
-    def check_count(self, count, method):
-        if count > 1:
-            self.failure(
-                error='Failed to %s container' % method,
-                rc=1,
-                msg='The container [ %s ] failed to %s. Check to lxc is'
-                    ' available and that the container is in a functional'
-                    ' state.' % (self.container_name, method)
-            )
+    def _restore_state(self, container_state):
+        """Return a container to the state it was in before an archive.
+
+        :param container_state: State of the container prior to archiving.
+        :type container_state: ``str``
+        """
+
+        if container_state == 'running':
+            current_state = self._get_state()
+            if current_state == 'frozen':
+                self.container.unfreeze()
+            elif current_state != 'running':
+                self.container.start()
 
     def failure(self, **kwargs):
         """Return a Failure when running an Ansible command.
@@ -1620,14 +1741,161 @@ class LxcContainerManagement(object):
         )
 
 
+class LxcContainerBulkManagement(object):
+    def __init__(self, module):
+        """Parallel state management of a list of LXC containers.
+
+        :param module: Processed Ansible Module.
+        :type module: ``object``
+        """
+        self.module = module
+        self.state = self.module.params.get('state')
+        self.timeout = self.module.params.get('timeout')
+        self.workers = self.module.params.get('workers')
+        self.container_names = self.module.params.get('containers')
+
+    def _transition(self, container_name):
+        """Bring one container to the requested state and wait for it.
+
+        :param container_name: Name of the container.
+        :type container_name: ``str``
+        :returns: result of the transition.
+        :rtype: ``dict``
+        """
+
+        start_time = time.time()
+        container = lxc.Container(name=container_name)
+        state = str(container.state).lower()
+        result = {'changed': False}
+
+        def wait(lxc_state):
+            if not container.wait(lxc_state, self.timeout):
+                raise LxcContainerStateError(
+                    'The container [ %s ] did not become %s within %s'
+                    ' seconds.' % (
+                        container_name, lxc_state.lower(), self.timeout
+                    )
+                )
+
+        if self.state == 'restarted' and state != 'stopped':
+            container.stop()
+            wait('STOPPED')
+            state = 'stopped'
+            result['changed'] = True
+
+        if self.state in ['started', 'restarted']:
+            if state == 'frozen':
+                container.unfreeze()
+                result['changed'] = True
+            elif state != 'running':
+                container.start()
+                result['changed'] = True
+        elif self.state == 'stopped':
+            if state != 'stopped':
+                container.stop()
+                result['changed'] = True
+        elif self.state == 'frozen':
+            if state == 'stopped':
+                container.start()
+                wait('RUNNING')
+            if state != 'frozen':
+                container.freeze()
+                result['changed'] = True
+
+        wait(LXC_BULK_STATES[self.state])
+        result['state'] = str(container.state).lower()
+        result['seconds'] = round(time.time() - start_time, 3)
+        return result
+
+    def _worker(self, queue, results):
+        """Process container names from the queue until it is empty.
+
+        :param queue: Queue of container names.
+        :type queue: ``object``
+        :param results: Map of container name to result.
+        :type results: ``dict``
+        """
+
+        while True:
+            try:
+                container_name = queue.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                results[container_name] = self._transition(container_name)
+            except Exception as e:
+                results[container_name] = {
+                    'changed': False,
+                    'failed': True,
+                    'msg': str(e)
+                }
+
+    def run(self):
+        """Run the main method."""
+
+        if self.state not in LXC_BULK_STATES:
+            self.module.fail_json(
+                msg='The state [ %s ] is not supported with containers, use'
+                    ' one of: %s' % (
+                        self.state, ', '.join(sorted(LXC_BULK_STATES))
+                    )
+            )
+
+        existing = set(lxc.list_containers())
+        missing = [i for i in self.container_names if i not in existing]
+        if missing:
+            self.module.fail_json(
+                msg='The containers [ %s ] do not exist.' % ', '.join(missing)
+            )
+
+        queue = Queue.Queue()
+        for container_name in self.container_names:
+            queue.put(container_name)
+
+        results = dict()
+        threads = [
+            threading.Thread(target=self._worker, args=(queue, results))
+            for _ in xrange(min(self.workers, len(self.container_names)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        changed = any([i['changed'] for i in results.values()])
+        failed = sorted([k for k, v in results.items() if v.get('failed')])
+        if failed:
+            self.module.fail_json(
+                changed=changed,
+                lxc_containers=results,
+                msg='Failed to change the state of containers [ %s ]'
+                    % ', '.join(failed)
+            )
+
+        self.module.exit_json(
+            changed=changed,
+            lxc_containers=results
+        )
+
+
 def main():
     """Ansible Main module."""
 
     module = AnsibleModule(
         argument_spec=dict(
             name=dict(
-                type='str',
-                required=True
+                type='str'
+            ),
+            containers=dict(
+                type='list'
+            ),
+            workers=dict(
+                type='int',
+                default=8
+            ),
+            timeout=dict(
+                type='int',
+                default=60
             ),
             template=dict(
                 type='str',
@@ -1709,8 +1977,14 @@ def main():
             archive_compression=dict(
                 choices=LXC_COMPRESSION_MAP.keys(),
                 default='gzip'
+            ),
+            archive_threads=dict(
+                type='int',
+                default=0
             )
         ),
+        required_one_of=[['name', 'containers']],
+        mutually_exclusive=[['name', 'containers']],
         supports_check_mode=False,
     )
 
@@ -1719,6 +1993,15 @@ def main():
             msg='The `lxc` module is not importable. Check the requirements.'
         )
 
+    if module.params.get('containers') is not None:
+        if not module.params['containers']:
+            module.fail_json(
+                msg='The `containers` list is empty, name at least one'
+                    ' container.'
+            )
+        lxc_bulk = LxcContainerBulkManagement(module=module)
+        lxc_bulk.run()
+
     lv_name = module.params.get('lv_name')
     if not lv_name:
         module.params['lv_name'] = module.params.get('name')
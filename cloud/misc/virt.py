@@ -27,7 +27,7 @@ options:
     description:
       - name of the guest VM being managed. Note that VM must be previously
         defined with xml.
-    required: true
+    required: false
     default: null
     aliases: []
   state:
@@ -55,6 +55,31 @@ options:
       - XML document used with the define command
     required: false
     default: null
+  guests:
+    description:
+      - A list of guests to converge in one run, each a dictionary with a
+        C(name) and a C(state) (one of C(running), C(shutdown), C(destroyed)
+        or C(paused)).
+      - All guests are handled over a single libvirt connection by a bounded
+        pool of workers. Mutually exclusive with I(name), I(state) and
+        I(command).
+    required: false
+    default: null
+    version_added: "2.1"
+  workers:
+    description:
+      - Maximum number of guests changed concurrently when I(guests) is used.
+    required: false
+    default: 8
+    version_added: "2.1"
+  shutdown_timeout:
+    description:
+      - Number of seconds to wait, shared by all guests, for guests requested
+        to be C(shutdown) to actually power off when I(guests) is used.
+      - Set to C(0) to send the shutdown requests without waiting.
+    required: false
+    default: 300
+    version_added: "2.1"
 requirements:
     - "python >= 2.6"
     - "libvirt-python"
@@ -82,6 +107,16 @@ tasks:
           uri=lxc:///
   - name: start vm
     virt: name=foo state=running uri=lxc:///
+
+# converge many guests at once, e.g. to evacuate a hypervisor
+- virt:
+    workers: 16
+    shutdown_timeout: 600
+    guests:
+      - { name: web01, state: shutdown }
+      - { name: web02, state: shutdown }
+      - { name: db01, state: destroyed }
+      - { name: build01, state: running }
 '''
 
 VIRT_FAILED = 1
@@ -89,6 +124,8 @@ VIRT_SUCCESS = 0
 VIRT_UNAVAILABLE=2
 
 import sys
+import time
+import threading
 
 try:
     import libvirt
@@ -104,6 +141,8 @@ HOST_COMMANDS = ['freemem', 'list_vms', 'info', 'nodeinfo', 'virttype']
 ALL_COMMANDS.extend(VM_COMMANDS)
 ALL_COMMANDS.extend(HOST_COMMANDS)
 
+GUEST_STATES = ['running', 'shutdown', 'destroyed', 'paused']
+
 VIRT_STATE_NAME_MAP = {
    0 : "running",
    1 : "running",
@@ -397,6 +436,114 @@ class Virt(object):
         self.__get_conn()
         return self.conn.define_from_xml(xml)
 
+    def converge(self, guests, workers, shutdown_timeout):
+        """
+        Bring every guest in the given list of {name, state} dictionaries to
+        its desired state, sharing one connection and a bounded worker pool.
+        Graceful shutdowns are all waited on against a single deadline.
+        """
+        self.__get_conn()
+        domains = dict((vm.name(), vm) for vm in self.conn.find_vm(-1))
+
+        missing = [g['name'] for g in guests if g['name'] not in domains]
+        if missing:
+            raise VMNotFound("virtual machines not found: %s" % ', '.join(missing))
+
+        results = dict()
+        actions = []
+        for guest in guests:
+            vm = domains[guest['name']]
+            current = self.conn.get_status2(vm)
+            action = converge_action(current, guest['state'])
+            results[guest['name']] = dict(before=current, state=current,
+                                          changed=action is not None)
+            if action:
+                actions.append((guest['name'], vm, action))
+
+        # the guests share the connection; each thread takes every workers-th action
+        def apply_actions(chunk):
+            for name, vm, action in chunk:
+                try:
+                    getattr(vm, action)()
+                except Exception, e:
+                    results[name]['failed'] = True
+                    results[name]['msg'] = str(e)
+
+        threads = [threading.Thread(target=apply_actions, args=(actions[n::workers],))
+                   for n in range(min(workers, len(actions)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        pending = [(name, vm) for name, vm, action in actions
+                   if action == 'shutdown' and not results[name].get('failed')]
+        if shutdown_timeout > 0:
+            deadline = time.time() + shutdown_timeout
+            while pending:
+                pending = [(name, vm) for name, vm in pending
+                           if self.conn.get_status2(vm) != 'shutdown']
+                if not pending or time.time() >= deadline:
+                    break
+                time.sleep(1)
+            for name, vm in pending:
+                results[name]['failed'] = True
+                results[name]['msg'] = "timed out waiting for shutdown"
+
+        for name in results:
+            results[name]['state'] = self.conn.get_status2(domains[name])
+        return results
+
+
+def converge_action(current, desired):
+    """
+    Return the name of the libvirt domain method needed to move a guest from
+    its current state to the desired one, or None if nothing needs doing.
+    """
+    if desired == 'running':
+        if current == 'paused':
+            return 'resume'
+        elif current != 'running':
+            return 'create'
+    elif desired == 'shutdown':
+        if current != 'shutdown':
+            return 'shutdown'
+    elif desired == 'destroyed':
+        if current != 'shutdown':
+            return 'destroy'
+    elif desired == 'paused':
+        if current == 'running':
+            return 'suspend'
+    return None
+
+def core_batch(module):
+
+    guests           = module.params.get('guests')
+    workers          = module.params.get('workers')
+    shutdown_timeout = module.params.get('shutdown_timeout')
+    uri              = module.params.get('uri')
+
+    if workers < 1:
+        module.fail_json(msg="workers must be at least 1")
+
+    for guest in guests:
+        if not isinstance(guest, dict) or 'name' not in guest:
+            module.fail_json(msg="each entry in guests requires a name")
+        if guest.get('state') not in GUEST_STATES:
+            module.fail_json(msg="guest %s requires a state, one of: %s" % (guest['name'], ', '.join(GUEST_STATES)))
+
+    v = Virt(uri, module)
+    results = v.converge(guests, workers, shutdown_timeout)
+
+    res = dict(
+        changed=any(r['changed'] for r in results.values()),
+        guests=results,
+    )
+    failed = sorted(name for name, r in results.items() if r.get('failed'))
+    if failed:
+        module.fail_json(msg="failed to converge guests: %s" % ', '.join(failed), **res)
+    return VIRT_SUCCESS, res
+
 def core(module):
 
     state      = module.params.get('state', None)
@@ -476,20 +623,31 @@ def main():
 
     module = AnsibleModule(argument_spec=dict(
         name = dict(aliases=['guest']),
-        state = dict(choices=['running', 'shutdown', 'destroyed', 'paused']),
+        state = dict(choices=GUEST_STATES),
         command = dict(choices=ALL_COMMANDS),
         uri = dict(default='qemu:///system'),
         xml = dict(),
-    ))
+        guests = dict(type='list'),
+        workers = dict(type='int', default=8),
+        shutdown_timeout = dict(type='int', default=300),
+    ),
+    mutually_exclusive = [['guests', 'name'], ['guests', 'state'], ['guests', 'command']],
+    )
 
     if not HAS_VIRT:
         module.fail_json(
             msg='The `libvirt` module is not importable. Check the requirements.'
         )
 
+    if module.params.get('guests') == []:
+        module.fail_json(msg="guests must list at least one guest")
+
     rc = VIRT_SUCCESS
     try:
-        rc, result = core(module)
+        if module.params.get('guests') is not None:
+            rc, result = core_batch(module)
+        else:
+            rc, result = core(module)
     except Exception, e:
         module.fail_json(msg=str(e))
 
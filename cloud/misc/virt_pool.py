@@ -71,6 +71,14 @@ options:
         choices: [ 'new', 'repair', 'resize', 'no_overwrite', 'overwrite', 'normal', 'zeroed' ]
         description:
             - Pass additional parameters to 'build' or 'delete' commands.
+    volume_details:
+        required: false
+        default: "no"
+        choices: ["yes", "no"]
+        version_added: "2.1"
+        description:
+            - When gathering C(facts) or C(info), also report the type, path,
+              capacity and allocation of every volume in active pools.
 requirements:
     - "python >= 2.6"
     - "python-libvirt"
@@ -106,6 +114,9 @@ EXAMPLES = '''
 # Facts will be available as 'ansible_libvirt_pools'
 - virt_pool: command=facts
 
+# Gather facts about storage pools including the size of every volume
+- virt_pool: command=facts volume_details=yes
+
 # Gather information about pools managed by 'libvirt' remotely using uri
 - virt_pool: command=info uri='{{ item }}'
   with_items: libvirt_uris
@@ -174,6 +185,14 @@ ENTRY_STATE_INFO_MAP = {
     4 : "inaccessible"
 }
 
+VOLUME_TYPE_MAP = {
+    0 : "file",
+    1 : "block",
+    2 : "dir",
+    3 : "network",
+    4 : "netdir"
+}
+
 ENTRY_BUILD_FLAGS_MAP = {
     "new" : 0,
     "repair" : 1,
@@ -233,6 +252,12 @@ class LibvirtConnection(object):
 
         raise EntryNotFound("storage pool %s not found" % entryid)
 
+    def list_all_entries(self):
+        # Fetch every pool with a single call where libvirt supports it
+        if hasattr(self.conn, 'listAllStoragePools'):
+            return self.conn.listAllStoragePools(0)
+        return self.find_entry(-1)
+
     def create(self, entryid):
         if not self.module.check_mode:
             return self.find_entry(entryid).create()
@@ -273,64 +298,9 @@ class LibvirtConnection(object):
             except:
                 return ENTRY_STATE_ACTIVE_MAP.get("inactive","unknown")
 
-    def get_uuid(self, entryid):
-        return self.find_entry(entryid).UUIDString()
-
     def get_xml(self, entryid):
         return self.find_entry(entryid).XMLDesc(0)
 
-    def get_info(self, entryid):
-        return self.find_entry(entryid).info()
-
-    def get_volume_count(self, entryid):
-        return self.find_entry(entryid).numOfVolumes()
-
-    def get_volume_names(self, entryid):
-        return self.find_entry(entryid).listVolumes()
-
-    def get_devices(self, entryid):
-        xml = etree.fromstring(self.find_entry(entryid).XMLDesc(0))
-        if xml.xpath('/pool/source/device'):
-            result = []
-            for device in xml.xpath('/pool/source/device'):
-                result.append(device.get('path'))
-        try:
-            return result
-        except:
-            raise ValueError('No devices specified')
-
-    def get_format(self, entryid):
-        xml = etree.fromstring(self.find_entry(entryid).XMLDesc(0))
-        try:
-            result = xml.xpath('/pool/source/format')[0].get('type')
-        except:
-            raise ValueError('Format not specified')
-        return result
-
-    def get_host(self, entryid):
-        xml = etree.fromstring(self.find_entry(entryid).XMLDesc(0))
-        try:
-            result = xml.xpath('/pool/source/host')[0].get('name')
-        except:
-            raise ValueError('Host not specified')
-        return result
-
-    def get_source_path(self, entryid):
-        xml = etree.fromstring(self.find_entry(entryid).XMLDesc(0))
-        try:
-            result = xml.xpath('/pool/source/dir')[0].get('path')
-        except:
-            raise ValueError('Source path not specified')
-        return result
-
-    def get_path(self, entryid):
-        xml = etree.fromstring(self.find_entry(entryid).XMLDesc(0))
-        return xml.xpath('/pool/target/path')[0].text
-
-    def get_type(self, entryid):
-        xml = etree.fromstring(self.find_entry(entryid).XMLDesc(0))
-        return xml.get('type')
-
     def build(self, entryid, flags):
         if not self.module.check_mode:
             return self.find_entry(entryid).build(flags)
@@ -380,10 +350,6 @@ class LibvirtConnection(object):
     def refresh(self, entryid):
         return self.find_entry(entryid).refresh()
 
-    def get_persistent(self, entryid):
-        state = self.find_entry(entryid).isPersistent()
-        return ENTRY_STATE_PERSISTENT_MAP.get(state,"unknown")
-
     def define_from_xml(self, entryid, xml):
         if not self.module.check_mode:
             return self.conn.storagePoolDefineXML(xml)
@@ -463,63 +429,34 @@ class VirtStoragePool(object):
     def refresh(self, entryid):
         return self.conn.refresh(entryid)
 
-    def info(self):
-        return self.facts(facts_mode='info')
+    def info(self, volume_details=False):
+        return self.facts(facts_mode='info', volume_details=volume_details)
 
-    def facts(self, facts_mode='facts'):
+    def facts(self, facts_mode='facts', volume_details=False):
         results = dict()
-        for entry in self.list_pools():
-            results[entry] = dict()
-            if self.conn.find_entry(entry):
-                data = self.conn.get_info(entry)
-                # libvirt returns maxMem, memory, and cpuTime as long()'s, which
-                # xmlrpclib tries to convert to regular int's during serialization.
-                # This throws exceptions, so convert them to strings here and
-                # assume the other end of the xmlrpc connection can figure things
-                # out or doesn't care.
-                results[entry] = {
-                    "status"    : ENTRY_STATE_INFO_MAP.get(data[0],"unknown"),
-                    "size_total"  : str(data[1]),
-                    "size_used"  : str(data[2]),
-                    "size_available"  : str(data[3]),
-                }
-                results[entry]["autostart"] = self.conn.get_autostart(entry)
-                results[entry]["persistent"] = self.conn.get_persistent(entry)
-                results[entry]["state"] = self.conn.get_status(entry)
-                results[entry]["path"] = self.conn.get_path(entry)
-                results[entry]["type"] = self.conn.get_type(entry)
-                results[entry]["uuid"] = self.conn.get_uuid(entry)
-                if self.conn.find_entry(entry).isActive():
-                    results[entry]["volume_count"] = self.conn.get_volume_count(entry)
-                    results[entry]["volumes"] = list()
-                    for volume in self.conn.get_volume_names(entry):
-                        results[entry]["volumes"].append(volume)
-                else:
-                    results[entry]["volume_count"] = -1
-
-                try:
-                    results[entry]["host"] = self.conn.get_host(entry)
-                except ValueError as e:
-                    pass
-
-                try:
-                    results[entry]["source_path"] = self.conn.get_source_path(entry)
-                except ValueError as e:
-                    pass
-
-                try:
-                    results[entry]["format"] = self.conn.get_format(entry)
-                except ValueError as e:
-                    pass
-
-                try:
-                    devices = self.conn.get_devices(entry)
-                    results[entry]["devices"] = devices
-                except ValueError as e:
-                    pass
-
+        for entry in self.conn.list_all_entries():
+            data = entry.info()
+            # libvirt returns maxMem, memory, and cpuTime as long()'s, which
+            # xmlrpclib tries to convert to regular int's during serialization.
+            # This throws exceptions, so convert them to strings here and
+            # assume the other end of the xmlrpc connection can figure things
+            # out or doesn't care.
+            result = {
+                "status"    : ENTRY_STATE_INFO_MAP.get(data[0],"unknown"),
+                "size_total"  : str(data[1]),
+                "size_used"  : str(data[2]),
+                "size_available"  : str(data[3]),
+            }
+            result["autostart"] = ENTRY_STATE_AUTOSTART_MAP.get(entry.autostart(),"unknown")
+            result["persistent"] = ENTRY_STATE_PERSISTENT_MAP.get(entry.isPersistent(),"unknown")
+            result["state"] = self.conn.get_status2(entry)
+            result["uuid"] = entry.UUIDString()
+            result.update(parse_pool_xml(entry.XMLDesc(0)))
+            if result["state"] == 'active':
+                result.update(volume_facts(entry, volume_details))
             else:
-                results[entry]["state"] = self.conn.get_status(entry)
+                result["volume_count"] = -1
+            results[entry.name()] = result
 
         facts = dict()
         if facts_mode == 'facts':
@@ -530,6 +467,56 @@ class VirtStoragePool(object):
         return facts
 
 
+def parse_pool_xml(xml):
+    # Extract everything facts needs from one parse of the pool XML document
+    xml = etree.fromstring(xml)
+    result = dict(
+        type = xml.get('type'),
+        path = xml.findtext('target/path'),
+    )
+
+    host = xml.find('source/host')
+    if host is not None:
+        result["host"] = host.get('name')
+
+    source_dir = xml.find('source/dir')
+    if source_dir is not None:
+        result["source_path"] = source_dir.get('path')
+
+    source_format = xml.find('source/format')
+    if source_format is not None:
+        result["format"] = source_format.get('type')
+
+    devices = [device.get('path') for device in xml.findall('source/device')]
+    if devices:
+        result["devices"] = devices
+
+    return result
+
+
+def volume_facts(entry, volume_details=False):
+    if not volume_details:
+        volumes = entry.listVolumes()
+        return dict(volume_count=len(volumes), volumes=list(volumes))
+
+    if hasattr(entry, 'listAllVolumes'):
+        volumes = entry.listAllVolumes(0)
+    else:
+        volumes = [entry.storageVolLookupByName(name) for name in entry.listVolumes()]
+
+    details = dict()
+    for volume in volumes:
+        data = volume.info()
+        details[volume.name()] = {
+            "type"       : VOLUME_TYPE_MAP.get(data[0],"unknown"),
+            "capacity"   : str(data[1]),
+            "allocation" : str(data[2]),
+            "path"       : volume.path(),
+        }
+    return dict(volume_count=len(details), volumes=sorted(details.keys()),
+                volume_details=details)
+
+
 def core(module):
 
     state     = module.params.get('state', None)
@@ -539,6 +526,7 @@ def core(module):
     xml       = module.params.get('xml', None)
     autostart = module.params.get('autostart', None)
     mode      = module.params.get('mode', None)
+    volume_details = module.params.get('volume_details', False)
 
     v = VirtStoragePool(uri, module)
     res = {}
@@ -592,6 +580,9 @@ def core(module):
 
         return VIRT_SUCCESS, res
 
+    if command in [ 'facts', 'info' ]:
+        return VIRT_SUCCESS, v.facts(facts_mode=command, volume_details=volume_details)
+
     if command:
         if command in ENTRY_COMMANDS:
             if not name:
@@ -659,6 +650,7 @@ def main():
             xml = dict(),
             autostart = dict(choices=['yes', 'no']),
             mode = dict(choices=ALL_MODES),
+            volume_details = dict(default='no', type='bool'),
         ),
         supports_check_mode = True
     )
@@ -35,6 +35,7 @@ options:
     mode:
         description:
             - module operating mode. Could be getslave (SHOW SLAVE STATUS), getmaster (SHOW MASTER STATUS), changemaster (CHANGE MASTER TO), startslave (START SLAVE), stopslave (STOP SLAVE), resetslave (RESET SLAVE), resetslaveall (RESET SLAVE ALL)
+            - wait_for_catchup samples SHOW SLAVE STATUS every C(poll_interval) seconds on one connection until the slave is within C(target_lag) seconds of its master, and fails once C(catchup_timeout) has passed. With a target of 0 the slave must also have applied everything it has read from the master, compared by GTID set when GTIDs are in use and by binlog position otherwise. Returns the lag percentiles and apply rate over the samples.
         required: False
         choices:
             - getslave
@@ -44,6 +45,7 @@ options:
             - startslave
             - resetslave
             - resetslaveall
+            - wait_for_catchup
         default: getslave
     login_user:
         description:
@@ -118,6 +120,24 @@ options:
         required: false
         default: null
         version_added: "2.0"
+    target_lag:
+        description:
+            - with C(mode=wait_for_catchup), the Seconds_Behind_Master the slave has to reach
+        required: false
+        default: 0
+        version_added: "2.1"
+    catchup_timeout:
+        description:
+            - with C(mode=wait_for_catchup), how many seconds to wait for the slave to catch up
+        required: false
+        default: 300
+        version_added: "2.1"
+    poll_interval:
+        description:
+            - with C(mode=wait_for_catchup), seconds between two samples of the slave status
+        required: false
+        default: 1
+        version_added: "2.1"
 '''
 
 EXAMPLES = '''
@@ -132,10 +152,15 @@ EXAMPLES = '''
 
 # Check slave status using port 3308
 - mysql_replication: mode=getslave login_host=ansible.example.com login_port=3308
+
+# Wait up to 10 minutes for the slave to be less than 5 seconds behind its master
+- mysql_replication: mode=wait_for_catchup target_lag=5 catchup_timeout=600
 '''
 
 import ConfigParser
+import math
 import os
+import time
 import warnings
 
 try:
@@ -200,6 +225,119 @@ def changemaster(cursor, chm, chm_params):
     cursor.execute(query, chm_params)
 
 
+def parse_gtid_set(gtid_set):
+    """ Parse a GTID set into a dict of server uuid to list of (first, last)
+
+    >>> parse_gtid_set('3E11FA47-71CA-11E1-9E33-C80AA9429562:1-5:7,4a1b:3')
+    {'3e11fa47-71ca-11e1-9e33-c80aa9429562': [(1, 5), (7, 7)], '4a1b': [(3, 3)]}
+
+    """
+    intervals = {}
+    for part in (gtid_set or '').replace('\n', '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        fields = part.split(':')
+        ranges = intervals.setdefault(fields[0].lower(), [])
+        for interval in fields[1:]:
+            bounds = interval.split('-')
+            ranges.append((int(bounds[0]), int(bounds[-1])))
+    return intervals
+
+
+def gtid_count(intervals):
+    return sum(last - first + 1 for ranges in intervals.values() for first, last in ranges)
+
+
+def gtid_subset(subset, superset):
+    """ Whether every transaction of the parsed GTID set subset is in superset """
+    for uuid, ranges in subset.items():
+        for first, last in ranges:
+            if not any(f <= first and last <= l for f, l in superset.get(uuid, [])):
+                return False
+    return True
+
+
+def percentile(values, pct):
+    """ Nearest-rank percentile of a non-empty list """
+    ordered = sorted(values)
+    rank = int(math.ceil(pct / 100.0 * len(ordered))) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+def slave_caught_up(slavestatus, target_lag):
+    lag = slavestatus.get('Seconds_Behind_Master')
+    if lag is None or lag > target_lag:
+        return False
+    if target_lag > 0:
+        return True
+    # Seconds_Behind_Master only has a one second resolution, so for a target
+    # of 0 make sure everything read from the master has been applied
+    retrieved = parse_gtid_set(slavestatus.get('Retrieved_Gtid_Set'))
+    if retrieved:
+        return gtid_subset(retrieved, parse_gtid_set(slavestatus.get('Executed_Gtid_Set')))
+    return (slavestatus.get('Relay_Master_Log_File') == slavestatus.get('Master_Log_File') and
+            slavestatus.get('Exec_Master_Log_Pos') == slavestatus.get('Read_Master_Log_Pos'))
+
+
+def wait_for_catchup(module, cursor, target_lag, timeout, interval):
+    started = time.time()
+    deadline = started + timeout
+    lags = []
+    applied_bytes = 0
+    first = previous = None
+    while True:
+        slavestatus = get_slave_status(cursor)
+        if slavestatus is None:
+            module.fail_json(msg="Server is not configured as mysql slave")
+        now = time.time()
+        if first is None:
+            first = (now, slavestatus)
+        elif slavestatus.get('Relay_Master_Log_File') == previous.get('Relay_Master_Log_File'):
+            # positions of different binlog files cannot be compared
+            applied_bytes += max((slavestatus.get('Exec_Master_Log_Pos') or 0) - (previous.get('Exec_Master_Log_Pos') or 0), 0)
+        previous = slavestatus
+
+        lag = slavestatus.get('Seconds_Behind_Master')
+        if lag is not None:
+            lags.append(lag)
+        caught_up = slave_caught_up(slavestatus, target_lag)
+        stopped = slavestatus.get('Slave_IO_Running') != 'Yes' or slavestatus.get('Slave_SQL_Running') != 'Yes'
+        if caught_up or stopped or now >= deadline:
+            break
+        time.sleep(max(min(interval, deadline - time.time()), 0))
+
+    elapsed = now - started
+    sampled = now - first[0]
+    result = dict(
+        caught_up=caught_up,
+        elapsed=round(elapsed, 3),
+        samples=len(lags),
+        slave_io_running=slavestatus.get('Slave_IO_Running'),
+        slave_sql_running=slavestatus.get('Slave_SQL_Running'),
+        seconds_behind_master=lag,
+        executed_gtid_set=slavestatus.get('Executed_Gtid_Set'),
+        retrieved_gtid_set=slavestatus.get('Retrieved_Gtid_Set'),
+    )
+    if lags:
+        result['lag'] = dict(min=min(lags), max=max(lags), p50=percentile(lags, 50),
+                             p90=percentile(lags, 90), p99=percentile(lags, 99))
+    if sampled > 0:
+        rate = dict(bytes_per_second=round(applied_bytes / sampled, 1))
+        executed = gtid_count(parse_gtid_set(slavestatus.get('Executed_Gtid_Set')))
+        if executed:
+            executed_before = gtid_count(parse_gtid_set(first[1].get('Executed_Gtid_Set')))
+            rate['transactions_per_second'] = round((executed - executed_before) / sampled, 1)
+        result['apply_rate'] = rate
+
+    if caught_up:
+        module.exit_json(changed=False, **result)
+    elif stopped:
+        module.fail_json(msg="Slave threads are not running: %s" % (slavestatus.get('Last_Error') or slavestatus.get('Last_IO_Error')), **result)
+    else:
+        module.fail_json(msg="Slave did not catch up within %s seconds" % timeout, **result)
+
+
 def strip_quotes(s):
     """ Remove surrounding single or double quotes
 
@@ -267,7 +405,7 @@ def main():
             login_host=dict(default="localhost"),
             login_port=dict(default=3306, type='int'),
             login_unix_socket=dict(default=None),
-            mode=dict(default="getslave", choices=["getmaster", "getslave", "changemaster", "stopslave", "startslave"]),
+            mode=dict(default="getslave", choices=["getmaster", "getslave", "changemaster", "stopslave", "startslave", "wait_for_catchup"]),
             master_auto_position=dict(default=False, type='bool'),
             master_host=dict(default=None),
             master_user=dict(default=None),
@@ -284,6 +422,9 @@ def main():
             master_ssl_cert=dict(default=None),
             master_ssl_key=dict(default=None),
             master_ssl_cipher=dict(default=None),
+            target_lag=dict(default=0, type='int'),
+            catchup_timeout=dict(default=300, type='int'),
+            poll_interval=dict(default=1, type='float'),
         )
     )
     user = module.params["login_user"]
@@ -357,6 +498,9 @@ def main():
         except TypeError:
             module.fail_json(msg="Server is not configured as mysql slave")
 
+    elif mode == "wait_for_catchup":
+        wait_for_catchup(module, cursor, module.params["target_lag"], module.params["catchup_timeout"], module.params["poll_interval"])
+
     elif mode in "changemaster":
         chm=[]
         chm_params = {}
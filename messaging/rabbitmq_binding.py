@@ -40,8 +40,19 @@ options:
     name:
         description:
             - source exchange to create binding on
-        required: true
+            - Required unless C(bindings) is given.
+        required: false
         aliases: [ "src", "source" ]
+    bindings:
+        description:
+            - List of bindings of C(vhost) to manage in one run, as dictionaries with the keys name, destination,
+              destination_type, routing_key, arguments and state. Keys left out take the value of the module
+              option of the same name.
+            - The existing bindings are read with a single call and one keep-alive connection is used for all
+              changes.
+        required: false
+        default: null
+        version_added: "2.1"
     login_user:
         description:
             - rabbitMQ user for connection
@@ -71,12 +82,14 @@ options:
     destination:
         description:
             - destination exchange or queue for the binding
-        required: true
+            - Required with C(name).
+        required: false
         aliases: [ "dst", "dest" ]
     destination_type:
         description:
             - Either queue or exchange
-        required: true
+            - Required with C(name).
+        required: false
         choices: [ "queue", "exchange" ]
         aliases: [ "type", "dest_type" ]
     routing_key:
@@ -98,30 +111,155 @@ EXAMPLES = '''
 
 # Bind directExchange to topicExchange with routing key *.info
 - rabbitmq_binding: name=topicExchange destination=topicExchange type=exchange routing_key="*.info"
+
+# Bind several queues to directExchange
+- rabbitmq_binding:
+    destination_type: queue
+    bindings:
+      - name: directExchange
+        destination: myQueue
+        routing_key: info
+      - name: directExchange
+        destination: myOtherQueue
+        routing_key: warning
 '''
 
-import requests
 import urllib
 import json
 
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+
+class RabbitMqApi(object):
+    def __init__(self, module):
+        self.module = module
+        self.base_url = "http://%s:%s/api" % (module.params['login_host'], module.params['login_port'])
+        # one keep-alive connection for every call of the run
+        self.session = requests.Session()
+        self.session.auth = (module.params['login_user'], module.params['login_password'])
+        self.session.headers.update({"content-type": "application/json"})
+
+    def request(self, method, path, data=None):
+        if self.module.check_mode and method != 'GET':
+            return None
+        url = "/".join([self.base_url] + [urllib.quote(part, '') for part in path])
+        if data is not None:
+            data = json.dumps(data)
+        try:
+            r = self.session.request(method, url, data=data)
+        except requests.exceptions.RequestException, e:
+            self.module.fail_json(msg="Failed to connect to the RabbitMQ management API at %s: %s" % (url, e))
+        if method == 'GET' and r.status_code == 404:
+            return None
+        if r.status_code not in (200, 201, 204):
+            self.module.fail_json(msg="Invalid response from RESTAPI for %s %s" % (method, url),
+                                  status=r.status_code, details=r.text)
+        if r.status_code == 200 and r.text:
+            return r.json()
+        return {}
+
+    def get(self, *path):
+        return self.request('GET', path)
+
+    def post(self, path, data):
+        return self.request('POST', path, data)
+
+    def delete(self, *path):
+        return self.request('DELETE', path)
+
+
+def binding_batch(module):
+    api = RabbitMqApi(module)
+    vhost = module.params['vhost']
+    keys = ['state', 'destination', 'destination_type', 'routing_key', 'arguments']
+
+    # one list call for the whole vhost
+    existing = api.get('bindings', vhost)
+    if existing is None:
+        module.fail_json(msg="vhost %s not found" % vhost)
+    index = {}
+    for binding in existing:
+        key = (binding['source'], binding['destination_type'], binding['destination'], binding['routing_key'])
+        index.setdefault(key, []).append(binding)
+
+    create = []
+    delete = []
+    for entry in module.params['bindings']:
+        if not isinstance(entry, dict):
+            module.fail_json(msg="Each entry of bindings must be a dictionary.")
+        spec = dict((key, module.params[key]) for key in keys)
+        spec.update(entry)
+        if spec['state'] not in ('present', 'absent'):
+            module.fail_json(msg="Invalid state %s in bindings." % spec['state'])
+        for alias in ('src', 'source'):
+            if alias in spec:
+                spec['name'] = spec.pop(alias)
+        for alias in ('dst', 'dest'):
+            if alias in spec:
+                spec['destination'] = spec.pop(alias)
+        for alias in ('type', 'dest_type'):
+            if alias in spec:
+                spec['destination_type'] = spec.pop(alias)
+        if not spec.get('name') or not spec.get('destination') or \
+                spec.get('destination_type') not in ('queue', 'exchange'):
+            module.fail_json(msg="Each entry of bindings needs a name, a destination and a destination_type "
+                                 "of queue or exchange.")
+        arguments = spec['arguments'] or {}
+        key = (spec['name'], spec['destination_type'], spec['destination'], spec['routing_key'])
+        matches = [b for b in index.get(key, []) if (b.get('arguments') or {}) == arguments]
+        if spec['state'] == 'absent':
+            delete.extend(matches)
+        elif not matches:
+            create.append((spec, arguments))
+
+    for spec, arguments in create:
+        api.post(('bindings', vhost, 'e', spec['name'], spec['destination_type'][0], spec['destination']),
+                 dict(routing_key=spec['routing_key'], arguments=arguments))
+    for binding in delete:
+        api.delete('bindings', vhost, 'e', binding['source'], binding['destination_type'][0],
+                   binding['destination'], binding['properties_key'])
+
+    module.exit_json(changed=bool(create or delete),
+                     created=[dict(name=spec['name'], destination=spec['destination'],
+                                   routing_key=spec['routing_key']) for spec, arguments in create],
+                     deleted=[dict(name=b['source'], destination=b['destination'],
+                                   routing_key=b['routing_key']) for b in delete])
+
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
             state = dict(default='present', choices=['present', 'absent'], type='str'),
-            name = dict(required=True, aliases=[ "src", "source" ], type='str'),
+            name = dict(required=False, aliases=[ "src", "source" ], type='str'),
+            bindings = dict(required=False, type='list'),
             login_user = dict(default='guest', type='str'),
             login_password = dict(default='guest', type='str', no_log=True),
             login_host = dict(default='localhost', type='str'),
             login_port = dict(default='15672', type='str'),
             vhost = dict(default='/', type='str'),
-            destination = dict(required=True, aliases=[ "dst", "dest"], type='str'),
-            destination_type = dict(required=True, aliases=[ "type", "dest_type"], choices=[ "queue", "exchange" ],type='str'),
+            destination = dict(required=False, aliases=[ "dst", "dest"], type='str'),
+            destination_type = dict(required=False, aliases=[ "type", "dest_type"], choices=[ "queue", "exchange" ],type='str'),
             routing_key = dict(default='#', type='str'),
             arguments = dict(default=dict(), type='dict')
         ),
+        required_one_of = [['name', 'bindings']],
+        mutually_exclusive = [['name', 'bindings']],
         supports_check_mode = True
     )
 
+    if not HAS_REQUESTS:
+        module.fail_json(msg="python requests is required for this module")
+
+    if module.params['bindings'] is not None:
+        binding_batch(module)
+
+    if not module.params['destination'] or not module.params['destination_type']:
+        module.fail_json(msg="destination and destination_type are required with name")
+
     if module.params['destination_type'] == "queue":
         dest_type="q"
     else:
@@ -0,0 +1,375 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2016, Ansible Project
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+DOCUMENTATION = '''
+---
+module: rabbitmq_definitions
+short_description: Manage many RabbitMQ users, vhosts, permissions, policies and parameters at once
+description:
+  - Reads the broker definitions with a single call to the management HTTP API, compares them with the
+    wanted users, vhosts, permissions, policies and parameters, and imports everything that is missing or
+    different with a single definitions upload. Entries with C(state=absent) are deleted one by one.
+  - Entries that are not listed are left alone.
+version_added: "2.1"
+requirements: [ python requests ]
+options:
+  users:
+    description:
+      - List of users as dictionaries with the keys name, password, tags (list or comma delimited string)
+        and state.
+      - Passwords are checked against the stored hash, so a user is only updated when its password or tags
+        differ. Without a password, new users are created without one and existing users keep theirs.
+    required: false
+    default: []
+  vhosts:
+    description:
+      - List of vhosts as dictionaries with the keys name and state.
+    required: false
+    default: []
+  permissions:
+    description:
+      - List of permissions as dictionaries with the keys user, vhost, configure_priv, write_priv, read_priv
+        and state. vhost defaults to C(/) and the privileges to C(^$), as in M(rabbitmq_user).
+    required: false
+    default: []
+  policies:
+    description:
+      - List of policies as dictionaries with the keys name, vhost, pattern, tags (the policy definition, as
+        in M(rabbitmq_policy)), priority, apply_to and state.
+    required: false
+    default: []
+  parameters:
+    description:
+      - List of parameters as dictionaries with the keys component, name, value (a JSON term, as a string or
+        as data), vhost and state.
+    required: false
+    default: []
+  login_user:
+    description:
+      - rabbitMQ user for connection
+    required: false
+    default: guest
+  login_password:
+    description:
+      - rabbitMQ password for connection
+    required: false
+    default: guest
+  login_host:
+    description:
+      - rabbitMQ host for connection
+    required: false
+    default: localhost
+  login_port:
+    description:
+      - rabbitMQ management api port
+    required: false
+    default: 15672
+'''
+
+EXAMPLES = '''
+- rabbitmq_definitions:
+    login_user: admin
+    login_password: secret
+    vhosts:
+      - name: /app
+      - name: /old
+        state: absent
+    users:
+      - name: app
+        password: changeme
+        tags: monitoring
+    permissions:
+      - user: app
+        vhost: /app
+        configure_priv: .*
+        read_priv: .*
+        write_priv: .*
+    policies:
+      - name: HA
+        vhost: /app
+        pattern: .*
+        tags:
+          ha-mode: all
+    parameters:
+      - component: federation-upstream
+        vhost: /app
+        name: origin
+        value: '{"uri": "amqp://origin"}'
+'''
+
+import base64
+import hashlib
+import json
+import os
+import urllib
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+
+HASH_FUNCTIONS = {
+    'rabbit_password_hashing_md5': hashlib.md5,
+    'rabbit_password_hashing_sha256': hashlib.sha256,
+    'rabbit_password_hashing_sha512': hashlib.sha512,
+}
+
+
+# RabbitMQ stores base64(salt + hash(salt + password)) with a 4 byte salt
+def hash_password(password, algorithm, salt=None):
+    if salt is None:
+        salt = os.urandom(4)
+    digest = HASH_FUNCTIONS[algorithm](salt + password.encode('utf-8')).digest()
+    return base64.b64encode(salt + digest)
+
+
+def password_matches(password, user):
+    password_hash = user.get('password_hash') or ''
+    if not password_hash:
+        return False
+    # brokers before 3.6 do not report the algorithm and only know md5
+    algorithm = user.get('hashing_algorithm') or 'rabbit_password_hashing_md5'
+    if algorithm not in HASH_FUNCTIONS:
+        # cannot be verified here, leave the password alone
+        return True
+    salt = base64.b64decode(password_hash)[:4]
+    return hash_password(password, algorithm, salt) == password_hash
+
+
+def as_list(value):
+    if not value:
+        return []
+    if isinstance(value, basestring):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    return list(value)
+
+
+class RabbitMqApi(object):
+    def __init__(self, module):
+        self.module = module
+        self.base_url = "http://%s:%s/api" % (module.params['login_host'], module.params['login_port'])
+        # one keep-alive connection for every call of the run
+        self.session = requests.Session()
+        self.session.auth = (module.params['login_user'], module.params['login_password'])
+        self.session.headers.update({"content-type": "application/json"})
+
+    def request(self, method, path, data=None):
+        if self.module.check_mode and method != 'GET':
+            return None
+        url = "/".join([self.base_url] + [urllib.quote(part, '') for part in path])
+        if data is not None:
+            data = json.dumps(data)
+        try:
+            r = self.session.request(method, url, data=data)
+        except requests.exceptions.RequestException, e:
+            self.module.fail_json(msg="Failed to connect to the RabbitMQ management API at %s: %s" % (url, e))
+        if method == 'GET' and r.status_code == 404:
+            return None
+        if r.status_code not in (200, 201, 204):
+            self.module.fail_json(msg="Invalid response from RESTAPI for %s %s" % (method, url),
+                                  status=r.status_code, details=r.text)
+        if r.status_code == 200 and r.text:
+            return r.json()
+        return {}
+
+    def get(self, *path):
+        return self.request('GET', path)
+
+    def post(self, path, data):
+        return self.request('POST', path, data)
+
+    def delete(self, *path):
+        return self.request('DELETE', path)
+
+
+class RabbitMqDefinitions(object):
+    def __init__(self, module):
+        self.module = module
+        self.api = RabbitMqApi(module)
+        self.imports = {}
+        self.deletes = []
+        self.imported = {}
+        self.deleted = {}
+
+        definitions = self.api.get('definitions') or {}
+        version = definitions.get('rabbit_version', '0')
+        try:
+            version = tuple(int(part) for part in version.split('.')[:2])
+        except ValueError:
+            version = (0, 0)
+        if version >= (3, 6):
+            self.hashing_algorithm = 'rabbit_password_hashing_sha256'
+        else:
+            self.hashing_algorithm = None
+
+        self.current = dict(
+            users=dict((u['name'], u) for u in definitions.get('users', [])),
+            vhosts=dict((v['name'], v) for v in definitions.get('vhosts', [])),
+            permissions=dict(((p['vhost'], p['user']), p) for p in definitions.get('permissions', [])),
+            policies=dict(((p['vhost'], p['name']), p) for p in definitions.get('policies', [])),
+            parameters=dict(((p['component'], p['vhost'], p['name']), p)
+                            for p in definitions.get('parameters', [])),
+        )
+
+    def _specs(self, kind, required, defaults):
+        specs = []
+        for entry in self.module.params[kind] or []:
+            if not isinstance(entry, dict):
+                self.module.fail_json(msg="Each entry of %s must be a dictionary." % kind)
+            spec = dict(defaults)
+            spec.update(entry)
+            spec.setdefault('state', 'present')
+            missing = [key for key in required if spec.get(key) is None]
+            if missing:
+                self.module.fail_json(msg="Entry %s of %s is missing %s." % (entry, kind, ", ".join(missing)))
+            if spec['state'] not in ('present', 'absent'):
+                self.module.fail_json(msg="Invalid state %s in %s." % (spec['state'], kind))
+            specs.append(spec)
+        return specs
+
+    def _plan(self, kind, key, spec, definition, normalize):
+        current = self.current[kind].get(key)
+        if isinstance(key, tuple):
+            name = list(key)
+        else:
+            name = key
+        if spec['state'] == 'absent':
+            if current is not None:
+                self.deletes.append((kind, key))
+                self.deleted.setdefault(kind, []).append(name)
+        elif current is None or normalize(current) != normalize(definition):
+            self.imports.setdefault(kind, []).append(definition)
+            self.imported.setdefault(kind, []).append(name)
+
+    def plan_vhosts(self):
+        for spec in self._specs('vhosts', ['name'], {}):
+            self._plan('vhosts', spec['name'], spec, dict(name=spec['name']), lambda v: v['name'])
+
+    def plan_users(self):
+        def normalize(user):
+            return (sorted(as_list(user.get('tags'))), user.get('password_hash') or '',
+                    user.get('hashing_algorithm'))
+
+        for spec in self._specs('users', ['name'], {}):
+            current = self.current['users'].get(spec['name'])
+            password = spec.get('password')
+            user = dict(name=spec['name'], tags=','.join(as_list(spec.get('tags'))))
+            if current is not None and (password is None or password_matches(password, current)):
+                user['password_hash'] = current.get('password_hash') or ''
+                if current.get('hashing_algorithm'):
+                    user['hashing_algorithm'] = current['hashing_algorithm']
+            elif password is None:
+                user['password_hash'] = ''
+            else:
+                algorithm = self.hashing_algorithm or 'rabbit_password_hashing_md5'
+                user['password_hash'] = hash_password(password, algorithm)
+                if self.hashing_algorithm:
+                    user['hashing_algorithm'] = self.hashing_algorithm
+            self._plan('users', spec['name'], spec, user, normalize)
+
+    def plan_permissions(self):
+        def normalize(permission):
+            return (permission['configure'], permission['write'], permission['read'])
+
+        defaults = dict(vhost='/', configure_priv='^$', write_priv='^$', read_priv='^$')
+        for spec in self._specs('permissions', ['user'], defaults):
+            permission = dict(user=spec['user'], vhost=spec['vhost'], configure=spec['configure_priv'],
+                              write=spec['write_priv'], read=spec['read_priv'])
+            self._plan('permissions', (spec['vhost'], spec['user']), spec, permission, normalize)
+
+    def plan_policies(self):
+        def normalize(policy):
+            return (policy['pattern'], policy.get('apply-to', 'all'), policy['definition'],
+                    int(policy.get('priority', 0)))
+
+        defaults = dict(vhost='/', priority=0, apply_to='all')
+        for spec in self._specs('policies', ['name'], defaults):
+            if spec['state'] == 'present' and (spec.get('pattern') is None or spec.get('tags') is None):
+                self.module.fail_json(msg="Policy %s needs a pattern and tags." % spec['name'])
+            policy = {'vhost': spec['vhost'], 'name': spec['name'], 'pattern': spec.get('pattern'),
+                      'apply-to': spec['apply_to'], 'definition': spec.get('tags'),
+                      'priority': int(spec['priority'])}
+            self._plan('policies', (spec['vhost'], spec['name']), spec, policy, normalize)
+
+    def plan_parameters(self):
+        for spec in self._specs('parameters', ['component', 'name'], dict(vhost='/')):
+            value = spec.get('value')
+            if isinstance(value, basestring):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    self.module.fail_json(msg="Value of parameter %s is not a JSON term." % spec['name'])
+            parameter = dict(component=spec['component'], vhost=spec['vhost'], name=spec['name'], value=value)
+            self._plan('parameters', (spec['component'], spec['vhost'], spec['name']), spec, parameter,
+                       lambda p: p['value'])
+
+    def apply(self):
+        if self.imports:
+            # the broker merges an uploaded definitions document into its own
+            self.api.post(('definitions',), self.imports)
+
+        # dependent objects first, deleting a vhost or user takes its permissions with it
+        order = ['permissions', 'policies', 'parameters', 'users', 'vhosts']
+        for kind, key in sorted(self.deletes, key=lambda d: order.index(d[0])):
+            if kind == 'permissions':
+                path = ('permissions', key[0], key[1])
+            elif kind in ('users', 'vhosts'):
+                path = (kind, key)
+            else:
+                path = (kind,) + key
+            self.api.delete(*path)
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            users=dict(type='list', default=[]),
+            vhosts=dict(type='list', default=[]),
+            permissions=dict(type='list', default=[]),
+            policies=dict(type='list', default=[]),
+            parameters=dict(type='list', default=[]),
+            login_user=dict(default='guest'),
+            login_password=dict(default='guest', no_log=True),
+            login_host=dict(default='localhost'),
+            login_port=dict(default='15672'),
+        ),
+        supports_check_mode=True
+    )
+
+    if not HAS_REQUESTS:
+        module.fail_json(msg="python requests is required for this module")
+
+    definitions = RabbitMqDefinitions(module)
+    definitions.plan_vhosts()
+    definitions.plan_users()
+    definitions.plan_permissions()
+    definitions.plan_policies()
+    definitions.plan_parameters()
+    definitions.apply()
+
+    changed = bool(definitions.imports or definitions.deletes)
+    module.exit_json(changed=changed, imported=definitions.imported, deleted=definitions.deleted)
+
+# import module snippets
+from ansible.module_utils.basic import *
+main()
@@ -33,7 +33,18 @@ options:
     name:
         description:
             - Name of the exchange to create
-        required: true
+            - Required unless C(exchanges) is given.
+        required: false
+    exchanges:
+        description:
+            - List of exchanges of C(vhost) to manage in one run, as names or as dictionaries with the keys name,
+              state, durable, exchange_type, auto_delete, internal and arguments. Keys left out take the value of
+              the module option of the same name.
+            - The existing exchanges are read with a single call and one keep-alive connection is used for all
+              changes.
+        required: false
+        default: null
+        version_added: "2.1"
     state:
         description:
             - Whether the exchange should be present or absent
@@ -104,17 +115,123 @@ EXAMPLES = '''
 
 # Create topic exchange on vhost
 - rabbitmq_exchange: name=topicExchange type=topic vhost=myVhost
+
+# Create several exchanges on vhost
+- rabbitmq_exchange:
+    vhost: myVhost
+    exchange_type: topic
+    exchanges:
+      - events
+      - audit
+      - name: commands
+        exchange_type: direct
 '''
 
-import requests
 import urllib
 import json
 
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+
+class RabbitMqApi(object):
+    def __init__(self, module):
+        self.module = module
+        self.base_url = "http://%s:%s/api" % (module.params['login_host'], module.params['login_port'])
+        # one keep-alive connection for every call of the run
+        self.session = requests.Session()
+        self.session.auth = (module.params['login_user'], module.params['login_password'])
+        self.session.headers.update({"content-type": "application/json"})
+
+    def request(self, method, path, data=None, params=None):
+        if self.module.check_mode and method != 'GET':
+            return None
+        url = "/".join([self.base_url] + [urllib.quote(part, '') for part in path])
+        if data is not None:
+            data = json.dumps(data)
+        try:
+            r = self.session.request(method, url, data=data, params=params)
+        except requests.exceptions.RequestException, e:
+            self.module.fail_json(msg="Failed to connect to the RabbitMQ management API at %s: %s" % (url, e))
+        if method == 'GET' and r.status_code == 404:
+            return None
+        if r.status_code not in (200, 201, 204):
+            self.module.fail_json(msg="Invalid response from RESTAPI for %s %s" % (method, url),
+                                  status=r.status_code, details=r.text)
+        if r.status_code == 200 and r.text:
+            return r.json()
+        return {}
+
+    def get(self, *path, **kwargs):
+        return self.request('GET', path, params=kwargs.get('params'))
+
+    def put(self, path, data):
+        return self.request('PUT', path, data)
+
+    def delete(self, *path):
+        return self.request('DELETE', path)
+
+
+def exchange_batch(module):
+    api = RabbitMqApi(module)
+    vhost = module.params['vhost']
+    keys = ['state', 'durable', 'auto_delete', 'internal', 'exchange_type', 'arguments']
+
+    # one list call for the whole vhost
+    existing = api.get('exchanges', vhost, params={'columns': 'name,type,durable,auto_delete,internal'})
+    if existing is None:
+        module.fail_json(msg="vhost %s not found" % vhost)
+    existing = dict((exchange['name'], exchange) for exchange in existing)
+
+    create = []
+    delete = []
+    conflicts = []
+    for entry in module.params['exchanges']:
+        # a plain name takes every other setting from the module options
+        if isinstance(entry, basestring):
+            entry = dict(name=entry)
+        if not isinstance(entry, dict) or not entry.get('name'):
+            module.fail_json(msg="Each entry of exchanges must be a name or a dictionary with a name.")
+        spec = dict((key, module.params[key]) for key in keys)
+        spec.update(entry)
+        if spec['state'] not in ('present', 'absent'):
+            module.fail_json(msg="Invalid state %s in exchanges." % spec['state'])
+        if 'type' in spec:
+            spec['exchange_type'] = spec['type']
+        exchange = dict(durable=module.boolean(spec['durable']), auto_delete=module.boolean(spec['auto_delete']),
+                        internal=module.boolean(spec['internal']), type=spec['exchange_type'],
+                        arguments=spec['arguments'] or {})
+        current = existing.get(spec['name'])
+        if spec['state'] == 'absent':
+            if current is not None:
+                delete.append(spec['name'])
+        elif current is None:
+            create.append((spec['name'], exchange))
+        elif (current['durable'], current['auto_delete'], current['internal'], current['type']) != \
+                (exchange['durable'], exchange['auto_delete'], exchange['internal'], exchange['type']):
+            conflicts.append(spec['name'])
+
+    if conflicts:
+        module.fail_json(msg="RabbitMQ RESTAPI doesn't support attribute changes for existing exchanges: %s" %
+                         ", ".join(conflicts))
+
+    for name, exchange in create:
+        api.put(('exchanges', vhost, name), exchange)
+    for name in delete:
+        api.delete('exchanges', vhost, name)
+
+    module.exit_json(changed=bool(create or delete), created=[name for name, exchange in create], deleted=delete)
+
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
             state = dict(default='present', choices=['present', 'absent'], type='str'),
-            name = dict(required=True, type='str'),
+            name = dict(required=False, type='str'),
+            exchanges = dict(required=False, type='list'),
             login_user = dict(default='guest', type='str'),
             login_password = dict(default='guest', type='str', no_log=True),
             login_host = dict(default='localhost', type='str'),
@@ -126,9 +243,17 @@ def main():
             exchange_type = dict(default='direct', aliases=['type'], type='str'),
             arguments = dict(default=dict(), type='dict')
         ),
+        required_one_of = [['name', 'exchanges']],
+        mutually_exclusive = [['name', 'exchanges']],
         supports_check_mode = True
     )
 
+    if not HAS_REQUESTS:
+        module.fail_json(msg="python requests is required for this module")
+
+    if module.params['exchanges'] is not None:
+        exchange_batch(module)
+
     url = "http://%s:%s/api/exchanges/%s/%s" % (
         module.params['login_host'],
         module.params['login_port'],
@@ -59,6 +59,39 @@ options:
     required: false
     default: present
     choices: [ 'present', 'absent']
+  backend:
+    description:
+      - How to talk to the broker. C(rabbitmqctl) runs the command line tool on the managed node, C(http)
+        uses the management plugin's HTTP API on C(login_host), which avoids starting an Erlang VM for
+        every lookup and change.
+    required: false
+    default: rabbitmqctl
+    choices: [rabbitmqctl, http]
+    version_added: "2.1"
+  login_user:
+    description:
+      - rabbitMQ user for the connection when C(backend=http)
+    required: false
+    default: guest
+    version_added: "2.1"
+  login_password:
+    description:
+      - rabbitMQ password for the connection when C(backend=http)
+    required: false
+    default: guest
+    version_added: "2.1"
+  login_host:
+    description:
+      - rabbitMQ host for the connection when C(backend=http)
+    required: false
+    default: localhost
+    version_added: "2.1"
+  login_port:
+    description:
+      - rabbitMQ management api port when C(backend=http)
+    required: false
+    default: 15672
+    version_added: "2.1"
 '''
 
 EXAMPLES = """
@@ -69,6 +102,54 @@ EXAMPLES = """
                       state=present
 """
 
+import json
+import urllib
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+
+class RabbitMqApi(object):
+    def __init__(self, module):
+        self.module = module
+        self.base_url = "http://%s:%s/api" % (module.params['login_host'], module.params['login_port'])
+        # one keep-alive connection for every call of the run
+        self.session = requests.Session()
+        self.session.auth = (module.params['login_user'], module.params['login_password'])
+        self.session.headers.update({"content-type": "application/json"})
+
+    def request(self, method, path, data=None):
+        if self.module.check_mode and method != 'GET':
+            return None
+        url = "/".join([self.base_url] + [urllib.quote(part, '') for part in path])
+        if data is not None:
+            data = json.dumps(data)
+        try:
+            r = self.session.request(method, url, data=data)
+        except requests.exceptions.RequestException, e:
+            self.module.fail_json(msg="Failed to connect to the RabbitMQ management API at %s: %s" % (url, e))
+        if method == 'GET' and r.status_code == 404:
+            return None
+        if r.status_code not in (200, 201, 204):
+            self.module.fail_json(msg="Invalid response from RESTAPI for %s %s" % (method, url),
+                                  status=r.status_code, details=r.text)
+        if r.status_code == 200 and r.text:
+            return r.json()
+        return {}
+
+    def get(self, *path):
+        return self.request('GET', path)
+
+    def put(self, path, data):
+        return self.request('PUT', path, data)
+
+    def delete(self, *path):
+        return self.request('DELETE', path)
+
+
 class RabbitMqParameter(object):
     def __init__(self, module, component, name, value, vhost, node):
         self.module = module
@@ -80,7 +161,11 @@ class RabbitMqParameter(object):
 
         self._value = None
 
-        self._rabbitmqctl = module.get_bin_path('rabbitmqctl', True)
+        if module.params['backend'] == 'http':
+            self._api = RabbitMqApi(module)
+        else:
+            self._api = None
+            self._rabbitmqctl = module.get_bin_path('rabbitmqctl', True)
 
     def _exec(self, args, run_in_check_mode=False):
         if not self.module.check_mode or (self.module.check_mode and run_in_check_mode):
@@ -90,6 +175,13 @@ class RabbitMqParameter(object):
         return list()
 
     def get(self):
+        if self._api:
+            parameter = self._api.get('parameters', self.component, self.vhost, self.name)
+            if parameter is None:
+                return False
+            self._value = parameter['value']
+            return True
+
         parameters = self._exec(['list_parameters', '-p', self.vhost], True)
 
         for param_item in parameters:
@@ -100,13 +192,30 @@ class RabbitMqParameter(object):
                 return True
         return False
 
+    def _json_value(self):
+        try:
+            return json.loads(self.value)
+        except (TypeError, ValueError):
+            self.module.fail_json(msg="value must be a JSON term with backend=http")
+
     def set(self):
-        self._exec(['set_parameter', '-p', self.vhost, self.component, self.name, self.value])
+        if self._api:
+            self._api.put(('parameters', self.component, self.vhost, self.name),
+                          dict(component=self.component, vhost=self.vhost, name=self.name,
+                               value=self._json_value()))
+        else:
+            self._exec(['set_parameter', '-p', self.vhost, self.component, self.name, self.value])
 
     def delete(self):
-        self._exec(['clear_parameter', '-p', self.vhost, self.component, self.name])
+        if self._api:
+            self._api.delete('parameters', self.component, self.vhost, self.name)
+        else:
+            self._exec(['clear_parameter', '-p', self.vhost, self.component, self.name])
 
     def has_modifications(self):
+        if self._api:
+            # the API returns the decoded term, so compare values rather than their text
+            return self._json_value() != self._value
         return self.value != self._value
 
 def main():
@@ -116,13 +225,21 @@ def main():
         value=dict(default=None),
         vhost=dict(default='/'),
         state=dict(default='present', choices=['present', 'absent']),
-        node=dict(default='rabbit')
+        node=dict(default='rabbit'),
+        backend=dict(default='rabbitmqctl', choices=['rabbitmqctl', 'http']),
+        login_user=dict(default='guest'),
+        login_password=dict(default='guest', no_log=True),
+        login_host=dict(default='localhost'),
+        login_port=dict(default='15672')
     )
     module = AnsibleModule(
         argument_spec=arg_spec,
         supports_check_mode=True
     )
 
+    if module.params['backend'] == 'http' and not HAS_REQUESTS:
+        module.fail_json(msg="python requests is required for backend=http")
+
     component = module.params['component']
     name = module.params['name']
     value = module.params['value']
@@ -97,11 +97,14 @@ class RabbitMqPlugins(object):
 
         return plugins
 
-    def enable(self, name):
-        self._exec(['enable', name])
+    # rabbitmq-plugins takes several plugins at once, so each change is a single run of the tool
+    def enable(self, names):
+        if names:
+            self._exec(['enable'] + names)
 
-    def disable(self, name):
-        self._exec(['disable', name])
+    def disable(self, names):
+        if names:
+            self._exec(['disable'] + names)
 
 
 def main():
@@ -129,19 +132,19 @@ def main():
         if not new_only:
             for plugin in enabled_plugins:
                 if plugin not in names:
-                    rabbitmq_plugins.disable(plugin)
                     disabled.append(plugin)
 
         for name in names:
             if name not in enabled_plugins:
-                rabbitmq_plugins.enable(name)
                 enabled.append(name)
     else:
         for plugin in enabled_plugins:
             if plugin in names:
-                rabbitmq_plugins.disable(plugin)
                 disabled.append(plugin)
 
+    rabbitmq_plugins.disable(disabled)
+    rabbitmq_plugins.enable(enabled)
+
     changed = len(enabled) > 0 or len(disabled) > 0
     module.exit_json(changed=changed, enabled=enabled, disabled=disabled)
 
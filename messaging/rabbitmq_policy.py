@@ -63,6 +63,39 @@ options:
       - The state of the policy.
     default: present
     choices: [present, absent]
+  backend:
+    description:
+      - How to talk to the broker. C(rabbitmqctl) runs the command line tool on the managed node, C(http)
+        uses the management plugin's HTTP API on C(login_host), which avoids starting an Erlang VM for
+        every lookup and change.
+    required: false
+    default: rabbitmqctl
+    choices: [rabbitmqctl, http]
+    version_added: "2.1"
+  login_user:
+    description:
+      - rabbitMQ user for the connection when C(backend=http)
+    required: false
+    default: guest
+    version_added: "2.1"
+  login_password:
+    description:
+      - rabbitMQ password for the connection when C(backend=http)
+    required: false
+    default: guest
+    version_added: "2.1"
+  login_host:
+    description:
+      - rabbitMQ host for the connection when C(backend=http)
+    required: false
+    default: localhost
+    version_added: "2.1"
+  login_port:
+    description:
+      - rabbitMQ management api port when C(backend=http)
+    required: false
+    default: 15672
+    version_added: "2.1"
 '''
 
 EXAMPLES = '''
@@ -74,7 +107,62 @@ EXAMPLES = '''
 
 - name: ensure the default vhost contains the HA policy
   rabbitmq_policy: name=HA pattern='.*' tags="ha-mode=all"
+
+- name: ensure the HA policy through the management HTTP API
+  rabbitmq_policy: name=HA pattern='.*' backend=http login_user=admin login_password=secret
+  args:
+    tags:
+      "ha-mode": all
 '''
+
+import json
+import urllib
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+
+class RabbitMqApi(object):
+    def __init__(self, module):
+        self.module = module
+        self.base_url = "http://%s:%s/api" % (module.params['login_host'], module.params['login_port'])
+        # one keep-alive connection for every call of the run
+        self.session = requests.Session()
+        self.session.auth = (module.params['login_user'], module.params['login_password'])
+        self.session.headers.update({"content-type": "application/json"})
+
+    def request(self, method, path, data=None):
+        if self.module.check_mode and method != 'GET':
+            return None
+        url = "/".join([self.base_url] + [urllib.quote(part, '') for part in path])
+        if data is not None:
+            data = json.dumps(data)
+        try:
+            r = self.session.request(method, url, data=data)
+        except requests.exceptions.RequestException, e:
+            self.module.fail_json(msg="Failed to connect to the RabbitMQ management API at %s: %s" % (url, e))
+        if method == 'GET' and r.status_code == 404:
+            return None
+        if r.status_code not in (200, 201, 204):
+            self.module.fail_json(msg="Invalid response from RESTAPI for %s %s" % (method, url),
+                                  status=r.status_code, details=r.text)
+        if r.status_code == 200 and r.text:
+            return r.json()
+        return {}
+
+    def get(self, *path):
+        return self.request('GET', path)
+
+    def put(self, path, data):
+        return self.request('PUT', path, data)
+
+    def delete(self, *path):
+        return self.request('DELETE', path)
+
+
 class RabbitMqPolicy(object):
     def __init__(self, module, name):
         self._module = module
@@ -84,7 +172,11 @@ class RabbitMqPolicy(object):
         self._tags = module.params['tags']
         self._priority = module.params['priority']
         self._node = module.params['node']
-        self._rabbitmqctl = module.get_bin_path('rabbitmqctl', True)
+        if module.params['backend'] == 'http':
+            self._api = RabbitMqApi(module)
+        else:
+            self._api = None
+            self._rabbitmqctl = module.get_bin_path('rabbitmqctl', True)
 
     def _exec(self, args, run_in_check_mode=False):
         if not self._module.check_mode or (self._module.check_mode and run_in_check_mode):
@@ -96,6 +188,9 @@ class RabbitMqPolicy(object):
         return list()
 
     def list(self):
+        if self._api:
+            return self._api.get('policies', self._vhost, self._name) is not None
+
         policies = self._exec(['list_policies'], True)
 
         for policy in policies:
@@ -105,7 +200,10 @@ class RabbitMqPolicy(object):
         return False
 
     def set(self):
-        import json
+        if self._api:
+            return self._api.put(('policies', self._vhost, self._name),
+                                 {'pattern': self._pattern, 'definition': self._tags,
+                                  'priority': int(self._priority), 'apply-to': 'all'})
         args = ['set_policy']
         args.append(self._name)
         args.append(self._pattern)
@@ -115,6 +213,8 @@ class RabbitMqPolicy(object):
         return self._exec(args)
 
     def clear(self):
+        if self._api:
+            return self._api.delete('policies', self._vhost, self._name)
         return self._exec(['clear_policy', self._name])
 
 
@@ -127,6 +227,11 @@ def main():
         priority=dict(default='0'),
         node=dict(default='rabbit'),
         state=dict(default='present', choices=['present', 'absent']),
+        backend=dict(default='rabbitmqctl', choices=['rabbitmqctl', 'http']),
+        login_user=dict(default='guest'),
+        login_password=dict(default='guest', no_log=True),
+        login_host=dict(default='localhost'),
+        login_port=dict(default='15672'),
     )
 
     module = AnsibleModule(
@@ -134,6 +239,9 @@ def main():
         supports_check_mode=True
     )
 
+    if module.params['backend'] == 'http' and not HAS_REQUESTS:
+        module.fail_json(msg="python requests is required for backend=http")
+
     name = module.params['name']
     state = module.params['state']
     rabbitmq_policy = RabbitMqPolicy(module, name)
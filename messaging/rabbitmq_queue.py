@@ -33,7 +33,19 @@ options:
     name:
         description:
             - Name of the queue to create
-        required: true
+            - Required unless C(queues) is given.
+        required: false
+    queues:
+        description:
+            - List of queues of C(vhost) to manage in one run, as names or as dictionaries with the keys name,
+              state, durable, auto_delete, message_ttl, auto_expires, max_length, dead_letter_exchange,
+              dead_letter_routing_key and arguments. Keys left out take the value of the module option of the
+              same name.
+            - The existing queues are read with a single call and one keep-alive connection is used for all
+              changes.
+        required: false
+        default: null
+        version_added: "2.1"
     state:
         description:
             - Whether the queue should be present or absent
@@ -118,17 +130,136 @@ EXAMPLES = '''
 
 # Create a queue on remote host
 - rabbitmq_queue: name=myRemoteQueue login_user=user login_password=secret login_host=remote.example.org
+
+# Create the queues of a service and remove an old one
+- rabbitmq_queue:
+    vhost: orders
+    queues:
+      - orders.created
+      - name: orders.retry
+        message_ttl: 30000
+        dead_letter_exchange: orders
+      - name: orders.legacy
+        state: absent
 '''
 
-import requests
 import urllib
 import json
 
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+# module options copied to the queue arguments as used by RabbitMQ
+QUEUE_ARGUMENTS = {
+    'message_ttl': 'x-message-ttl',
+    'auto_expires': 'x-expires',
+    'max_length': 'x-max-length',
+    'dead_letter_exchange': 'x-dead-letter-exchange',
+    'dead_letter_routing_key': 'x-dead-letter-routing-key'
+}
+
+
+class RabbitMqApi(object):
+    def __init__(self, module):
+        self.module = module
+        self.base_url = "http://%s:%s/api" % (module.params['login_host'], module.params['login_port'])
+        # one keep-alive connection for every call of the run
+        self.session = requests.Session()
+        self.session.auth = (module.params['login_user'], module.params['login_password'])
+        self.session.headers.update({"content-type": "application/json"})
+
+    def request(self, method, path, data=None, params=None):
+        if self.module.check_mode and method != 'GET':
+            return None
+        url = "/".join([self.base_url] + [urllib.quote(part, '') for part in path])
+        if data is not None:
+            data = json.dumps(data)
+        try:
+            r = self.session.request(method, url, data=data, params=params)
+        except requests.exceptions.RequestException, e:
+            self.module.fail_json(msg="Failed to connect to the RabbitMQ management API at %s: %s" % (url, e))
+        if method == 'GET' and r.status_code == 404:
+            return None
+        if r.status_code not in (200, 201, 204):
+            self.module.fail_json(msg="Invalid response from RESTAPI for %s %s" % (method, url),
+                                  status=r.status_code, details=r.text)
+        if r.status_code == 200 and r.text:
+            return r.json()
+        return {}
+
+    def get(self, *path, **kwargs):
+        return self.request('GET', path, params=kwargs.get('params'))
+
+    def put(self, path, data):
+        return self.request('PUT', path, data)
+
+    def delete(self, *path):
+        return self.request('DELETE', path)
+
+
+def queue_batch(module):
+    api = RabbitMqApi(module)
+    vhost = module.params['vhost']
+    keys = ['state', 'durable', 'auto_delete', 'arguments'] + QUEUE_ARGUMENTS.keys()
+
+    # one list call for the whole vhost
+    existing = api.get('queues', vhost, params={'columns': 'name,durable,auto_delete,arguments'})
+    if existing is None:
+        module.fail_json(msg="vhost %s not found" % vhost)
+    existing = dict((queue['name'], queue) for queue in existing)
+
+    create = []
+    delete = []
+    conflicts = []
+    for entry in module.params['queues']:
+        # a plain name takes every other setting from the module options
+        if isinstance(entry, basestring):
+            entry = dict(name=entry)
+        if not isinstance(entry, dict) or not entry.get('name'):
+            module.fail_json(msg="Each entry of queues must be a name or a dictionary with a name.")
+        spec = dict((key, module.params[key]) for key in keys)
+        spec.update(entry)
+        if spec['state'] not in ('present', 'absent'):
+            module.fail_json(msg="Invalid state %s in queues." % spec['state'])
+        arguments = dict(spec['arguments'] or {})
+        for k, v in QUEUE_ARGUMENTS.items():
+            if spec[k]:
+                if k in ('message_ttl', 'auto_expires', 'max_length'):
+                    spec[k] = int(spec[k])
+                arguments[v] = spec[k]
+        queue = dict(durable=module.boolean(spec['durable']), auto_delete=module.boolean(spec['auto_delete']),
+                     arguments=arguments)
+        current = existing.get(spec['name'])
+        if spec['state'] == 'absent':
+            if current is not None:
+                delete.append(spec['name'])
+        elif current is None:
+            create.append((spec['name'], queue))
+        elif (current['durable'], current['auto_delete'], current.get('arguments') or {}) != \
+                (queue['durable'], queue['auto_delete'], queue['arguments']):
+            conflicts.append(spec['name'])
+
+    if conflicts:
+        module.fail_json(msg="RabbitMQ RESTAPI doesn't support attribute changes for existing queues: %s" %
+                         ", ".join(conflicts))
+
+    for name, queue in create:
+        api.put(('queues', vhost, name), queue)
+    for name in delete:
+        api.delete('queues', vhost, name)
+
+    module.exit_json(changed=bool(create or delete), created=[name for name, queue in create], deleted=delete)
+
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
             state = dict(default='present', choices=['present', 'absent'], type='str'),
-            name = dict(required=True, type='str'),
+            name = dict(required=False, type='str'),
+            queues = dict(required=False, type='list'),
             login_user = dict(default='guest', type='str'),
             login_password = dict(default='guest', type='str', no_log=True),
             login_host = dict(default='localhost', type='str'),
@@ -143,9 +274,17 @@ def main():
             dead_letter_routing_key = dict(default=None, type='str'),
             arguments = dict(default=dict(), type='dict')
         ),
+        required_one_of = [['name', 'queues']],
+        mutually_exclusive = [['name', 'queues']],
         supports_check_mode = True
     )
 
+    if not HAS_REQUESTS:
+        module.fail_json(msg="python requests is required for this module")
+
+    if module.params['queues'] is not None:
+        queue_batch(module)
+
     url = "http://%s:%s/api/queues/%s/%s" % (
         module.params['login_host'],
         module.params['login_port'],
@@ -205,13 +344,7 @@ def main():
 
 
     # Copy parameters to arguments as used by RabbitMQ
-    for k,v in {
-        'message_ttl': 'x-message-ttl',
-        'auto_expires': 'x-expires',
-        'max_length': 'x-max-length',
-        'dead_letter_exchange': 'x-dead-letter-exchange',
-        'dead_letter_routing_key': 'x-dead-letter-routing-key'
-    }.items():
+    for k,v in QUEUE_ARGUMENTS.items():
         if module.params[k]:
             module.params['arguments'][v] = module.params[k]
 
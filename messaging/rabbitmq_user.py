@@ -89,6 +89,39 @@ options:
     required: false
     default: present
     choices: [present, absent]
+  backend:
+    description:
+      - How to talk to the broker. C(rabbitmqctl) runs the command line tool on the managed node, C(http)
+        uses the management plugin's HTTP API on C(login_host), which avoids starting an Erlang VM for
+        every lookup and change.
+    required: false
+    default: rabbitmqctl
+    choices: [rabbitmqctl, http]
+    version_added: "2.1"
+  login_user:
+    description:
+      - rabbitMQ user for the connection when C(backend=http)
+    required: false
+    default: guest
+    version_added: "2.1"
+  login_password:
+    description:
+      - rabbitMQ password for the connection when C(backend=http)
+    required: false
+    default: guest
+    version_added: "2.1"
+  login_host:
+    description:
+      - rabbitMQ host for the connection when C(backend=http)
+    required: false
+    default: localhost
+    version_added: "2.1"
+  login_port:
+    description:
+      - rabbitMQ management api port when C(backend=http)
+    required: false
+    default: 15672
+    version_added: "2.1"
 '''
 
 EXAMPLES = '''
@@ -100,8 +133,67 @@ EXAMPLES = '''
                  read_priv=.*
                  write_priv=.*
                  state=present
+
+# Same, through the management HTTP API
+- rabbitmq_user: user=joe
+                 password=changeme
+                 vhost=/
+                 configure_priv=.*
+                 read_priv=.*
+                 write_priv=.*
+                 backend=http
+                 login_user=admin
+                 login_password=secret
 '''
 
+import json
+import urllib
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+
+class RabbitMqApi(object):
+    def __init__(self, module):
+        self.module = module
+        self.base_url = "http://%s:%s/api" % (module.params['login_host'], module.params['login_port'])
+        # one keep-alive connection for every call of the run
+        self.session = requests.Session()
+        self.session.auth = (module.params['login_user'], module.params['login_password'])
+        self.session.headers.update({"content-type": "application/json"})
+
+    def request(self, method, path, data=None):
+        if self.module.check_mode and method != 'GET':
+            return None
+        url = "/".join([self.base_url] + [urllib.quote(part, '') for part in path])
+        if data is not None:
+            data = json.dumps(data)
+        try:
+            r = self.session.request(method, url, data=data)
+        except requests.exceptions.RequestException, e:
+            self.module.fail_json(msg="Failed to connect to the RabbitMQ management API at %s: %s" % (url, e))
+        if method == 'GET' and r.status_code == 404:
+            return None
+        if r.status_code not in (200, 201, 204):
+            self.module.fail_json(msg="Invalid response from RESTAPI for %s %s" % (method, url),
+                                  status=r.status_code, details=r.text)
+        if r.status_code == 200 and r.text:
+            return r.json()
+        return {}
+
+    def get(self, *path):
+        return self.request('GET', path)
+
+    def put(self, path, data):
+        return self.request('PUT', path, data)
+
+    def delete(self, *path):
+        return self.request('DELETE', path)
+
+
 class RabbitMqUser(object):
     def __init__(self, module, username, password, tags, vhost, configure_priv, write_priv, read_priv, node):
         self.module = module
@@ -123,7 +215,13 @@ class RabbitMqUser(object):
 
         self._tags = None
         self._permissions = None
-        self._rabbitmqctl = module.get_bin_path('rabbitmqctl', True)
+        self._password_hash = None
+        self._hashing_algorithm = None
+        if module.params['backend'] == 'http':
+            self._api = RabbitMqApi(module)
+        else:
+            self._api = None
+            self._rabbitmqctl = module.get_bin_path('rabbitmqctl', True)
 
     def _exec(self, args, run_in_check_mode=False):
         if not self.module.check_mode or (self.module.check_mode and run_in_check_mode):
@@ -133,6 +231,9 @@ class RabbitMqUser(object):
         return list()
 
     def get(self):
+        if self._api:
+            return self._api_get()
+
         users = self._exec(['list_users'], True)
 
         for user_tag in users:
@@ -151,6 +252,27 @@ class RabbitMqUser(object):
                 return True
         return False
 
+    def _api_get(self):
+        user = self._api.get('users', self.username)
+        if user is None:
+            return False
+
+        tags = user.get('tags') or list()
+        if not isinstance(tags, list):
+            tags = tags.split(',')
+        self._tags = tags
+        self._password_hash = user.get('password_hash', '')
+        self._hashing_algorithm = user.get('hashing_algorithm')
+
+        vhost = self.permissions['vhost']
+        perms = self._api.get('permissions', vhost, self.username)
+        if perms is None:
+            self._permissions = dict()
+        else:
+            self._permissions = dict(vhost=vhost, configure_priv=perms['configure'],
+                                     write_priv=perms['write'], read_priv=perms['read'])
+        return True
+
     def _get_permissions(self):
         perms_out = self._exec(['list_user_permissions', self.username], True)
 
@@ -162,19 +284,46 @@ class RabbitMqUser(object):
         return dict()
 
     def add(self):
-        if self.password is not None:
+        if self._api:
+            # the user is created with its tags, so set_tags has nothing left to do
+            data = dict(tags=','.join(self.tags))
+            if self.password is not None:
+                data['password'] = self.password
+            else:
+                data['password_hash'] = ''
+            self._api.put(('users', self.username), data)
+            self._tags = list(self.tags)
+        elif self.password is not None:
             self._exec(['add_user', self.username, self.password])
         else:
             self._exec(['add_user', self.username, ''])
             self._exec(['clear_password', self.username])
 
     def delete(self):
-        self._exec(['delete_user', self.username])
+        if self._api:
+            self._api.delete('users', self.username)
+        else:
+            self._exec(['delete_user', self.username])
 
     def set_tags(self):
-        self._exec(['set_user_tags', self.username] + self.tags)
+        if self._api:
+            if self._tags is not None and not self.has_tags_modifications():
+                return
+            # keep the current password by sending its hash back
+            data = dict(tags=','.join(self.tags), password_hash=self._password_hash or '')
+            if self._hashing_algorithm:
+                data['hashing_algorithm'] = self._hashing_algorithm
+            self._api.put(('users', self.username), data)
+        else:
+            self._exec(['set_user_tags', self.username] + self.tags)
 
     def set_permissions(self):
+        if self._api:
+            self._api.put(('permissions', self.permissions['vhost'], self.username),
+                          dict(configure=self.permissions['configure_priv'],
+                               write=self.permissions['write_priv'],
+                               read=self.permissions['read_priv']))
+            return
         cmd = ['set_permissions']
         cmd.append('-p')
         cmd.append(self.permissions['vhost'])
@@ -201,13 +350,21 @@ def main():
         read_priv=dict(default='^$'),
         force=dict(default='no', type='bool'),
         state=dict(default='present', choices=['present', 'absent']),
-        node=dict(default='rabbit')
+        node=dict(default='rabbit'),
+        backend=dict(default='rabbitmqctl', choices=['rabbitmqctl', 'http']),
+        login_user=dict(default='guest'),
+        login_password=dict(default='guest', no_log=True),
+        login_host=dict(default='localhost'),
+        login_port=dict(default='15672')
     )
     module = AnsibleModule(
         argument_spec=arg_spec,
         supports_check_mode=True
     )
 
+    if module.params['backend'] == 'http' and not HAS_REQUESTS:
+        module.fail_json(msg="python requests is required for backend=http")
+
     username = module.params['user']
     password = module.params['password']
     tags = module.params['tags']
@@ -51,13 +51,97 @@ options:
       - The state of vhost
     default: present
     choices: [present, absent]
+  backend:
+    description:
+      - How to talk to the broker. C(rabbitmqctl) runs the command line tool on the managed node, C(http)
+        uses the management plugin's HTTP API on C(login_host), which avoids starting an Erlang VM for
+        every lookup and change.
+    required: false
+    default: rabbitmqctl
+    choices: [rabbitmqctl, http]
+    version_added: "2.1"
+  login_user:
+    description:
+      - rabbitMQ user for the connection when C(backend=http)
+    required: false
+    default: guest
+    version_added: "2.1"
+  login_password:
+    description:
+      - rabbitMQ password for the connection when C(backend=http)
+    required: false
+    default: guest
+    version_added: "2.1"
+  login_host:
+    description:
+      - rabbitMQ host for the connection when C(backend=http)
+    required: false
+    default: localhost
+    version_added: "2.1"
+  login_port:
+    description:
+      - rabbitMQ management api port when C(backend=http)
+    required: false
+    default: 15672
+    version_added: "2.1"
 '''
 
 EXAMPLES = '''
 # Ensure that the vhost /test exists.
 - rabbitmq_vhost: name=/test state=present
+
+# Ensure that the vhost /test exists, through the management HTTP API
+- rabbitmq_vhost: name=/test state=present backend=http login_user=admin login_password=secret
 '''
 
+import json
+import urllib
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+
+class RabbitMqApi(object):
+    def __init__(self, module):
+        self.module = module
+        self.base_url = "http://%s:%s/api" % (module.params['login_host'], module.params['login_port'])
+        # one keep-alive connection for every call of the run
+        self.session = requests.Session()
+        self.session.auth = (module.params['login_user'], module.params['login_password'])
+        self.session.headers.update({"content-type": "application/json"})
+
+    def request(self, method, path, data=None):
+        if self.module.check_mode and method != 'GET':
+            return None
+        url = "/".join([self.base_url] + [urllib.quote(part, '') for part in path])
+        if data is not None:
+            data = json.dumps(data)
+        try:
+            r = self.session.request(method, url, data=data)
+        except requests.exceptions.RequestException, e:
+            self.module.fail_json(msg="Failed to connect to the RabbitMQ management API at %s: %s" % (url, e))
+        if method == 'GET' and r.status_code == 404:
+            return None
+        if r.status_code not in (200, 201, 204):
+            self.module.fail_json(msg="Invalid response from RESTAPI for %s %s" % (method, url),
+                                  status=r.status_code, details=r.text)
+        if r.status_code == 200 and r.text:
+            return r.json()
+        return {}
+
+    def get(self, *path):
+        return self.request('GET', path)
+
+    def put(self, path, data):
+        return self.request('PUT', path, data)
+
+    def delete(self, *path):
+        return self.request('DELETE', path)
+
+
 class RabbitMqVhost(object):
     def __init__(self, module, name, tracing, node):
         self.module = module
@@ -66,7 +150,11 @@ class RabbitMqVhost(object):
         self.node = node
 
         self._tracing = False
-        self._rabbitmqctl = module.get_bin_path('rabbitmqctl', True)
+        if module.params['backend'] == 'http':
+            self._api = RabbitMqApi(module)
+        else:
+            self._api = None
+            self._rabbitmqctl = module.get_bin_path('rabbitmqctl', True)
 
     def _exec(self, args, run_in_check_mode=False):
         if not self.module.check_mode or (self.module.check_mode and run_in_check_mode):
@@ -76,6 +164,13 @@ class RabbitMqVhost(object):
         return list()
 
     def get(self):
+        if self._api:
+            vhost = self._api.get('vhosts', self.name)
+            if vhost is None:
+                return False
+            self._tracing = vhost.get('tracing', False)
+            return True
+
         vhosts = self._exec(['list_vhosts', 'name', 'tracing'], True)
 
         for vhost in vhosts:
@@ -86,9 +181,15 @@ class RabbitMqVhost(object):
         return False
 
     def add(self):
+        if self._api:
+            # the vhost is created with its tracing setting
+            self._tracing = self.tracing
+            return self._api.put(('vhosts', self.name), dict(tracing=self.tracing))
         return self._exec(['add_vhost', self.name])
 
     def delete(self):
+        if self._api:
+            return self._api.delete('vhosts', self.name)
         return self._exec(['delete_vhost', self.name])
 
     def set_tracing(self):
@@ -101,9 +202,13 @@ class RabbitMqVhost(object):
         return False
 
     def _enable_tracing(self):
+        if self._api:
+            return self._api.put(('vhosts', self.name), dict(tracing=True))
         return self._exec(['trace_on', '-p', self.name])
 
     def _disable_tracing(self):
+        if self._api:
+            return self._api.put(('vhosts', self.name), dict(tracing=False))
         return self._exec(['trace_off', '-p', self.name])
 
 
@@ -113,6 +218,11 @@ def main():
         tracing=dict(default='off', aliases=['trace'], type='bool'),
         state=dict(default='present', choices=['present', 'absent']),
         node=dict(default='rabbit'),
+        backend=dict(default='rabbitmqctl', choices=['rabbitmqctl', 'http']),
+        login_user=dict(default='guest'),
+        login_password=dict(default='guest', no_log=True),
+        login_host=dict(default='localhost'),
+        login_port=dict(default='15672'),
     )
 
     module = AnsibleModule(
@@ -120,6 +230,9 @@ def main():
         supports_check_mode=True
     )
 
+    if module.params['backend'] == 'http' and not HAS_REQUESTS:
+        module.fail_json(msg="python requests is required for backend=http")
+
     name = module.params['name']
     tracing = module.params['tracing']
     state = module.params['state']
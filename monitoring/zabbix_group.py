@@ -64,6 +64,25 @@ options:
             - List of host groups to create or delete.
         required: true
         aliases: [ "host_group" ]
+    session_cache:
+        description:
+            - Reuse the API session of earlier zabbix_group tasks instead of logging in for every task.
+            - Without it the session is logged out when the module exits.
+        required: false
+        default: false
+        version_added: "2.1"
+    session_cache_path:
+        description:
+            - File the cached sessions are kept in.
+        required: false
+        default: "~/.ansible/zabbix_session_cache"
+        version_added: "2.1"
+    session_cache_ttl:
+        description:
+            - Seconds a cached session is reused. The next run for the same server and user after that logs it out.
+        required: false
+        default: 600
+        version_added: "2.1"
 notes:
     - Too many concurrent updates to the same group may cause Zabbix to return errors, see examples for a workaround if needed.
 '''
@@ -95,6 +114,14 @@ EXAMPLES = '''
   when: inventory_hostname==groups['group_name'][0]
 '''
 
+import atexit
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+
 try:
     from zabbix_api import ZabbixAPI, ZabbixAPISubClass
     from zabbix_api import Already_Exists
@@ -104,6 +131,67 @@ except ImportError:
     HAS_ZABBIX_API = False
 
 
+def zabbix_logout(zbx):
+    try:
+        zbx.user.logout([])
+    except Exception:
+        pass
+
+
+def zabbix_login(module, zbx):
+    login_user = module.params['login_user']
+    if not module.params['session_cache']:
+        zbx.login(login_user, module.params['login_password'])
+        atexit.register(zabbix_logout, zbx)
+        return
+
+    path = os.path.expanduser(module.params['session_cache_path'])
+    key = hashlib.sha1("%s\0%s" % (module.params['server_url'], login_user)).hexdigest()
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            try:
+                os.makedirs(os.path.dirname(path), 0700)
+            except OSError:
+                # a parallel task may have just created it; opening the lock fails otherwise
+                pass
+        # held until the cache is written, so parallel tasks log in once and keep each other's sessions
+        lock = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0600)
+        fcntl.flock(lock, fcntl.LOCK_EX)
+    except (IOError, OSError), e:
+        module.fail_json(msg="Failed to lock Zabbix session cache %s: %s" % (path, e))
+
+    try:
+        try:
+            cache = json.load(open(path))
+        except (IOError, ValueError):
+            cache = {}
+        # a session is only logged out by the next run of its own server and user, so other entries are kept
+        session = cache.get(key)
+        if session:
+            zbx.auth = session['auth']
+            if session['expires'] > time.time():
+                try:
+                    zbx.user.checkAuthentication({'sessionid': session['auth']})
+                    return
+                except Exception:
+                    pass
+            else:
+                zabbix_logout(zbx)
+            zbx.auth = ''
+        zbx.login(login_user, module.params['login_password'])
+        cache[key] = {'auth': zbx.auth, 'expires': time.time() + module.params['session_cache_ttl']}
+        try:
+            # mkstemp creates the file with mode 0600
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            os.write(fd, json.dumps(cache))
+            os.close(fd)
+            os.rename(tmp_path, path)
+        except (IOError, OSError), e:
+            module.fail_json(msg="Failed to write Zabbix session cache %s: %s" % (path, e))
+    finally:
+        os.close(lock)
+
+
 class HostGroup(object):
     def __init__(self, module, zbx):
         self._module = module
@@ -153,6 +241,9 @@ def main():
             server_url=dict(required=True, aliases=['url']),
             login_user=dict(required=True),
             login_password=dict(required=True, no_log=True),
+            session_cache=dict(type='bool', default=False),
+            session_cache_path=dict(default='~/.ansible/zabbix_session_cache'),
+            session_cache_ttl=dict(type='int', default=600),
             host_groups=dict(required=True, aliases=['host_group']),
             state=dict(default="present", choices=['present','absent']),
             timeout=dict(type='int', default=10)
@@ -175,7 +266,7 @@ def main():
     # login to zabbix
     try:
         zbx = ZabbixAPI(server_url, timeout=timeout)
-        zbx.login(login_user, login_password)
+        zabbix_login(module, zbx)
     except Exception, e:
         module.fail_json(msg="Failed to connect to Zabbix server: %s" % e)
 
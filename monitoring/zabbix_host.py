@@ -51,7 +51,8 @@ options:
         description:
             - Name of the host in Zabbix.
             - host_name is the unique identifier used and cannot be updated using this module.
-        required: true
+            - Either host_name or hosts is required.
+        required: false
     host_groups:
         description:
             - List of host groups the host is part of.
@@ -91,6 +92,37 @@ options:
             - 'https://www.zabbix.com/documentation/2.0/manual/appendix/api/hostinterface/definitions#host_interface'
         required: false
         default: []
+    hosts:
+        description:
+            - List of hosts to synchronise in one run, as dictionaries with the keys host_name, host_groups,
+              link_templates, status, state, interfaces and proxy. Keys left out take the value of the module option
+              of the same name.
+            - Groups, templates, proxies and existing hosts are each looked up with a single API call, new hosts are
+              created with a single call and existing hosts sharing the same changes are updated together with
+              host.massupdate.
+            - Mutually exclusive with host_name.
+        required: false
+        default: None
+        version_added: "2.1"
+    session_cache:
+        description:
+            - Log in once and reuse that API session for later zabbix_host tasks.
+            - Without it the session is logged out when the module exits.
+        required: false
+        default: false
+        version_added: "2.1"
+    session_cache_path:
+        description:
+            - File the cached sessions are kept in.
+        required: false
+        default: "~/.ansible/zabbix_session_cache"
+        version_added: "2.1"
+    session_cache_ttl:
+        description:
+            - Seconds a cached session is reused. The next run for the same server and user after that logs it out.
+        required: false
+        default: 600
+        version_added: "2.1"
 '''
 
 EXAMPLES = '''
@@ -123,10 +155,37 @@ EXAMPLES = '''
         dns: ""
         port: 12345
     proxy: a.zabbix.proxy
+
+- name: Register many hosts in one run
+  local_action:
+    module: zabbix_host
+    server_url: http://monitor.example.com
+    login_user: username
+    login_password: password
+    host_groups:
+      - Web servers
+    link_templates:
+      - Template OS Linux
+    hosts:
+      - host_name: web01
+        interfaces:
+          - { type: 1, main: 1, useip: 1, ip: 10.0.0.1, dns: "", port: 10050 }
+      - host_name: web02
+        interfaces:
+          - { type: 1, main: 1, useip: 1, ip: 10.0.0.2, dns: "", port: 10050 }
+      - host_name: web03
+        state: absent
 '''
 
 import logging
 import copy
+import atexit
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
 
 try:
     from zabbix_api import ZabbixAPI, ZabbixAPISubClass
@@ -136,6 +195,67 @@ except ImportError:
     HAS_ZABBIX_API = False
 
 
+def zabbix_logout(zbx):
+    try:
+        zbx.user.logout([])
+    except Exception:
+        pass
+
+
+def zabbix_login(module, zbx):
+    login_user = module.params['login_user']
+    if not module.params['session_cache']:
+        zbx.login(login_user, module.params['login_password'])
+        atexit.register(zabbix_logout, zbx)
+        return
+
+    path = os.path.expanduser(module.params['session_cache_path'])
+    key = hashlib.sha1("%s\0%s" % (module.params['server_url'], login_user)).hexdigest()
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            try:
+                os.makedirs(os.path.dirname(path), 0700)
+            except OSError:
+                # a parallel task may have just created it; opening the lock fails otherwise
+                pass
+        # held until the cache is written, so parallel tasks log in once and keep each other's sessions
+        lock = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0600)
+        fcntl.flock(lock, fcntl.LOCK_EX)
+    except (IOError, OSError), e:
+        module.fail_json(msg="Failed to lock Zabbix session cache %s: %s" % (path, e))
+
+    try:
+        try:
+            cache = json.load(open(path))
+        except (IOError, ValueError):
+            cache = {}
+        # a session is only logged out by the next run of its own server and user, so other entries are kept
+        session = cache.get(key)
+        if session:
+            zbx.auth = session['auth']
+            if session['expires'] > time.time():
+                try:
+                    zbx.user.checkAuthentication({'sessionid': session['auth']})
+                    return
+                except Exception:
+                    pass
+            else:
+                zabbix_logout(zbx)
+            zbx.auth = ''
+        zbx.login(login_user, module.params['login_password'])
+        cache[key] = {'auth': zbx.auth, 'expires': time.time() + module.params['session_cache_ttl']}
+        try:
+            # mkstemp creates the file with mode 0600
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            os.write(fd, json.dumps(cache))
+            os.close(fd)
+            os.rename(tmp_path, path)
+        except (IOError, OSError), e:
+            module.fail_json(msg="Failed to write Zabbix session cache %s: %s" % (path, e))
+    finally:
+        os.close(lock)
+
+
 # Extend the ZabbixAPI
 # Since the zabbix-api python module too old (version 1.0, no higher version so far),
 # it does not support the 'hostinterface' api calls,
@@ -357,13 +477,162 @@ class Host(object):
             self._module.fail_json(msg="Failed to link template to host: %s" % e)
 
 
+class BulkHost(Host):
+    """
+    Synchronises a list of hosts using one lookup per object type and
+    batched create, massupdate and delete calls.
+    """
+
+    def get_ids_by_name(self, api, name_field, id_field, names, kind):
+        ids = {}
+        if not names:
+            return ids
+        for item in api.get({'output': [id_field, name_field], 'filter': {name_field: list(names)}}):
+            ids[item[name_field]] = item[id_field]
+        missing = sorted(set(names) - set(ids))
+        if missing:
+            self._module.fail_json(msg="%s not found: %s" % (kind, ', '.join(missing)))
+        return ids
+
+    def get_existing_hosts(self, host_names):
+        hosts = {}
+        if not host_names:
+            return hosts
+        host_list = self._zapi.host.get({'output': 'extend',
+                                         'filter': {'host': list(host_names)},
+                                         'selectInterfaces': 'extend',
+                                         'selectGroups': 'extend',
+                                         'selectParentTemplates': ['templateid']})
+        for host in host_list:
+            hosts[host['host']] = host
+        return hosts
+
+    def plan_interfaces(self, host_id, interfaces, exist_interfaces, plan):
+        # match interfaces by type, as update_host does
+        remaining = list(exist_interfaces)
+        for interface in interfaces:
+            interface = dict(interface)
+            for exist_interface in remaining:
+                if int(interface['type']) == int(exist_interface['type']):
+                    interface['interfaceid'] = exist_interface['interfaceid']
+                    plan['interface_update'].append(interface)
+                    remaining.remove(exist_interface)
+                    break
+            else:
+                interface['hostid'] = host_id
+                plan['interface_create'].append(interface)
+        plan['interface_delete'].extend([i['interfaceid'] for i in remaining])
+
+    def sync(self, specs):
+        group_names = set()
+        template_names = set()
+        proxy_names = set()
+        for spec in specs:
+            if spec['state'] == 'present':
+                group_names.update(spec['host_groups'] or [])
+                template_names.update(spec['link_templates'] or [])
+                if spec['proxy']:
+                    proxy_names.add(spec['proxy'])
+
+        group_ids = self.get_ids_by_name(self._zapi.hostgroup, 'name', 'groupid', group_names, "Hostgroup")
+        template_ids = self.get_ids_by_name(self._zapi.template, 'host', 'templateid', template_names, "Template")
+        proxy_ids = self.get_ids_by_name(self._zapi.proxy, 'host', 'proxyid', proxy_names, "Proxy")
+        existing = self.get_existing_hosts([spec['host_name'] for spec in specs])
+
+        plan = {'create': [], 'delete': [], 'massupdate': {},
+                'interface_update': [], 'interface_create': [], 'interface_delete': []}
+        result = {'created': [], 'updated': [], 'deleted': []}
+
+        for spec in specs:
+            host_name = spec['host_name']
+            exist_host = existing.get(host_name)
+
+            if spec['state'] == 'absent':
+                if exist_host:
+                    plan['delete'].append(exist_host['hostid'])
+                    result['deleted'].append(host_name)
+                continue
+
+            if not spec['host_groups']:
+                self._module.fail_json(msg="Specify at least one group for host '%s'." % host_name)
+
+            status = 1 if spec['status'] == "disabled" else 0
+            proxy_id = proxy_ids.get(spec['proxy'], "0")
+            groups = sorted(set([group_ids[name] for name in spec['host_groups']]))
+            templates = sorted(set([template_ids[name] for name in spec['link_templates'] or []]))
+            interfaces = spec['interfaces'] or []
+
+            if not exist_host:
+                if not interfaces:
+                    self._module.fail_json(msg="Specify at least one interface for creating host '%s'." % host_name)
+                parameters = {'host': host_name, 'interfaces': interfaces, 'status': status,
+                              'groups': [{'groupid': i} for i in groups],
+                              'templates': [{'templateid': i} for i in templates]}
+                if spec['proxy']:
+                    parameters['proxy_hostid'] = proxy_id
+                plan['create'].append(parameters)
+                result['created'].append(host_name)
+                continue
+
+            host_id = exist_host['hostid']
+            exist_groups = sorted([g['groupid'] for g in exist_host['groups']])
+            exist_templates = sorted([t['templateid'] for t in exist_host['parentTemplates']])
+            changed = False
+
+            if (groups != exist_groups or templates != exist_templates
+                    or int(status) != int(exist_host['status']) or exist_host['proxy_hostid'] != proxy_id):
+                templates_clear = tuple(sorted(set(exist_templates) - set(templates)))
+                key = (tuple(groups), tuple(templates), templates_clear, status, proxy_id)
+                plan['massupdate'].setdefault(key, []).append(host_id)
+                changed = True
+
+            if interfaces and self.check_interface_properties(exist_host['interfaces'], interfaces):
+                self.plan_interfaces(host_id, interfaces, exist_host['interfaces'], plan)
+                changed = True
+
+            if changed:
+                result['updated'].append(host_name)
+
+        changed = bool(result['created'] or result['updated'] or result['deleted'])
+        if self._module.check_mode or not changed:
+            return changed, result
+
+        try:
+            if plan['delete']:
+                self._zapi.host.delete(plan['delete'])
+            if plan['create']:
+                self._zapi.host.create(plan['create'])
+            for (groups, templates, templates_clear, status, proxy_id), host_ids in plan['massupdate'].items():
+                parameters = {'hosts': [{'hostid': i} for i in host_ids],
+                              'groups': [{'groupid': i} for i in groups],
+                              'templates': [{'templateid': i} for i in templates],
+                              'status': status, 'proxy_hostid': proxy_id}
+                if templates_clear:
+                    parameters['templates_clear'] = [{'templateid': i} for i in templates_clear]
+                self._zapi.host.massupdate(parameters)
+            if plan['interface_update']:
+                self._zapi.hostinterface.update(plan['interface_update'])
+            if plan['interface_create']:
+                self._zapi.hostinterface.create(plan['interface_create'])
+            if plan['interface_delete']:
+                self._zapi.hostinterface.delete(plan['interface_delete'])
+        except Exception, e:
+            self._module.fail_json(msg="Failed to synchronise hosts: %s" % e)
+
+        return changed, result
+
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
             server_url=dict(required=True, aliases=['url']),
             login_user=dict(required=True),
             login_password=dict(required=True, no_log=True),
-            host_name=dict(required=True),
+            session_cache=dict(type='bool', default=False),
+            session_cache_path=dict(default='~/.ansible/zabbix_session_cache'),
+            session_cache_ttl=dict(type='int', default=600),
+            host_name=dict(required=False),
+            hosts=dict(required=False, type='list'),
             host_groups=dict(required=False),
             link_templates=dict(required=False),
             status=dict(default="enabled", choices=['enabled', 'disabled']),
@@ -372,6 +641,8 @@ def main():
             interfaces=dict(required=False),
             proxy=dict(required=False)
         ),
+        required_one_of=[['host_name', 'hosts']],
+        mutually_exclusive=[['host_name', 'hosts']],
         supports_check_mode=True
     )
 
@@ -397,10 +668,24 @@ def main():
     # login to zabbix
     try:
         zbx = ZabbixAPIExtends(server_url, timeout=timeout)
-        zbx.login(login_user, login_password)
+        zabbix_login(module, zbx)
     except Exception, e:
         module.fail_json(msg="Failed to connect to Zabbix server: %s" % e)
 
+    if module.params['hosts']:
+        specs = []
+        for item in module.params['hosts']:
+            if not isinstance(item, dict) or not item.get('host_name'):
+                module.fail_json(msg="Each entry in hosts requires a host_name")
+            spec = dict(host_groups=host_groups, link_templates=link_templates, status=module.params['status'],
+                        state=state, interfaces=interfaces, proxy=proxy)
+            spec.update(item)
+            if spec['state'] not in ['present', 'absent']:
+                module.fail_json(msg="Invalid state '%s' for host '%s'" % (spec['state'], spec['host_name']))
+            specs.append(spec)
+        changed, result = BulkHost(module, zbx).sync(specs)
+        module.exit_json(changed=changed, **result)
+
     host = Host(module, zbx)
 
     template_ids = []
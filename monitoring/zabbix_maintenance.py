@@ -80,7 +80,18 @@ options:
     name:
         description:
             - Unique name of maintenance window.
-        required: true
+            - B(Required) option unless C(maintenances) is given.
+        required: false
+    maintenances:
+        description:
+            - List of maintenance windows to reconcile in one run, as dictionaries with the keys name, state,
+              host_names, host_groups, minutes, desc and collect_data. Keys left out take the value of the module
+              option of the same name.
+            - Existing windows, hosts and groups are each looked up with a single API call, and all new windows
+              are created with one call and all removed ones deleted with one call.
+        required: false
+        default: null
+        version_added: "2.1"
     desc:
         description:
             - Short description of maintenance window.
@@ -91,6 +102,25 @@ options:
             - Type of maintenance. With data collection, or without.
         required: false
         default: "true"
+    session_cache:
+        description:
+            - Reuse a cached API session instead of logging in for every maintenance window.
+            - Without it the session is logged out when the module exits.
+        required: false
+        default: false
+        version_added: "2.1"
+    session_cache_path:
+        description:
+            - File the cached sessions are kept in.
+        required: false
+        default: "~/.ansible/zabbix_session_cache"
+        version_added: "2.1"
+    session_cache_ttl:
+        description:
+            - Seconds a cached session is reused. The next run for the same server and user after that logs it out.
+        required: false
+        default: 600
+        version_added: "2.1"
 notes:
     - Useful for setting hosts in maintenance mode before big update,
       and removing maintenance window after update.
@@ -132,6 +162,18 @@ EXAMPLES = '''
                       login_user=ansible
                       login_password=pAsSwOrD
 
+# Open a window for the web servers and close the one for the databases
+- zabbix_maintenance: server_url=https://monitoring.example.com
+                      login_user=ansible
+                      login_password=pAsSwOrD
+  args:
+    maintenances:
+      - name: Patch web
+        host_groups: [ Web ]
+        minutes: 30
+      - name: Patch db
+        state: absent
+
 # Remove maintenance window named "Test1"
 - zabbix_maintenance: name=Test1
                       state=absent
@@ -140,7 +182,13 @@ EXAMPLES = '''
                       login_password=pAsSwOrD
 '''
 
+import atexit
+import fcntl
 import datetime
+import hashlib
+import json
+import os
+import tempfile
 import time
 
 try:
@@ -150,46 +198,110 @@ except ImportError:
     HAS_ZABBIX_API = False
 
 
-def create_maintenance(zbx, group_ids, host_ids, start_time, maintenance_type, period, name, desc):
-    end_time = start_time + period
+def zabbix_logout(zbx):
     try:
-        zbx.maintenance.create(
-            {
-                "groupids": group_ids,
-                "hostids": host_ids,
-                "name": name,
-                "maintenance_type": maintenance_type,
-                "active_since": str(start_time),
-                "active_till": str(end_time),
-                "description": desc,
-                "timeperiods":  [{
-                    "timeperiod_type": "0",
-                    "start_date": str(start_time),
-                    "period": str(period),
-                }]
-            }
-        )
+        zbx.user.logout([])
+    except Exception:
+        pass
+
+
+def zabbix_login(module, zbx):
+    login_user = module.params['login_user']
+    if not module.params['session_cache']:
+        zbx.login(login_user, module.params['login_password'])
+        atexit.register(zabbix_logout, zbx)
+        return
+
+    path = os.path.expanduser(module.params['session_cache_path'])
+    key = hashlib.sha1("%s\0%s" % (module.params['server_url'], login_user)).hexdigest()
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            try:
+                os.makedirs(os.path.dirname(path), 0700)
+            except OSError:
+                # a parallel task may have just created it; opening the lock fails otherwise
+                pass
+        # held until the cache is written, so parallel tasks log in once and keep each other's sessions
+        lock = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0600)
+        fcntl.flock(lock, fcntl.LOCK_EX)
+    except (IOError, OSError), e:
+        module.fail_json(msg="Failed to lock Zabbix session cache %s: %s" % (path, e))
+
+    try:
+        try:
+            cache = json.load(open(path))
+        except (IOError, ValueError):
+            cache = {}
+        # a session is only logged out by the next run of its own server and user, so other entries are kept
+        session = cache.get(key)
+        if session:
+            zbx.auth = session['auth']
+            if session['expires'] > time.time():
+                try:
+                    zbx.user.checkAuthentication({'sessionid': session['auth']})
+                    return
+                except Exception:
+                    pass
+            else:
+                zabbix_logout(zbx)
+            zbx.auth = ''
+        zbx.login(login_user, module.params['login_password'])
+        cache[key] = {'auth': zbx.auth, 'expires': time.time() + module.params['session_cache_ttl']}
+        try:
+            # mkstemp creates the file with mode 0600
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            os.write(fd, json.dumps(cache))
+            os.close(fd)
+            os.rename(tmp_path, path)
+        except (IOError, OSError), e:
+            module.fail_json(msg="Failed to write Zabbix session cache %s: %s" % (path, e))
+    finally:
+        os.close(lock)
+
+
+def create_maintenances(zbx, maintenances):
+    try:
+        zbx.maintenance.create(maintenances)
     except BaseException as e:
         return 1, None, str(e)
     return 0, None, None
 
 
-def get_maintenance_id(zbx, name):
+def maintenance_params(group_ids, host_ids, start_time, maintenance_type, period, name, desc):
+    end_time = start_time + period
+    return {
+        "groupids": group_ids,
+        "hostids": host_ids,
+        "name": name,
+        "maintenance_type": maintenance_type,
+        "active_since": str(start_time),
+        "active_till": str(end_time),
+        "description": desc,
+        "timeperiods":  [{
+            "timeperiod_type": "0",
+            "start_date": str(start_time),
+            "period": str(period),
+        }]
+    }
+
+
+def get_maintenance_ids(zbx, names):
     try:
         result = zbx.maintenance.get(
             {
+                "output": ["maintenanceid", "name"],
                 "filter":
                 {
-                    "name": name,
+                    "name": names,
                 }
             }
         )
     except BaseException as e:
         return 1, None, str(e)
 
-    maintenance_ids = []
+    maintenance_ids = {}
     for res in result:
-        maintenance_ids.append(res["maintenanceid"])
+        maintenance_ids.setdefault(res["name"], []).append(res["maintenanceid"])
 
     return 0, maintenance_ids, None
 
@@ -202,64 +314,76 @@ def delete_maintenance(zbx, maintenance_id):
     return 0, None, None
 
 
-def check_maintenance(zbx, name):
+def get_ids_by_name(zbx, api, id_field, kind, names):
     try:
-        result = zbx.maintenance.exists(
+        result = getattr(zbx, api).get(
             {
-                "name": name
+                "output": [id_field, "name"],
+                "filter":
+                {
+                    "name": names
+                }
             }
         )
     except BaseException as e:
         return 1, None, str(e)
-    return 0, result, None
 
+    ids = {}
+    for res in result:
+        ids.setdefault(res["name"], res[id_field])
 
-def get_group_ids(zbx, host_groups):
-    group_ids = []
-    for group in host_groups:
-        try:
-            result = zbx.hostgroup.get(
-                {
-                    "output": "extend",
-                    "filter":
-                    {
-                        "name": group
-                    }
-                }
-            )
-        except BaseException as e:
-            return 1, None, str(e)
+    missing = [name for name in names if name not in ids]
+    if missing:
+        return 1, None, "%s id for %s %s not found" % (kind.capitalize(), kind, ", ".join(missing))
 
-        if not result:
-            return 1, None, "Group id for group %s not found" % group
+    return 0, ids, None
 
-        group_ids.append(result[0]["groupid"])
 
-    return 0, group_ids, None
+def get_group_ids(zbx, host_groups):
+    return get_ids_by_name(zbx, "hostgroup", "groupid", "group", host_groups)
 
 
 def get_host_ids(zbx, host_names):
-    host_ids = []
-    for host in host_names:
-        try:
-            result = zbx.host.get(
-                {
-                    "output": "extend",
-                    "filter":
-                    {
-                        "name": host
-                    }
-                }
-            )
-        except BaseException as e:
-            return 1, None, str(e)
-
-        if not result:
-            return 1, None, "Host id for host %s not found" % host
-
-        host_ids.append(result[0]["hostid"])
-
-    return 0, host_ids, None
+    return get_ids_by_name(zbx, "host", "hostid", "host", host_names)
+
+
+def as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, basestring):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value)
+
+
+def maintenance_specs(module):
+    # every entry of maintenances falls back to the module options it leaves out
+    defaults = dict(
+        name=module.params['name'],
+        state=module.params['state'],
+        host_names=module.params['host_names'],
+        host_groups=module.params['host_groups'],
+        minutes=module.params['minutes'],
+        desc=module.params['desc'],
+        collect_data=module.params['collect_data'],
+    )
+    if not module.params['maintenances']:
+        entries = [defaults]
+    else:
+        entries = []
+        for entry in module.params['maintenances']:
+            if not isinstance(entry, dict) or not entry.get('name'):
+                module.fail_json(msg="Each entry of maintenances must be a dictionary with a name.")
+            spec = dict(defaults)
+            spec.update(entry)
+            if spec['state'] not in ('present', 'absent'):
+                module.fail_json(msg="Invalid state %s for maintenance %s." % (spec['state'], spec['name']))
+            entries.append(spec)
+
+    for spec in entries:
+        spec['host_names'] = as_list(spec['host_names'])
+        spec['host_groups'] = as_list(spec['host_groups'])
+        spec['collect_data'] = module.boolean(spec['collect_data'])
+    return entries
 
 
 def main():
@@ -272,98 +396,88 @@ def main():
             host_groups=dict(type='list', required=False, default=None, aliases=['host_group']),
             login_user=dict(required=True),
             login_password=dict(required=True, no_log=True),
-            name=dict(required=True),
+            session_cache=dict(type='bool', default=False),
+            session_cache_path=dict(default='~/.ansible/zabbix_session_cache'),
+            session_cache_ttl=dict(type='int', default=600),
+            name=dict(required=False),
+            maintenances=dict(type='list', required=False, default=None),
             desc=dict(required=False, default="Created by Ansible"),
             collect_data=dict(type='bool', required=False, default=True),
         ),
+        required_one_of=[['name', 'maintenances']],
+        mutually_exclusive=[['name', 'maintenances']],
         supports_check_mode=True,
     )
 
     if not HAS_ZABBIX_API:
         module.fail_json(msg="Missing requried zabbix-api module (check docs or install with: pip install zabbix-api)")
 
-    host_names = module.params['host_names']
-    host_groups = module.params['host_groups']
-    state = module.params['state']
-    login_user = module.params['login_user']
-    login_password = module.params['login_password']
-    minutes = module.params['minutes']
-    name = module.params['name']
-    desc = module.params['desc']
     server_url = module.params['server_url']
-    collect_data = module.params['collect_data']
-    if collect_data:
-        maintenance_type = 0
-    else:
-        maintenance_type = 1
 
     try:
         zbx = ZabbixAPI(server_url)
-        zbx.login(login_user, login_password)
+        zabbix_login(module, zbx)
     except BaseException as e:
         module.fail_json(msg="Failed to connect to Zabbix server: %s" % e)
 
-    changed = False
-
-    if state == "present":
+    specs = maintenance_specs(module)
 
-        now = datetime.datetime.now()
-        start_time = time.mktime(now.timetuple())
-        period = 60 * int(minutes)  # N * 60 seconds
-
-        if host_groups:
-            (rc, group_ids, error) = get_group_ids(zbx, host_groups)
-            if rc != 0:
-                module.fail_json(msg="Failed to get group_ids: %s" % error)
-        else:
-            group_ids = []
+    (rc, existing, error) = get_maintenance_ids(zbx, [spec['name'] for spec in specs])
+    if rc != 0:
+        module.fail_json(msg="Failed to check maintenance existance: %s" % error)
 
-        if host_names:
-            (rc, host_ids, error) = get_host_ids(zbx, host_names)
-            if rc != 0:
-                module.fail_json(msg="Failed to get host_ids: %s" % error)
-        else:
-            host_ids = []
+    wanted = [spec for spec in specs if spec['state'] == "present" and spec['name'] not in existing]
+    unwanted = [spec for spec in specs if spec['state'] == "absent" and spec['name'] in existing]
 
-        (rc, exists, error) = check_maintenance(zbx, name)
+    # resolve the hosts and groups of all new maintenances with one call per object type
+    group_ids = {}
+    host_groups = sorted(set(group for spec in wanted for group in spec['host_groups']))
+    if host_groups:
+        (rc, group_ids, error) = get_group_ids(zbx, host_groups)
         if rc != 0:
-            module.fail_json(msg="Failed to check maintenance %s existance: %s" % (name, error))
-
-        if not exists:
-            if not host_names and not host_groups:
-                module.fail_json(msg="At least one host_name or host_group must be defined for each created maintenance.")
+            module.fail_json(msg="Failed to get group_ids: %s" % error)
 
-            if module.check_mode:
-                changed = True
-            else:
-                (rc, _, error) = create_maintenance(zbx, group_ids, host_ids, start_time, maintenance_type, period, name, desc)
-                if rc == 0:
-                    changed = True
-                else:
-                    module.fail_json(msg="Failed to create maintenance: %s" % error)
-
-    if state == "absent":
-
-        (rc, exists, error) = check_maintenance(zbx, name)
+    host_ids = {}
+    host_names = sorted(set(host for spec in wanted for host in spec['host_names']))
+    if host_names:
+        (rc, host_ids, error) = get_host_ids(zbx, host_names)
         if rc != 0:
-            module.fail_json(msg="Failed to check maintenance %s existance: %s" % (name, error))
+            module.fail_json(msg="Failed to get host_ids: %s" % error)
+
+    now = datetime.datetime.now()
+    start_time = time.mktime(now.timetuple())
 
-        if exists:
-            (rc, maintenance, error) = get_maintenance_id(zbx, name)
+    new_maintenances = []
+    for spec in wanted:
+        if not spec['host_names'] and not spec['host_groups']:
+            module.fail_json(msg="At least one host_name or host_group must be defined for each created maintenance.")
+        if spec['collect_data']:
+            maintenance_type = 0
+        else:
+            maintenance_type = 1
+        period = 60 * int(spec['minutes'])  # N * 60 seconds
+        new_maintenances.append(maintenance_params(
+            [group_ids[group] for group in spec['host_groups']],
+            [host_ids[host] for host in spec['host_names']],
+            start_time, maintenance_type, period, spec['name'], spec['desc']))
+
+    old_maintenance_ids = []
+    for spec in unwanted:
+        old_maintenance_ids.extend(existing[spec['name']])
+
+    if not module.check_mode:
+        if new_maintenances:
+            (rc, _, error) = create_maintenances(zbx, new_maintenances)
+            if rc != 0:
+                module.fail_json(msg="Failed to create maintenance: %s" % error)
+        if old_maintenance_ids:
+            (rc, _, error) = delete_maintenance(zbx, old_maintenance_ids)
             if rc != 0:
-                module.fail_json(msg="Failed to get maintenance id: %s" % error)
-
-            if maintenance:
-                if module.check_mode:
-                    changed = True
-                else:
-                    (rc, _, error) = delete_maintenance(zbx, maintenance)
-                    if rc == 0:
-                        changed = True
-                    else:
-                        module.fail_json(msg="Failed to remove maintenance: %s" % error)
-
-    module.exit_json(changed=changed)
+                module.fail_json(msg="Failed to remove maintenance: %s" % error)
+
+    module.exit_json(changed=bool(new_maintenances or old_maintenance_ids),
+                     created=[spec['name'] for spec in wanted],
+                     deleted=[spec['name'] for spec in unwanted])
 
 from ansible.module_utils.basic import *
 main()
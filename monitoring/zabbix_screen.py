@@ -58,8 +58,29 @@ options:
             - If the screen(s) already been added, the screen(s) name won't be updated.
             - When creating or updating screen(s), C(screen_name), C(host_group) are required.
             - When deleting screen(s), the C(screen_name) is required.
+            - C(graph_names) are matched exactly. The graphs of all hosts in the group are looked up with a single
+              API call, and a screen is only written when its size or items differ from what is wanted.
             - 'The available states are: C(present) (default) and C(absent). If the screen(s) already exists, and the state is not C(absent), the screen(s) will just be updated as needed.'
         required: true
+    session_cache:
+        description:
+            - Reuse a cached API session instead of logging in for every screen task.
+            - Without it the session is logged out when the module exits.
+        required: false
+        default: false
+        version_added: "2.1"
+    session_cache_path:
+        description:
+            - File the cached sessions are kept in.
+        required: false
+        default: "~/.ansible/zabbix_session_cache"
+        version_added: "2.1"
+    session_cache_ttl:
+        description:
+            - Seconds a cached session is reused. The next run for the same server and user after that logs it out.
+        required: false
+        default: 600
+        version_added: "2.1"
 notes:
     - Too many concurrent updates to the same screen may cause Zabbix to return errors, see examples for a workaround if needed.
 '''
@@ -127,24 +148,80 @@ EXAMPLES = '''
   when: inventory_hostname==groups['group_name'][0]
 '''
 
+import atexit
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+
 try:
-    from zabbix_api import ZabbixAPI, ZabbixAPISubClass
-    from zabbix_api import ZabbixAPIException
-    from zabbix_api import Already_Exists
+    from zabbix_api import ZabbixAPI
     HAS_ZABBIX_API = True
 except ImportError:
     HAS_ZABBIX_API = False
 
 
-# Extend the ZabbixAPI
-# Since the zabbix-api python module too old (version 1.0, and there's no higher version so far), it doesn't support the 'screenitem' api call,
-# we have to inherit the ZabbixAPI class to add 'screenitem' support.
-class ZabbixAPIExtends(ZabbixAPI):
-    screenitem = None
+def zabbix_logout(zbx):
+    try:
+        zbx.user.logout([])
+    except Exception:
+        pass
+
+
+def zabbix_login(module, zbx):
+    login_user = module.params['login_user']
+    if not module.params['session_cache']:
+        zbx.login(login_user, module.params['login_password'])
+        atexit.register(zabbix_logout, zbx)
+        return
+
+    path = os.path.expanduser(module.params['session_cache_path'])
+    key = hashlib.sha1("%s\0%s" % (module.params['server_url'], login_user)).hexdigest()
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            try:
+                os.makedirs(os.path.dirname(path), 0700)
+            except OSError:
+                # a parallel task may have just created it; opening the lock fails otherwise
+                pass
+        # held until the cache is written, so parallel tasks log in once and keep each other's sessions
+        lock = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0600)
+        fcntl.flock(lock, fcntl.LOCK_EX)
+    except (IOError, OSError), e:
+        module.fail_json(msg="Failed to lock Zabbix session cache %s: %s" % (path, e))
 
-    def __init__(self, server, timeout, **kwargs):
-        ZabbixAPI.__init__(self, server, timeout=timeout)
-        self.screenitem = ZabbixAPISubClass(self, dict({"prefix": "screenitem"}, **kwargs))
+    try:
+        try:
+            cache = json.load(open(path))
+        except (IOError, ValueError):
+            cache = {}
+        # a session is only logged out by the next run of its own server and user, so other entries are kept
+        session = cache.get(key)
+        if session:
+            zbx.auth = session['auth']
+            if session['expires'] > time.time():
+                try:
+                    zbx.user.checkAuthentication({'sessionid': session['auth']})
+                    return
+                except Exception:
+                    pass
+            else:
+                zabbix_logout(zbx)
+            zbx.auth = ''
+        zbx.login(login_user, module.params['login_password'])
+        cache[key] = {'auth': zbx.auth, 'expires': time.time() + module.params['session_cache_ttl']}
+        try:
+            # mkstemp creates the file with mode 0600
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            os.write(fd, json.dumps(cache))
+            os.close(fd)
+            os.rename(tmp_path, path)
+        except (IOError, OSError), e:
+            module.fail_json(msg="Failed to write Zabbix session cache %s: %s" % (path, e))
+    finally:
+        os.close(lock)
 
 
 class Screen(object):
@@ -163,9 +240,10 @@ class Screen(object):
             hostGroup_id = hostGroup_list[0]['groupid']
             return hostGroup_id
 
-    # get monitored host_id by host_group_id
+    # get monitored host_id by host_group_id, sorted so the screen layout is stable between runs
     def get_host_ids_by_group_id(self, group_id):
-        host_list = self._zapi.host.get({'output': 'extend', 'groupids': group_id, 'monitored_hosts': 1})
+        host_list = self._zapi.host.get({'output': ['hostid'], 'groupids': group_id, 'monitored_hosts': 1,
+                                         'sortfield': 'host'})
         if len(host_list) < 1:
             self._module.fail_json(msg="No host in the group.")
         else:
@@ -175,39 +253,40 @@ class Screen(object):
                 host_ids.append(host_id)
             return host_ids
 
-    # get screen
-    def get_screen_id(self, screen_name):
-        if screen_name == "":
-            self._module.fail_json(msg="screen_name is required")
+    # get screens and their items by name
+    def get_screens(self, screen_names):
+        for screen_name in screen_names:
+            if screen_name == "":
+                self._module.fail_json(msg="screen_name is required")
         try:
-            screen_id_list = self._zapi.screen.get({'output': 'extend', 'search': {"name": screen_name}})
-            if len(screen_id_list) >= 1:
-                screen_id = screen_id_list[0]['screenid']
-                return screen_id
-            return None
+            screen_list = self._zapi.screen.get({'output': 'extend', 'selectScreenItems': 'extend',
+                                                 'filter': {'name': screen_names}})
+            return dict((screen['name'], screen) for screen in screen_list)
         except Exception as e:
-            self._module.fail_json(msg="Failed to get screen %s from Zabbix: %s" % (screen_name, e))
+            self._module.fail_json(msg="Failed to get screens %s from Zabbix: %s" % (", ".join(screen_names), e))
 
-    # create screen
-    def create_screen(self, screen_name, h_size, v_size):
+    # create screen together with its items
+    def create_screen(self, screen_name, h_size, v_size, screen_items):
         try:
             if self._module.check_mode:
                 self._module.exit_json(changed=True)
-            screen = self._zapi.screen.create({'name': screen_name, 'hsize': h_size, 'vsize': v_size})
+            screen = self._zapi.screen.create({'name': screen_name, 'hsize': h_size, 'vsize': v_size,
+                                               'screenitems': screen_items})
             return screen['screenids'][0]
         except Exception as e:
             self._module.fail_json(msg="Failed to create screen %s: %s" % (screen_name, e))
 
-    # update screen
-    def update_screen(self, screen_id, screen_name, h_size, v_size):
+    # update screen, replacing its items
+    def update_screen(self, screen_id, screen_name, h_size, v_size, screen_items):
         try:
             if self._module.check_mode:
                 self._module.exit_json(changed=True)
-            self._zapi.screen.update({'screenid': screen_id, 'hsize': h_size, 'vsize': v_size})
+            self._zapi.screen.update({'screenid': screen_id, 'hsize': h_size, 'vsize': v_size,
+                                      'screenitems': screen_items})
         except Exception as e:
             self._module.fail_json(msg="Failed to update screen %s: %s" % (screen_name, e))
 
-    # delete screen
+    # delete screen, Zabbix removes its items with it
     def delete_screen(self, screen_id, screen_name):
         try:
             if self._module.check_mode:
@@ -216,53 +295,17 @@ class Screen(object):
         except Exception as e:
             self._module.fail_json(msg="Failed to delete screen %s: %s" % (screen_name, e))
 
-    # get graph ids
+    # get the graph ids of every host with a single graph.get, in graph_name_list order
     def get_graph_ids(self, hosts, graph_name_list):
-        graph_id_lists = []
-        vsize = 1
-        for host in hosts:
-            graph_id_list = self.get_graphs_by_host_id(graph_name_list, host)
-            size = len(graph_id_list)
-            if size > 0:
-                graph_id_lists.extend(graph_id_list)
-                if vsize < size:
-                    vsize = size
-        return graph_id_lists, vsize
-
-    #  getGraphs
-    def get_graphs_by_host_id(self, graph_name_list, host_id):
-        graph_ids = []
-        for graph_name in graph_name_list:
-            graphs_list = self._zapi.graph.get({'output': 'extend', 'search': {'name': graph_name}, 'hostids': host_id})
-            graph_id_list = []
-            if len(graphs_list) > 0:
-                for graph in graphs_list:
-                    graph_id = graph['graphid']
-                    graph_id_list.append(graph_id)
-            if len(graph_id_list) > 0:
-                graph_ids.extend(graph_id_list)
+        graph_list = self._zapi.graph.get({'output': ['graphid', 'name'], 'selectHosts': ['hostid'],
+                                           'hostids': hosts, 'filter': {'name': graph_name_list}})
+        position = dict((graph_name, i) for i, graph_name in enumerate(graph_name_list))
+        graph_ids = {}
+        for graph in sorted(graph_list, key=lambda g: (position.get(g['name'], len(position)), int(g['graphid']))):
+            for host in graph['hosts']:
+                graph_ids.setdefault(host['hostid'], []).append(graph['graphid'])
         return graph_ids
 
-    # get screen items
-    def get_screen_items(self, screen_id):
-        screen_item_list = self._zapi.screenitem.get({'output': 'extend', 'screenids': screen_id})
-        return screen_item_list
-
-    # delete screen items
-    def delete_screen_items(self, screen_id, screen_item_id_list):
-        try:
-            if len(screen_item_id_list) == 0:
-                return True
-            screen_item_list = self.get_screen_items(screen_id)
-            if len(screen_item_list) > 0:
-                if self._module.check_mode:
-                    self._module.exit_json(changed=True)
-                self._zapi.screenitem.delete(screen_item_id_list)
-                return True
-            return False
-        except ZabbixAPIException:
-            pass
-
     # get screen's hsize and vsize
     def get_hsize_vsize(self, hosts, v_size):
         h_size = len(hosts)
@@ -276,8 +319,8 @@ class Screen(object):
             v_size = (v_size - 1) / h_size + 1
         return h_size, v_size
 
-    # create screen_items
-    def create_screen_items(self, screen_id, hosts, graph_name_list, width, height, h_size):
+    # lay out the graphs of each host as screen items
+    def get_screen_items(self, hosts, graph_ids, width, height, h_size):
         if len(hosts) < 4:
             if width is None or width < 0:
                 width = 500
@@ -287,29 +330,36 @@ class Screen(object):
         if height is None or height < 0:
             height = 100
 
-        try:
-            # when there're only one host, only one row is not good.
-            if len(hosts) == 1:
-                graph_id_list = self.get_graphs_by_host_id(graph_name_list, hosts[0])
-                for i, graph_id in enumerate(graph_id_list):
-                    if graph_id is not None:
-                        self._zapi.screenitem.create({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
-                                                      'width': width, 'height': height,
-                                                      'x': i % h_size, 'y': i / h_size, 'colspan': 1, 'rowspan': 1,
-                                                      'elements': 0, 'valign': 0, 'halign': 0,
-                                                      'style': 0, 'dynamic': 0, 'sort_triggers': 0})
-            else:
-                for i, host in enumerate(hosts):
-                    graph_id_list = self.get_graphs_by_host_id(graph_name_list, host)
-                    for j, graph_id in enumerate(graph_id_list):
-                        if graph_id is not None:
-                            self._zapi.screenitem.create({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
-                                                          'width': width, 'height': height,
-                                                          'x': i, 'y': j, 'colspan': 1, 'rowspan': 1,
-                                                          'elements': 0, 'valign': 0, 'halign': 0,
-                                                          'style': 0, 'dynamic': 0, 'sort_triggers': 0})
-        except Already_Exists:
-            pass
+        positions = []
+        # when there're only one host, only one row is not good.
+        if len(hosts) == 1:
+            for i, graph_id in enumerate(graph_ids.get(hosts[0], [])):
+                positions.append((graph_id, i % h_size, i / h_size))
+        else:
+            for i, host in enumerate(hosts):
+                for j, graph_id in enumerate(graph_ids.get(host, [])):
+                    positions.append((graph_id, i, j))
+
+        screen_items = []
+        for graph_id, x, y in positions:
+            screen_items.append({'resourcetype': 0, 'resourceid': graph_id,
+                                 'width': width, 'height': height,
+                                 'x': x, 'y': y, 'colspan': 1, 'rowspan': 1,
+                                 'elements': 0, 'valign': 0, 'halign': 0,
+                                 'style': 0, 'dynamic': 0, 'sort_triggers': 0})
+        return screen_items
+
+    # compare the existing screen with the wanted size and items
+    def screen_differs(self, screen, h_size, v_size, screen_items):
+        if str(screen['hsize']) != str(h_size) or str(screen['vsize']) != str(v_size):
+            return True
+
+        def layout(items):
+            return dict(((str(item['x']), str(item['y'])),
+                         tuple(str(item[key]) for key in ('resourcetype', 'resourceid', 'width', 'height',
+                                                          'colspan', 'rowspan')))
+                        for item in items)
+        return layout(screen.get('screenitems', [])) != layout(screen_items)
 
 
 def main():
@@ -318,6 +368,9 @@ def main():
             server_url=dict(required=True, aliases=['url']),
             login_user=dict(required=True),
             login_password=dict(required=True, no_log=True),
+            session_cache=dict(type='bool', default=False),
+            session_cache_path=dict(default='~/.ansible/zabbix_session_cache'),
+            session_cache_ttl=dict(type='int', default=600),
             timeout=dict(type='int', default=10),
             screens=dict(type='list', required=True)
         ),
@@ -336,8 +389,8 @@ def main():
     zbx = None
     # login to zabbix
     try:
-        zbx = ZabbixAPIExtends(server_url, timeout=timeout)
-        zbx.login(login_user, login_password)
+        zbx = ZabbixAPI(server_url, timeout=timeout)
+        zabbix_login(module, zbx)
     except Exception, e:
         module.fail_json(msg="Failed to connect to Zabbix server: %s" % e)
 
@@ -346,21 +399,16 @@ def main():
     changed_screens = []
     deleted_screens = []
 
+    existing_screens = screen.get_screens([zabbix_screen['screen_name'] for zabbix_screen in screens])
+
     for zabbix_screen in screens:
         screen_name = zabbix_screen['screen_name']
-        screen_id = screen.get_screen_id(screen_name)
+        existing_screen = existing_screens.get(screen_name)
         state = "absent" if "state" in zabbix_screen and zabbix_screen['state'] == "absent" else "present"
 
         if state == "absent":
-            if screen_id:
-                screen_item_list = screen.get_screen_items(screen_id)
-                screen_item_id_list = []
-                for screen_item in screen_item_list:
-                    screen_item_id = screen_item['screenitemid']
-                    screen_item_id_list.append(screen_item_id)
-                screen.delete_screen_items(screen_id, screen_item_id_list)
-                screen.delete_screen(screen_id, screen_name)
-
+            if existing_screen:
+                screen.delete_screen(existing_screen['screenid'], screen_name)
                 deleted_screens.append(screen_name)
         else:
             host_group = zabbix_screen['host_group']
@@ -374,33 +422,18 @@ def main():
             host_group_id = screen.get_host_group_id(host_group)
             hosts = screen.get_host_ids_by_group_id(host_group_id)
 
-            screen_item_id_list = []
-            resource_id_list = []
-
-            graph_ids, v_size = screen.get_graph_ids(hosts, graph_names)
+            graph_ids = screen.get_graph_ids(hosts, graph_names)
+            v_size = max([1] + [len(graph_ids.get(host, [])) for host in hosts])
             h_size, v_size = screen.get_hsize_vsize(hosts, v_size)
+            screen_items = screen.get_screen_items(hosts, graph_ids, graph_width, graph_height, h_size)
 
-            if not screen_id:
-                # create screen
-                screen_id = screen.create_screen(screen_name, h_size, v_size)
-                screen.create_screen_items(screen_id, hosts, graph_names, graph_width, graph_height, h_size)
+            if not existing_screen:
+                screen.create_screen(screen_name, h_size, v_size, screen_items)
                 created_screens.append(screen_name)
-            else:
-                screen_item_list = screen.get_screen_items(screen_id)
-
-                for screen_item in screen_item_list:
-                    screen_item_id = screen_item['screenitemid']
-                    resource_id = screen_item['resourceid']
-                    screen_item_id_list.append(screen_item_id)
-                    resource_id_list.append(resource_id)
-
-                # when the screen items changed, then update
-                if graph_ids != resource_id_list:
-                    deleted = screen.delete_screen_items(screen_id, screen_item_id_list)
-                    if deleted:
-                        screen.update_screen(screen_id, screen_name, h_size, v_size)
-                        screen.create_screen_items(screen_id, hosts, graph_names, graph_width, graph_height, h_size)
-                        changed_screens.append(screen_name)
+            elif screen.screen_differs(existing_screen, h_size, v_size, screen_items):
+                # Zabbix matches the new items to the existing ones by their coordinates
+                screen.update_screen(existing_screen['screenid'], screen_name, h_size, v_size, screen_items)
+                changed_screens.append(screen_name)
 
     if created_screens and changed_screens:
         module.exit_json(changed=True, result="Successfully created screen(s): %s, and updated screen(s): %s" % (",".join(created_screens), ",".join(changed_screens)))
@@ -82,6 +82,36 @@ options:
     choices: ['yes', 'no']
     version_added: 1.5.1
 
+  records:
+    description:
+      - List of records to create, update or delete in one run, instead of C(record_name). Each entry takes record_name, record_type, record_value, record_ttl and state, the last two falling back to the module's values.
+      - All changes of a kind are sent with DNS Made Easy's multi-record calls, so a whole zone costs a handful of requests instead of one per record. The name, type and action of each record is returned in "result".
+    required: false
+    default: null
+    version_added: "2.1"
+
+  cache:
+    description:
+      - Keep the domain list and the records of each domain in C(cache_path) and reuse them on later runs instead of downloading them for every task. Changes made by this module update the cache, locked so that parallel runs keep each other's changes; changes made elsewhere are only seen once the cached copy expires.
+    required: false
+    default: 'no'
+    choices: ['yes', 'no']
+    version_added: "2.1"
+
+  cache_path:
+    description:
+      - File holding the cached domains and records, keyed by a hash of the account key. Created with mode 0600.
+    required: false
+    default: "~/.ansible/dnsmadeeasy_cache"
+    version_added: "2.1"
+
+  cache_ttl:
+    description:
+      - Seconds cached domains and records are reused before they are downloaded again.
+    required: false
+    default: 300
+    version_added: "2.1"
+
 notes:
   - The DNS Made Easy service requires that machines interacting with the API have the proper time and timezone set. Be sure you are within a few seconds of actual time by using NTP. 
   - This module returns record(s) in the "result" element when 'state' is set to 'present'. This value can be be registered and used in your playbooks.
@@ -107,12 +137,28 @@ EXAMPLES = '''
   
 # delete a record / ensure it is absent
 - dnsmadeeasy: account_key=key account_secret=secret domain=my.com state=absent record_name="test"
+
+# create, update or delete many records with a few requests
+- dnsmadeeasy:
+    account_key: key
+    account_secret: secret
+    domain: my.com
+    state: present
+    cache: yes
+    records:
+      - { record_name: www, record_type: A, record_value: 192.168.0.1 }
+      - { record_name: "", record_type: MX, record_value: "10 mail.my.com.", record_ttl: 3600 }
+      - { record_name: old, record_type: CNAME, state: absent }
 '''
 
 # ============================================
 # DNSMadeEasy module specific support methods.
 #
 
+import fcntl
+import os
+import tempfile
+import time
 import urllib
 
 IMPORT_ERROR = None
@@ -124,19 +170,49 @@ try:
 except ImportError, e:
     IMPORT_ERROR = str(e)
 
+# Records sent in one createMulti/updateMulti request, or deleted in one request
+MULTI_RECORD_BATCH = 200
+
+def read_dme_cache(path):
+    try:
+        cache_file = open(path)
+        try:
+            return json.load(cache_file)
+        finally:
+            cache_file.close()
+    except (IOError, ValueError):
+        return {}
+
+
+def write_dme_cache(path, cache):
+    cache_dir = os.path.dirname(path)
+    # mkstemp creates the file with mode 0600
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+    try:
+        os.write(fd, json.dumps(cache))
+    finally:
+        os.close(fd)
+    os.rename(tmp_path, path)
+
+
 class DME2:
 
-    def __init__(self, apikey, secret, domain, module):
+    def __init__(self, apikey, secret, domain, module, cache_path=None, cache_ttl=0):
         self.module = module
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
 
         self.api = apikey
         self.secret = secret
+        # the account key, not stored in the clear, keys the cached data
+        self.cache_key = hashlib.sha1(apikey).hexdigest()
         self.baseurl = 'https://api.dnsmadeeasy.com/V2.0/'
         self.domain = str(domain)
         self.domain_map = None      # ["domain_name"] => ID
         self.record_map = None      # ["record_name"] => ID
         self.records = None         # ["record_ID"] => <record>
         self.all_records = None
+        self.record_index = None    # [("record_name", "record_type")] => [<record>, ...]
 
         # Lookup the domain ID if passed as a domain name vs. ID
         if not self.domain.isdigit():
@@ -166,6 +242,9 @@ class DME2:
 
         response, info = fetch_url(self.module, url, data=data, method=method, headers=self._headers())
         if info['status'] not in (200, 201, 204):
+            if method != 'GET':
+                # the change may have partly gone through, so the cached records can't be trusted
+                self._writeCache(self.record_url, None)
             self.module.fail_json(msg="%s returned %s, with body: %s" % (url, info['status'], info['msg']))
 
         try:
@@ -186,7 +265,66 @@ class DME2:
         return self.getDomain(self.domain_map.get(domain_name, 0))
 
     def getDomains(self):
-        return self.query('dns/managed', 'GET')['data']
+        return self.cachedQuery('dns/managed')
+
+    def cachedQuery(self, resource):
+        """GETs resource, served from the on-disk cache while the cached copy is fresh"""
+        data = self._readCache(resource)
+        if data is None:
+            data = self.query(resource, 'GET')['data']
+            self._writeCache(resource, data, time.time() + self.cache_ttl)
+        return data
+
+    def _readCache(self, resource):
+        if not self.cache_path:
+            return None
+        entry = read_dme_cache(self.cache_path).get(self.cache_key, {}).get(resource)
+        if not entry or entry['expires'] <= time.time():
+            return None
+        return entry['data']
+
+    def _writeCache(self, resource, data, expires=None):
+        self._updateCache(resource, lambda cached: data, expires)
+
+    def _updateCache(self, resource, update, expires=None):
+        """Replaces the cached copy of resource with update(cached copy or None); None drops it"""
+        if not self.cache_path:
+            return
+        cache_dir = os.path.dirname(self.cache_path)
+        try:
+            if not os.path.isdir(cache_dir):
+                try:
+                    os.makedirs(cache_dir, 0700)
+                except OSError:
+                    # a parallel run may have just created it; opening the lock fails otherwise
+                    pass
+            # held while the file is re-read and written, so parallel runs keep each other's changes
+            lock = os.open(self.cache_path + '.lock', os.O_RDWR | os.O_CREAT, 0600)
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        except (IOError, OSError), e:
+            self.module.fail_json(msg="Failed to lock DNS Made Easy cache %s: %s" % (self.cache_path, e))
+
+        try:
+            cache = read_dme_cache(self.cache_path)
+            account = cache.setdefault(self.cache_key, {})
+            now = time.time()
+            for cached in account.keys():
+                if account[cached]['expires'] <= now:
+                    del account[cached]
+            entry = account.pop(resource, None)
+            if entry is None:
+                data = update(None)
+            else:
+                data = update(entry['data'])
+                expires = expires or entry['expires']
+            if data is not None and expires:
+                account[resource] = {'expires': expires, 'data': data}
+            try:
+                write_dme_cache(self.cache_path, cache)
+            except (IOError, OSError), e:
+                self.module.fail_json(msg="Failed to write DNS Made Easy cache %s: %s" % (self.cache_path, e))
+        finally:
+            os.close(lock)
 
     def getRecord(self, record_id):
         if not self.record_map:
@@ -201,32 +339,69 @@ class DME2:
     # there can be several records with different types for a single name.
     def getMatchingRecord(self, record_name, record_type, record_value):
         # Get all the records if not already cached
-        if not self.all_records:
+        if self.record_index is None:
             self.all_records = self.getRecords()
+            self._indexRecords()
 
+        candidates = self.record_index.get((record_name, record_type), [])
         # TODO SRV type not yet implemented
         if record_type in ["A", "AAAA", "CNAME", "HTTPRED", "PTR"]:
-            for result in self.all_records:
-                if result['name'] == record_name and result['type'] == record_type:
-                    return result
+            if candidates:
+                return candidates[0]
             return False
         elif record_type in ["MX", "NS", "TXT"]:
-            for result in self.all_records:
-                if record_type == "MX":
-                    value = record_value.split(" ")[1]
-                else:
-                    value = record_value
-                if result['name'] == record_name and result['type'] == record_type and result['value'] == value:
+            if record_type == "MX":
+                value = record_value.split(" ")[1]
+            else:
+                value = record_value
+            for result in candidates:
+                if result['value'] == value:
                     return result
             return False
         else:
             raise Exception('record_type not yet supported')
 
     def getRecords(self):
-        return self.query(self.record_url, 'GET')['data']
+        return self.cachedQuery(self.record_url)
+
+    def _indexRecords(self):
+        self.record_index = {}
+        for record in self.all_records:
+            self.record_index.setdefault((record['name'], record['type']), []).append(record)
+
+    def _dropRecords(self):
+        # the ids of new records are unknown, so fetch the records again next time
+        self.all_records = None
+        self.record_index = None
+        self._writeCache(self.record_url, None)
+
+    def _recordsChanged(self, created=(), updated=(), deleted_ids=()):
+        """Applies changes made through the API to the loaded records and their cached copy"""
+        updated = dict((str(record['id']), record) for record in updated)
+        deleted_ids = set(str(record_id) for record_id in deleted_ids)
+
+        def apply(all_records):
+            if all_records is None:
+                return None
+            records = []
+            for record in all_records:
+                record_id = str(record['id'])
+                if record_id in deleted_ids:
+                    continue
+                if record_id in updated:
+                    record = dict(record, **updated[record_id])
+                records.append(record)
+            known_ids = set(str(record['id']) for record in records)
+            return records + [record for record in created if str(record['id']) not in known_ids]
+
+        if self.all_records is not None:
+            self.all_records = apply(self.all_records)
+            self._indexRecords()
+        # only this run's changes are applied to the cached copy, which other runs may have changed too
+        self._updateCache(self.record_url, apply)
 
     def _instMap(self, type):
-        #@TODO cache this call so it's executed only once per ansible execution
+        # getDomains() and getRecords() are served from the on-disk cache when it is enabled
         map = {}
         results = {}
 
@@ -244,22 +419,130 @@ class DME2:
         return json.dumps(data, separators=(',', ':'))
 
     def createRecord(self, data):
-        #@TODO update the cache w/ resultant record + id when impleneted
-        return self.query(self.record_url, 'POST', data)
+        record = self.query(self.record_url, 'POST', data)
+        if record.get('id'):
+            self._recordsChanged(created=[record])
+        else:
+            self._dropRecords()
+        return record
 
     def updateRecord(self, record_id, data):
-        #@TODO update the cache w/ resultant record + id when impleneted
-        return self.query(self.record_url + '/' + str(record_id), 'PUT', data)
+        result = self.query(self.record_url + '/' + str(record_id), 'PUT', data)
+        self._recordsChanged(updated=[dict(json.loads(data), id=record_id)])
+        return result
 
     def deleteRecord(self, record_id):
-        #@TODO remove record from the cache when impleneted
-        return self.query(self.record_url + '/' + str(record_id), 'DELETE')
+        result = self.query(self.record_url + '/' + str(record_id), 'DELETE')
+        self._recordsChanged(deleted_ids=[record_id])
+        return result
+
+    def createRecords(self, records):
+        created = []
+        for i in range(0, len(records), MULTI_RECORD_BATCH):
+            result = self.query(self.record_url + '/createMulti', 'POST',
+                                self.prepareRecord(records[i:i + MULTI_RECORD_BATCH]))
+            if isinstance(result, list):
+                created.extend(result)
+        if len(created) == len(records):
+            self._recordsChanged(created=created)
+        else:
+            self._dropRecords()
+        return created
+
+    def updateRecords(self, records):
+        for i in range(0, len(records), MULTI_RECORD_BATCH):
+            self.query(self.record_url + '/updateMulti', 'PUT',
+                       self.prepareRecord(records[i:i + MULTI_RECORD_BATCH]))
+        self._recordsChanged(updated=records)
+
+    def deleteRecords(self, record_ids):
+        for i in range(0, len(record_ids), MULTI_RECORD_BATCH):
+            ids = urllib.urlencode([('ids', record_id) for record_id in record_ids[i:i + MULTI_RECORD_BATCH]])
+            self.query(self.record_url + '?' + ids, 'DELETE')
+        self._recordsChanged(deleted_ids=record_ids)
 
 
 # ===========================================
 # Module execution.
 #
 
+RECORD_TYPES = ['A', 'AAAA', 'CNAME', 'HTTPRED', 'MX', 'NS', 'PTR', 'SRV', 'TXT']
+
+def build_record(record_name, record_type, record_value, record_ttl):
+    new_record = {'name': record_name}
+    for key, value in (("value", record_value), ("type", record_type), ("ttl", record_ttl)):
+        if not value is None:
+            new_record[key] = value
+    # Special handling for mx record
+    if new_record.get("type") == "MX":
+        new_record["mxLevel"] = new_record["value"].split(" ")[0]
+        new_record["value"] = new_record["value"].split(" ")[1]
+    return new_record
+
+
+def record_differs(current_record, new_record):
+    for i in new_record:
+        if str(current_record[i]) != str(new_record[i]):
+            return True
+    return False
+
+
+def batch_records(DME, module):
+    to_create = []
+    to_update = []
+    to_delete = []
+    result = []
+    seen = set()
+
+    for entry in module.params["records"]:
+        params = dict(record_value=None, record_ttl=module.params["record_ttl"], state=module.params["state"])
+        if isinstance(entry, dict):
+            params.update(entry)
+        record_name = params.get("record_name")
+        record_type = params.get("record_type")
+        record_value = params["record_value"]
+        if record_name is None or record_type is None:
+            module.fail_json(msg="each of records needs a record_name and a record_type, got %s" % entry)
+        if record_type not in RECORD_TYPES or record_type == 'SRV':
+            module.fail_json(msg="record_type %s is not supported in records" % record_type)
+        if params["state"] not in ('present', 'absent'):
+            module.fail_json(msg="'%s' is an unknown value for the state of record '%s'" % (params["state"], record_name))
+        if record_value is None and (params["state"] == 'present' or record_type in ["MX", "NS", "TXT"]):
+            module.fail_json(msg="record '%s' of type %s needs a record_value" % (record_name, record_type))
+
+        current_record = DME.getMatchingRecord(record_name, record_type, record_value)
+        new_record = build_record(record_name, record_type, record_value, int(params["record_ttl"]))
+
+        # two entries matching the same record would be created twice
+        key = (record_name, record_type, record_type in ["MX", "NS", "TXT"] and new_record["value"] or None)
+        if key in seen:
+            module.fail_json(msg="records lists %s record '%s' more than once" % (record_type, record_name))
+        seen.add(key)
+
+        action = None
+        if params["state"] == 'present':
+            if not current_record:
+                action = "create"
+                to_create.append(new_record)
+            elif record_differs(current_record, new_record):
+                action = "update"
+                new_record['id'] = current_record['id']
+                to_update.append(new_record)
+        elif current_record:
+            action = "delete"
+            to_delete.append(current_record['id'])
+        result.append(dict(name=record_name, type=record_type, action=action))
+
+    if to_create:
+        DME.createRecords(to_create)
+    if to_update:
+        DME.updateRecords(to_update)
+    if to_delete:
+        DME.deleteRecords(to_delete)
+
+    module.exit_json(changed=bool(to_create or to_update or to_delete), result=result)
+
+
 def main():
 
     module = AnsibleModule(
@@ -269,22 +552,34 @@ def main():
             domain=dict(required=True),
             state=dict(required=True, choices=['present', 'absent']),
             record_name=dict(required=False),
-            record_type=dict(required=False, choices=[
-                             'A', 'AAAA', 'CNAME', 'HTTPRED', 'MX', 'NS', 'PTR', 'SRV', 'TXT']),
+            record_type=dict(required=False, choices=RECORD_TYPES),
             record_value=dict(required=False),
             record_ttl=dict(required=False, default=1800, type='int'),
             validate_certs = dict(default='yes', type='bool'),
+            records=dict(required=False, type='list'),
+            cache=dict(default='no', type='bool'),
+            cache_path=dict(default='~/.ansible/dnsmadeeasy_cache'),
+            cache_ttl=dict(default=300, type='int'),
         ),
         required_together=(
             ['record_value', 'record_ttl', 'record_type']
-        )
+        ),
+        mutually_exclusive=[['records', 'record_name']]
     )
 
     if IMPORT_ERROR:
         module.fail_json(msg="Import Error: " + IMPORT_ERROR)
 
+    cache_path = None
+    if module.params["cache"]:
+        cache_path = os.path.expanduser(module.params["cache_path"])
     DME = DME2(module.params["account_key"], module.params[
-               "account_secret"], module.params["domain"], module)
+               "account_secret"], module.params["domain"], module,
+               cache_path=cache_path, cache_ttl=module.params["cache_ttl"])
+
+    if module.params["records"]:
+        batch_records(DME, module)
+
     state = module.params["state"]
     record_name = module.params["record_name"]
     record_type = module.params["record_type"]
@@ -300,21 +595,12 @@ def main():
 
     # Fetch existing record + Build new one
     current_record = DME.getMatchingRecord(record_name, record_type, record_value)
-    new_record = {'name': record_name}
-    for i in ["record_value", "record_type", "record_ttl"]:
-        if not module.params[i] is None:
-            new_record[i[len("record_"):]] = module.params[i]
-    # Special handling for mx record
-    if new_record["type"] == "MX":
-        new_record["mxLevel"] = new_record["value"].split(" ")[0]
-        new_record["value"] = new_record["value"].split(" ")[1]
+    new_record = build_record(record_name, record_type, record_value, module.params["record_ttl"])
 
     # Compare new record against existing one
     changed = False
     if current_record:
-        for i in new_record:
-            if str(current_record[i]) != str(new_record[i]):
-                changed = True
+        changed = record_differs(current_record, new_record)
         new_record['id'] = str(current_record['id'])
 
     # Follow Keyword Controlled Behavior
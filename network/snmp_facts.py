@@ -31,7 +31,15 @@ options:
     host:
         description:
             - Set to target snmp server (normally {{inventory_hostname}})
-        required: true
+            - Either I(host) or I(hosts) is required.
+        required: false
+    hosts:
+        description:
+            - A list of snmp servers to poll concurrently. Instead of facts,
+              the facts of every device are returned in I(devices) together
+              with the time it took to poll each one.
+        required: false
+        version_added: "2.1"
     version:
         description:
             - SNMP Version to use, v2/v2c or v3
@@ -68,6 +76,28 @@ options:
         description:
             - Encryption key, required if version is authPriv
         required: false
+    gather:
+        description:
+            - The profiles of facts to collect. Only the MIB columns of these
+              profiles are walked.
+            - C(system) sets the SNMPv2-MIB system facts, C(interfaces) and
+              C(ipv4) fill I(ansible_interfaces) from IF-MIB and IP-MIB,
+              C(interfaces_hc) adds the IF-MIB 64 bit counters and speed to
+              them, C(entity) sets I(ansible_entities) from ENTITY-MIB,
+              C(lldp) sets I(ansible_lldp_neighbors) from LLDP-MIB and C(bgp)
+              sets I(ansible_bgp_peers) from BGP4-MIB.
+        choices: [ 'system', 'interfaces', 'ipv4', 'interfaces_hc', 'entity', 'lldp', 'bgp' ]
+        default: [ 'system', 'interfaces', 'ipv4' ]
+        required: false
+        version_added: "2.1"
+    max_repetitions:
+        description:
+            - Number of rows requested per GETBULK when walking tables.
+              Larger values mean fewer round-trips on devices with many
+              interfaces.
+        default: 25
+        required: false
+        version_added: "2.1"
 '''
 
 EXAMPLES = '''
@@ -86,48 +116,32 @@ EXAMPLES = '''
     authkey=abc12345
     privkey=def6789
   delegate_to: localhost
+
+# Poll the interfaces of every switch at once
+- snmp_facts:
+    hosts: "{{ groups['switches'] }}"
+    version: v2c
+    community: public
+    gather: interfaces
+    max_repetitions: 50
+  delegate_to: localhost
+  run_once: true
+  register: switches
 '''
 
 from ansible.module_utils.basic import *
 from collections import defaultdict
+import time
 
 try:
     from pysnmp.entity.rfc3413.oneliner import cmdgen
+    from pysnmp.proto import rfc1905
     has_pysnmp = True
 except:
     has_pysnmp = False
 
-class DefineOid(object):
+DEFAULT_GATHER = ['system', 'interfaces', 'ipv4']
 
-    def __init__(self,dotprefix=False):
-        if dotprefix:
-            dp = "."
-        else:
-            dp = ""
-
-        # From SNMPv2-MIB
-        self.sysDescr    = dp + "1.3.6.1.2.1.1.1.0"
-        self.sysObjectId = dp + "1.3.6.1.2.1.1.2.0"
-        self.sysUpTime   = dp + "1.3.6.1.2.1.1.3.0"
-        self.sysContact  = dp + "1.3.6.1.2.1.1.4.0"
-        self.sysName     = dp + "1.3.6.1.2.1.1.5.0"
-        self.sysLocation = dp + "1.3.6.1.2.1.1.6.0"
-        
-        # From IF-MIB
-        self.ifIndex       = dp + "1.3.6.1.2.1.2.2.1.1"
-        self.ifDescr       = dp + "1.3.6.1.2.1.2.2.1.2"
-        self.ifMtu         = dp + "1.3.6.1.2.1.2.2.1.4"
-        self.ifSpeed       = dp + "1.3.6.1.2.1.2.2.1.5"
-        self.ifPhysAddress = dp + "1.3.6.1.2.1.2.2.1.6"
-        self.ifAdminStatus = dp + "1.3.6.1.2.1.2.2.1.7"
-        self.ifOperStatus  = dp + "1.3.6.1.2.1.2.2.1.8"
-        self.ifAlias       = dp + "1.3.6.1.2.1.31.1.1.1.18"
-
-        # From IP-MIB
-        self.ipAdEntAddr    = dp + "1.3.6.1.2.1.4.20.1.1"
-        self.ipAdEntIfIndex = dp + "1.3.6.1.2.1.4.20.1.2"
-        self.ipAdEntNetMask = dp + "1.3.6.1.2.1.4.20.1.3"
-        
 
 def decode_hex(hexstring):
  
@@ -173,10 +187,303 @@ def lookup_operstatus(int_operstatus):
     else:
         return ""
 
+def lookup_bgp_peerstate(int_peerstate):
+    peerstate_options = {
+                          1: 'idle',
+                          2: 'connect',
+                          3: 'active',
+                          4: 'opensent',
+                          5: 'openconfirm',
+                          6: 'established'
+                        }
+    return peerstate_options.get(int_peerstate, "")
+
+def lookup_bgp_adminstatus(int_adminstatus):
+    adminstatus_options = {
+                            1: 'stop',
+                            2: 'start'
+                          }
+    return adminstatus_options.get(int_adminstatus, "")
+
+def index_int(index):
+    return int(index[0])
+
+def index_ipv4(index):
+    return ".".join([str(x) for x in index[-4:]])
+
+def index_lldp_port(index):
+    # lldpRemTable is indexed by TimeMark, LocalPortNum and Index
+    return int(index[1])
+
+def finalize_ipv4(results):
+    ipv4_networks = results.pop('_ipv4_networks', {})
+
+    # ipAddrTable is walked in order of address, keep that order
+    addresses = sorted(ipv4_networks.keys(), key=lambda ip: [int(x) for x in ip.split('.')])
+
+    interface_to_ipv4 = {}
+    for ipv4_network in addresses:
+        current_interface = ipv4_networks[ipv4_network]['interface']
+        current_network = {
+                            'address':  ipv4_networks[ipv4_network]['address'],
+                            'netmask':  ipv4_networks[ipv4_network]['netmask']
+                          }
+        if not current_interface in interface_to_ipv4:
+            interface_to_ipv4[current_interface] = []
+        interface_to_ipv4[current_interface].append(current_network)
+
+    for interface in interface_to_ipv4:
+        results['ansible_interfaces'][int(interface)]['ipv4'] = interface_to_ipv4[interface]
+
+    results['ansible_all_ipv4_addresses'] = [ipv4_networks[ip]['address'] for ip in addresses]
+
+# SNMP_PROFILES is the registry of the sets of OIDs that can be gathered.
+# Scalars are fetched with a GET and set (oid, fact, convert) at the top level
+# of the facts. Columns are walked and set (oid, field, convert) in the
+# profile table, keyed by the result of its index function on the OID suffix.
+# A finalize function, if any, runs once all varbinds have been mapped.
+SNMP_PROFILES = {
+    # SNMPv2-MIB
+    'system': {
+        'scalars': [
+            ('1.3.6.1.2.1.1.1.0', 'ansible_sysdescr', decode_hex),
+            ('1.3.6.1.2.1.1.2.0', 'ansible_sysobjectid', None),
+            ('1.3.6.1.2.1.1.3.0', 'ansible_sysuptime', None),
+            ('1.3.6.1.2.1.1.4.0', 'ansible_syscontact', None),
+            ('1.3.6.1.2.1.1.5.0', 'ansible_sysname', None),
+            ('1.3.6.1.2.1.1.6.0', 'ansible_syslocation', None),
+        ],
+    },
+    # IF-MIB ifTable and ifAlias
+    'interfaces': {
+        'table': 'ansible_interfaces',
+        'index': index_int,
+        'columns': [
+            ('1.3.6.1.2.1.2.2.1.1', 'ifindex', None),
+            ('1.3.6.1.2.1.2.2.1.2', 'name', None),
+            ('1.3.6.1.2.1.2.2.1.4', 'mtu', None),
+            ('1.3.6.1.2.1.2.2.1.5', 'speed', None),
+            ('1.3.6.1.2.1.2.2.1.6', 'mac', decode_mac),
+            ('1.3.6.1.2.1.2.2.1.7', 'adminstatus', lambda v: lookup_adminstatus(int(v))),
+            ('1.3.6.1.2.1.2.2.1.8', 'operstatus', lambda v: lookup_operstatus(int(v))),
+            ('1.3.6.1.2.1.31.1.1.1.18', 'description', None),
+        ],
+    },
+    # IP-MIB ipAddrTable
+    'ipv4': {
+        'table': '_ipv4_networks',
+        'index': index_ipv4,
+        'columns': [
+            ('1.3.6.1.2.1.4.20.1.1', 'address', None),
+            ('1.3.6.1.2.1.4.20.1.2', 'interface', None),
+            ('1.3.6.1.2.1.4.20.1.3', 'netmask', None),
+        ],
+        'finalize': finalize_ipv4,
+    },
+    # IF-MIB ifXTable high capacity counters
+    'interfaces_hc': {
+        'table': 'ansible_interfaces',
+        'index': index_int,
+        'columns': [
+            ('1.3.6.1.2.1.31.1.1.1.1', 'ifname', None),
+            ('1.3.6.1.2.1.31.1.1.1.6', 'hc_in_octets', None),
+            ('1.3.6.1.2.1.31.1.1.1.7', 'hc_in_ucast_pkts', None),
+            ('1.3.6.1.2.1.31.1.1.1.10', 'hc_out_octets', None),
+            ('1.3.6.1.2.1.31.1.1.1.11', 'hc_out_ucast_pkts', None),
+            ('1.3.6.1.2.1.31.1.1.1.15', 'high_speed', None),
+        ],
+    },
+    # ENTITY-MIB entPhysicalTable
+    'entity': {
+        'table': 'ansible_entities',
+        'index': index_int,
+        'columns': [
+            ('1.3.6.1.2.1.47.1.1.1.1.2', 'description', None),
+            ('1.3.6.1.2.1.47.1.1.1.1.4', 'contained_in', None),
+            ('1.3.6.1.2.1.47.1.1.1.1.5', 'class', None),
+            ('1.3.6.1.2.1.47.1.1.1.1.7', 'name', None),
+            ('1.3.6.1.2.1.47.1.1.1.1.8', 'hardware_rev', None),
+            ('1.3.6.1.2.1.47.1.1.1.1.9', 'firmware_rev', None),
+            ('1.3.6.1.2.1.47.1.1.1.1.10', 'software_rev', None),
+            ('1.3.6.1.2.1.47.1.1.1.1.11', 'serial', None),
+            ('1.3.6.1.2.1.47.1.1.1.1.13', 'model', None),
+        ],
+    },
+    # LLDP-MIB lldpRemTable
+    'lldp': {
+        'table': 'ansible_lldp_neighbors',
+        'index': index_lldp_port,
+        'columns': [
+            ('1.0.8802.1.1.2.1.4.1.1.5', 'chassis_id', decode_mac),
+            ('1.0.8802.1.1.2.1.4.1.1.7', 'port_id', decode_hex),
+            ('1.0.8802.1.1.2.1.4.1.1.8', 'port_description', None),
+            ('1.0.8802.1.1.2.1.4.1.1.9', 'system_name', None),
+            ('1.0.8802.1.1.2.1.4.1.1.10', 'system_description', None),
+        ],
+    },
+    # BGP4-MIB bgpPeerTable
+    'bgp': {
+        'table': 'ansible_bgp_peers',
+        'index': index_ipv4,
+        'columns': [
+            ('1.3.6.1.2.1.15.3.1.2', 'state', lambda v: lookup_bgp_peerstate(int(v))),
+            ('1.3.6.1.2.1.15.3.1.3', 'adminstatus', lambda v: lookup_bgp_adminstatus(int(v))),
+            ('1.3.6.1.2.1.15.3.1.5', 'local_address', None),
+            ('1.3.6.1.2.1.15.3.1.9', 'remote_as', None),
+            ('1.3.6.1.2.1.15.3.1.16', 'established_time', None),
+        ],
+    },
+}
+
+def oid_tuple(oid):
+    return tuple(int(x) for x in oid.strip('.').split('.'))
+
+class OidMap(object):
+    """
+    Compiles the profiles to gather into a lookup table from scalar or
+    column OID to its handler. A varbind is mapped to its fact with one
+    dictionary hit per distinct OID length instead of comparing it with
+    every OID in turn.
+    """
+
+    def __init__(self, gather):
+        # a profile named twice would be walked and finalized twice
+        names = []
+        for name in gather:
+            if name not in names:
+                names.append(name)
+        self.profiles = [SNMP_PROFILES[name] for name in names]
+        self.scalars = []
+        self.columns = []
+        self.handlers = {}
+        for profile in self.profiles:
+            for oid, field, convert in profile.get('scalars', []):
+                self.scalars.append('.' + oid)
+                self.handlers[oid_tuple(oid)] = (None, field, convert)
+            for oid, field, convert in profile.get('columns', []):
+                self.columns.append('.' + oid)
+                self.handlers[oid_tuple(oid)] = (profile, field, convert)
+        self.lengths = sorted(set([len(oid) for oid in self.handlers]), reverse=True)
+
+    def parse(self, varBinds):
+        """
+        Turn the varbinds collected from a device into facts.
+        """
+        Tree = lambda: defaultdict(Tree)
+
+        results = Tree()
+
+        for oid, val in varBinds:
+            oid = tuple(oid)
+            for length in self.lengths:
+                handler = self.handlers.get(oid[:length])
+                if handler is not None:
+                    break
+            else:
+                continue
+
+            profile, field, convert = handler
+            current_val = val.prettyPrint()
+            if convert is not None:
+                current_val = convert(current_val)
+
+            if profile is None:
+                results[field] = current_val
+            else:
+                index = profile['index'](oid[length:])
+                results[profile['table']][index][field] = current_val
+
+        for profile in self.profiles:
+            if 'finalize' in profile:
+                profile['finalize'](results)
+
+        return results
+
+class SnmpPoller(object):
+    """
+    Gets the scalars and walks the table columns of one device with
+    GETBULK requests issued through a shared asynchronous command
+    generator, so that many devices can be polled at the same time.
+    """
+
+    def __init__(self, cmdGen, snmp_auth, host, scalars, columns, max_repetitions):
+        self.cmdGen = cmdGen
+        self.snmp_auth = snmp_auth
+        self.host = host
+        self.scalars = scalars
+        self.columns = columns
+        self.max_repetitions = max_repetitions
+        self.varBinds = []
+        self.error = None
+        self.pending = 0
+        self.started = None
+        self.elapsed = None
+
+    def start(self):
+        self.started = time.time()
+        target = cmdgen.UdpTransportTarget((self.host, 161))
+        if self.scalars:
+            self.pending += 1
+            self.cmdGen.asyncGetCmd(
+                self.snmp_auth, target,
+                [cmdgen.MibVariable(oid,) for oid in self.scalars],
+                (self.get_callback, None))
+        if self.columns:
+            self.pending += 1
+            self.column_oids = [oid_tuple(oid) for oid in self.columns]
+            self.last_oids = [None] * len(self.columns)
+            self.cmdGen.asyncBulkCmd(
+                self.snmp_auth, target, 0, self.max_repetitions,
+                [cmdgen.MibVariable(oid,) for oid in self.columns],
+                (self.walk_callback, None))
+
+    def finish(self, errorIndication=None, errorStatus=None):
+        if errorIndication and not self.error:
+            self.error = str(errorIndication)
+        elif errorStatus and not self.error:
+            self.error = errorStatus.prettyPrint()
+        self.pending -= 1
+        if not self.pending:
+            self.elapsed = time.time() - self.started
+
+    def get_callback(self, sendRequestHandle, errorIndication, errorStatus,
+                     errorIndex, varBinds, cbCtx):
+        if not errorIndication and not errorStatus:
+            self.varBinds.extend(varBinds)
+        self.finish(errorIndication, errorStatus)
+
+    def walk_callback(self, sendRequestHandle, errorIndication, errorStatus,
+                      errorIndex, varBindTable, cbCtx):
+        if errorIndication or errorStatus:
+            self.finish(errorIndication, errorStatus)
+            return False
+
+        # Keep the varbinds still inside the column that was asked for and
+        # carry on for as long as any column has rows left.
+        more = False
+        for varBindRow in varBindTable:
+            for i, (oid, val) in enumerate(varBindRow):
+                column = self.column_oids[i]
+                oid = tuple(oid)
+                if isinstance(val, rfc1905.EndOfMibView):
+                    continue
+                if oid[:len(column)] != column:
+                    continue
+                if self.last_oids[i] is not None and oid <= self.last_oids[i]:
+                    continue
+                self.last_oids[i] = oid
+                self.varBinds.append(varBindRow[i])
+                more = True
+
+        if not more:
+            self.finish()
+        return more
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
-            host=dict(required=True),
+            host=dict(required=False),
+            hosts=dict(required=False, type='list'),
             version=dict(required=True, choices=['v2', 'v2c', 'v3']),
             community=dict(required=False, default=False),
             username=dict(required=False),
@@ -185,8 +492,12 @@ def main():
             privacy=dict(required=False, choices=['des', 'aes']),
             authkey=dict(required=False),
             privkey=dict(required=False),
+            gather=dict(required=False, type='list', default=DEFAULT_GATHER),
+            max_repetitions=dict(required=False, type='int', default=25),
             removeplaceholder=dict(required=False)),
             required_together = ( ['username','level','integrity','authkey'],['privacy','privkey'],),
+            required_one_of = ( ['host','hosts'],),
+            mutually_exclusive = ( ['host','hosts'],),
         supports_check_mode=False)
 
     m_args = module.params
@@ -194,7 +505,11 @@ def main():
     if not has_pysnmp:
         module.fail_json(msg='Missing required pysnmp module (check docs)')
 
-    cmdGen = cmdgen.CommandGenerator()
+    for profile in m_args['gather']:
+        if profile not in SNMP_PROFILES:
+            module.fail_json(msg='Unknown gather value %s, expected one of %s' % (profile, ', '.join(sorted(SNMP_PROFILES))))
+
+    cmdGen = cmdgen.AsynCommandGenerator()
 
     # Verify that we receive a community when using snmp v2
     if m_args['version'] == "v2" or m_args['version'] == "v2c":
@@ -231,136 +546,44 @@ def main():
     else:
         snmp_auth = cmdgen.UsmUserData(m_args['username'], authKey=m_args['authkey'], privKey=m_args['privkey'], authProtocol=integrity_proto, privProtocol=privacy_proto)
 
-    # Use p to prefix OIDs with a dot for polling
-    p = DefineOid(dotprefix=True)
-    # Use v without a prefix to use with return values
-    v = DefineOid(dotprefix=False)
-
-    Tree = lambda: defaultdict(Tree)
-                               
-    results = Tree()
-            
-    errorIndication, errorStatus, errorIndex, varBinds = cmdGen.getCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.sysDescr,),
-        cmdgen.MibVariable(p.sysObjectId,), 
-        cmdgen.MibVariable(p.sysUpTime,),
-        cmdgen.MibVariable(p.sysContact,), 
-        cmdgen.MibVariable(p.sysName,),
-        cmdgen.MibVariable(p.sysLocation,),
-    )
-
-
-    if errorIndication:
-        module.fail_json(msg=str(errorIndication))
-
-    for oid, val in varBinds:
-        current_oid = oid.prettyPrint()
-        current_val = val.prettyPrint()
-        if current_oid == v.sysDescr:
-            results['ansible_sysdescr'] = decode_hex(current_val)
-        elif current_oid == v.sysObjectId:
-            results['ansible_sysobjectid'] = current_val
-        elif current_oid == v.sysUpTime:
-            results['ansible_sysuptime'] = current_val
-        elif current_oid == v.sysContact:
-            results['ansible_syscontact'] = current_val
-        elif current_oid == v.sysName:
-            results['ansible_sysname'] = current_val
-        elif current_oid == v.sysLocation:
-            results['ansible_syslocation'] = current_val
-
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)), 
-        cmdgen.MibVariable(p.ifIndex,),
-        cmdgen.MibVariable(p.ifDescr,),
-        cmdgen.MibVariable(p.ifMtu,),
-        cmdgen.MibVariable(p.ifSpeed,),
-        cmdgen.MibVariable(p.ifPhysAddress,),
-        cmdgen.MibVariable(p.ifAdminStatus,),
-        cmdgen.MibVariable(p.ifOperStatus,),
-        cmdgen.MibVariable(p.ipAdEntAddr,), 
-        cmdgen.MibVariable(p.ipAdEntIfIndex,), 
-        cmdgen.MibVariable(p.ipAdEntNetMask,), 
-
-        cmdgen.MibVariable(p.ifAlias,),
-    )
- 
-
-    if errorIndication:
-        module.fail_json(msg=str(errorIndication))
-
-    interface_indexes = []
-    
-    all_ipv4_addresses = []     
-    ipv4_networks = Tree()
-
-    for varBinds in varTable:
-        for oid, val in varBinds:
-            current_oid = oid.prettyPrint()
-            current_val = val.prettyPrint()
-            if v.ifIndex in current_oid:
-                ifIndex = int(current_oid.rsplit('.', 1)[-1])
-                results['ansible_interfaces'][ifIndex]['ifindex'] = current_val
-                interface_indexes.append(ifIndex)
-            if v.ifDescr in current_oid:
-                ifIndex = int(current_oid.rsplit('.', 1)[-1])
-                results['ansible_interfaces'][ifIndex]['name'] = current_val
-            if v.ifMtu in current_oid:
-                ifIndex = int(current_oid.rsplit('.', 1)[-1])
-                results['ansible_interfaces'][ifIndex]['mtu'] = current_val
-            if v.ifMtu in current_oid:
-                ifIndex = int(current_oid.rsplit('.', 1)[-1])
-                results['ansible_interfaces'][ifIndex]['speed'] = current_val
-            if v.ifPhysAddress in current_oid:
-                ifIndex = int(current_oid.rsplit('.', 1)[-1])
-                results['ansible_interfaces'][ifIndex]['mac'] = decode_mac(current_val)
-            if v.ifAdminStatus in current_oid:
-                ifIndex = int(current_oid.rsplit('.', 1)[-1])
-                results['ansible_interfaces'][ifIndex]['adminstatus'] = lookup_adminstatus(int(current_val))
-            if v.ifOperStatus in current_oid:
-                ifIndex = int(current_oid.rsplit('.', 1)[-1])
-                results['ansible_interfaces'][ifIndex]['operstatus'] = lookup_operstatus(int(current_val))
-            if v.ipAdEntAddr in current_oid:
-                curIPList = current_oid.rsplit('.', 4)[-4:]
-                curIP = ".".join(curIPList)
-                ipv4_networks[curIP]['address'] = current_val
-                all_ipv4_addresses.append(current_val)
-            if v.ipAdEntIfIndex in current_oid:
-                curIPList = current_oid.rsplit('.', 4)[-4:]
-                curIP = ".".join(curIPList)
-                ipv4_networks[curIP]['interface'] = current_val
-            if v.ipAdEntNetMask in current_oid:
-                curIPList = current_oid.rsplit('.', 4)[-4:]
-                curIP = ".".join(curIPList)
-                ipv4_networks[curIP]['netmask'] = current_val
-
-            if v.ifAlias in current_oid:
-                ifIndex = int(current_oid.rsplit('.', 1)[-1])
-                results['ansible_interfaces'][ifIndex]['description'] = current_val
+    oid_map = OidMap(m_args['gather'])
+    scalars, columns = oid_map.scalars, oid_map.columns
+    if not scalars and not columns:
+        module.fail_json(msg='Nothing to gather')
 
-    interface_to_ipv4 = {}
-    for ipv4_network in ipv4_networks:
-        current_interface = ipv4_networks[ipv4_network]['interface']
-        current_network = {
-                            'address':  ipv4_networks[ipv4_network]['address'],
-                            'netmask':  ipv4_networks[ipv4_network]['netmask']
-                          }
-        if not current_interface in interface_to_ipv4:
-            interface_to_ipv4[current_interface] = []
-            interface_to_ipv4[current_interface].append(current_network)
+    if m_args['hosts']:
+        hosts = m_args['hosts']
+    else:
+        hosts = [m_args['host']]
+
+    pollers = []
+    for host in hosts:
+        poller = SnmpPoller(cmdGen, snmp_auth, host, scalars, columns,
+                            m_args['max_repetitions'])
+        poller.start()
+        pollers.append(poller)
+
+    started = time.time()
+    cmdGen.snmpEngine.transportDispatcher.runDispatcher()
+    elapsed = time.time() - started
+
+    if not m_args['hosts']:
+        poller = pollers[0]
+        if poller.error:
+            module.fail_json(msg=poller.error)
+        module.exit_json(ansible_facts=oid_map.parse(poller.varBinds),
+                         elapsed=round(poller.elapsed, 3))
+
+    devices = {}
+    for poller in pollers:
+        if poller.error:
+            devices[poller.host] = dict(failed=True, msg=poller.error)
         else:
-            interface_to_ipv4[current_interface].append(current_network)
+            devices[poller.host] = dict(facts=oid_map.parse(poller.varBinds))
+        if poller.elapsed is not None:
+            devices[poller.host]['elapsed'] = round(poller.elapsed, 3)
 
-    for interface in interface_to_ipv4:
-        results['ansible_interfaces'][int(interface)]['ipv4'] = interface_to_ipv4[interface]
+    module.exit_json(devices=devices, elapsed=round(elapsed, 3))
 
-    results['ansible_all_ipv4_addresses'] = all_ipv4_addresses
- 
-    module.exit_json(ansible_facts=results)
-    
 
 main()
-
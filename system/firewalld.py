@@ -47,6 +47,30 @@ options:
     required: false
     default: null
     version_added: "2.0"
+  services:
+    description:
+      - "A list of services to add/remove to/from the zone in one operation, see I(service)."
+    required: false
+    default: null
+    version_added: "2.1"
+  ports:
+    description:
+      - "A list of ports or port ranges to add/remove to/from the zone in one operation, see I(port)."
+    required: false
+    default: null
+    version_added: "2.1"
+  rich_rules:
+    description:
+      - "A list of rich rules to add/remove to/from the zone in one operation, see I(rich_rule)."
+    required: false
+    default: null
+    version_added: "2.1"
+  sources:
+    description:
+      - "A list of sources to add/remove to/from the zone in one operation, see I(source)."
+    required: false
+    default: null
+    version_added: "2.1"
   zone:
     description:
       - 'The firewalld zone to add/remove to/from (NOTE: default zone can be configured per system but "public" is default from upstream. Available choices can be extended based on per-system configs, listed here are "out of the box" defaults).'
@@ -75,6 +99,11 @@ options:
     default: 0
 notes:
   - Not tested on any Debian based system.
+  - When any of I(services), I(ports), I(rich_rules) or I(sources) is given the
+    permanent zone settings are read once and written back with a single update,
+    so firewalld only saves and reloads the zone once. Runtime changes are made
+    against the runtime state read once per kind. These options can not be
+    combined with I(service), I(port), I(rich_rule) or I(source).
 requirements: [ 'firewalld >= 0.2.11' ]
 author: "Adam Miller (@maxamillion)"
 '''
@@ -86,6 +115,16 @@ EXAMPLES = '''
 - firewalld: zone=dmz service=http permanent=true state=enabled
 - firewalld: rich_rule='rule service name="ftp" audit limit value="1/m" accept' permanent=true state=enabled
 - firewalld: source='192.168.1.0/24' zone=internal state=enabled
+
+# Open many ports and services in a single zone update
+- firewalld:
+    zone: internal
+    permanent: true
+    immediate: true
+    state: enabled
+    services: [ http, https ]
+    ports: [ 8080/tcp, 8443/tcp, 9000-9100/tcp ]
+    sources: [ 10.1.0.0/16, 10.2.0.0/16 ]
 '''
 
 import os
@@ -231,6 +270,114 @@ def set_rich_rule_disabled_permanent(zone, rule):
     fw_zone.update(fw_settings)
 
 
+####################
+# batch handling
+#
+def parse_port(module, port_proto):
+    try:
+        port, protocol = port_proto.split('/')
+    except ValueError:
+        module.fail_json(msg='improper port format %s (missing protocol?)' % port_proto)
+    return (port, protocol)
+
+def diff_items(current, wanted, desired_state):
+    current = set(current)
+    seen = set()
+    changes = []
+    for item in wanted:
+        if item in seen:
+            continue
+        seen.add(item)
+        if (item in current) != (desired_state == "enabled"):
+            changes.append(item)
+    return changes
+
+def describe(item):
+    if isinstance(item, tuple):
+        return '/'.join(item)
+    return item
+
+def apply_batch(module, zone, services, ports, rich_rules, sources):
+    permanent = module.params['permanent']
+    desired_state = module.params['state']
+    immediate = module.params['immediate']
+    timeout = module.params['timeout']
+    enable = desired_state == "enabled"
+
+    changed = False
+    msgs = []
+
+    if permanent or sources:
+        fw_zone = fw.config().getZoneByName(zone)
+        fw_settings = fw_zone.getSettings()
+
+        changes = []
+        if permanent:
+            msgs.append('Permanent operation')
+            changes.extend([
+                (diff_items(fw_settings.getServices(), services, desired_state),
+                 fw_settings.addService, fw_settings.removeService, 'service'),
+                (diff_items([tuple(p) for p in fw_settings.getPorts()], ports, desired_state),
+                 fw_settings.addPort, fw_settings.removePort, 'port'),
+                (diff_items(fw_settings.getRichRules(), rich_rules, desired_state),
+                 fw_settings.addRichRule, fw_settings.removeRichRule, 'rich_rule'),
+            ])
+        # sources are always permanent
+        changes.append(
+            (diff_items(fw_settings.getSources(), sources, desired_state),
+             fw_settings.addSource, fw_settings.removeSource, 'source'))
+
+        if [c for c in changes if c[0]]:
+            if module.check_mode:
+                module.exit_json(changed=True)
+
+            for items, add, remove, kind in changes:
+                for item in items:
+                    if kind == 'port':
+                        args = item
+                    else:
+                        args = (item,)
+                    if enable:
+                        add(*args)
+                    else:
+                        remove(*args)
+                if items:
+                    msgs.append("Changed %s %s to %s" % (kind, ', '.join([describe(i) for i in items]), desired_state))
+            fw_zone.update(fw_settings)
+            changed = True
+
+    if (immediate or not permanent) and (services or ports or rich_rules):
+        msgs.append('Non-permanent operation')
+        changes = [
+            (diff_items(fw.getServices(zone), services, desired_state),
+             fw.addService, fw.removeService, 'service'),
+            (diff_items([tuple(p) for p in fw.getPorts(zone)], ports, desired_state),
+             fw.addPort, fw.removePort, 'port'),
+            (diff_items(fw.getRichRules(zone), rich_rules, desired_state),
+             fw.addRichRule, fw.removeRichRule, 'rich_rule'),
+        ]
+
+        if [c for c in changes if c[0]]:
+            if module.check_mode:
+                module.exit_json(changed=True)
+
+            for items, add, remove, kind in changes:
+                for item in items:
+                    if kind == 'port':
+                        args = item
+                    else:
+                        args = (item,)
+                    if enable:
+                        add(zone, *(args + (timeout,)))
+                    else:
+                        remove(zone, *args)
+                if items:
+                    msgs.append("Changed runtime %s %s to %s" % (kind, ', '.join([describe(i) for i in items]), desired_state))
+            changed = True
+
+    return changed, msgs
+
+
 def main():
 
     module = AnsibleModule(
@@ -241,14 +388,20 @@ def main():
             zone=dict(required=False,default=None),
             immediate=dict(type='bool',default=False),
             source=dict(required=False,default=None),
+            services=dict(type='list',required=False,default=None),
+            ports=dict(type='list',required=False,default=None),
+            rich_rules=dict(type='list',required=False,default=None),
+            sources=dict(type='list',required=False,default=None),
             permanent=dict(type='bool',required=False,default=None),
             state=dict(choices=['enabled', 'disabled'], required=True),
             timeout=dict(type='int',required=False,default=0),
         ),
         supports_check_mode=True
     )
+    batch = [module.params[k] for k in ('services', 'ports', 'rich_rules') if module.params[k]]
     if module.params['source'] == None and module.params['permanent'] == None:
-        module.fail(msg='permanent is a required parameter')
+        if batch or not module.params['sources']:
+            module.fail_json(msg='permanent is a required parameter')
 
     if not HAS_FIREWALLD:
         module.fail_json(msg='firewalld required for this module')
@@ -300,6 +453,18 @@ def main():
     if modification_count > 1:
         module.fail_json(msg='can only operate on port, service or rich_rule at once')
 
+    if batch or module.params['sources']:
+        if modification_count or source != None:
+            module.fail_json(msg='services, ports, rich_rules and sources can not be combined with service, port, rich_rule or source')
+
+        ports = [parse_port(module, p) for p in module.params['ports'] or []]
+        changed, msgs = apply_batch(module, zone,
+                                    module.params['services'] or [],
+                                    ports,
+                                    module.params['rich_rules'] or [],
+                                    module.params['sources'] or [])
+        module.exit_json(changed=changed, msg=', '.join(msgs))
+
     if service != None:
         if permanent:
             is_enabled = get_service_enabled_permanent(zone, service)
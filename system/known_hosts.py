@@ -32,7 +32,7 @@ options:
     aliases: [ 'host' ]
     description:
       - The host to add or remove (must match a host specified in key)
-    required: true
+    required: false
     default: null
   key:
     description:
@@ -46,10 +46,21 @@ options:
     default: "(homedir)+/.ssh/known_hosts"
   state:
     description:
-      - I(present) to add the host, I(absent) to remove it.
+      - I(present) to add the host, I(absent) to remove it. As with
+        C(ssh-keygen -R), @cert-authority and @revoked lines are never
+        removed, nor are wildcard pattern lines.
     choices: [ "present", "absent" ]
     required: no
     default: present
+  hosts:
+    description:
+      - A list of entries to apply in one pass, each a dictionary with a
+        C(name), a C(key) and a C(state) as for the options above. The file
+        is read once, every change is made in memory and the result is
+        written back once. Mutually exclusive with I(name) and I(key).
+    required: no
+    default: null
+    version_added: "2.1"
 requirements: [ ]
 author: "Matthew Vernon (@mcv21)"
 '''
@@ -60,6 +71,18 @@ EXAMPLES = '''
   known_hosts: path='/etc/ssh/ssh_known_hosts'
                name='foo.com.invalid'
                key="{{ lookup('file', 'pubkeys/foo.com.invalid') }}"
+
+# Add and remove many hosts, rewriting the file only once
+- name: seed the known hosts of the build farm
+  known_hosts:
+    path: /etc/ssh/ssh_known_hosts
+    hosts:
+      - name: build01.example.com
+        key: "{{ lookup('file', 'pubkeys/build01.example.com') }}"
+      - name: build02.example.com
+        key: "{{ lookup('file', 'pubkeys/build02.example.com') }}"
+      - name: oldbuild.example.com
+        state: absent
 '''
 
 # Makes sure public host keys are present or absent in the given known_hosts
@@ -71,11 +94,18 @@ EXAMPLES = '''
 #    key = line(s) to add to known_hosts file
 #    path = the known_hosts file to edit (default: ~/.ssh/known_hosts)
 #    state = absent|present (default: present)
+#    hosts = list of name/key/state entries to apply in one pass
 
 import os
 import os.path
+import re
 import tempfile
 import errno
+import base64
+import hmac
+from hashlib import sha1
+
+HASH_MAGIC='|1|'
 
 def enforce_state(module, params):
     """
@@ -84,165 +114,296 @@ def enforce_state(module, params):
 
     host = params["name"]
     key = params.get("key",None)
-    port = params.get("port",None)
     #expand the path parameter; otherwise module.add_path_info
     #(called by exit_json) unhelpfully says the unexpanded path is absent.
     path = os.path.expanduser(params.get("path"))
     state = params.get("state")
-    #Find the ssh-keygen binary
-    sshkeygen = module.get_bin_path("ssh-keygen",True)
 
-    #trailing newline in files gets lost, so re-add if necessary
-    if key is not None and key[-1]!='\n':
-        key+='\n'
+    if params.get("hosts"):
+        operations = params["hosts"]
+    else:
+        operations = [dict(name=host,key=key,state=state)]
+
+    known_hosts=KnownHosts(module,path)
+    changed_hosts=[]
+    for op in operations:
+        host=op.get("name",op.get("host"))
+        key=op.get("key",None)
+        state=op.get("state","present")
+        if host is None:
+            module.fail_json(msg="No name specified for entry in hosts")
+        if state not in ("present","absent"):
+            module.fail_json(msg="Invalid state %s for host %s" % (state,host))
+
+        #trailing newline in files gets lost, so re-add if necessary
+        if key is not None and key[-1]!='\n':
+            key+='\n'
+
+        if key is None and state != "absent":
+            module.fail_json(msg="No key specified when adding a host")
+
+        sanity_check(module,host,key)
+
+        current,replace=search_for_host_key(module,host,key,known_hosts)
+
+        #We will change state if current==True & state!="present"
+        #or current==False & state=="present"
+        #i.e (current) XOR (state=="present")
+        #Alternatively, if replace is true (i.e. key present, and we must change it)
+
+        #First, remove an extant entry if required
+        changed=False
+        if replace==True or (current==True and state=="absent"):
+            changed=known_hosts.remove(host)
+        #Next, add a new (or replacing) entry
+        if replace==True or (current==False and state=="present"):
+            changed=known_hosts.add(key,host) or changed
+
+        if changed:
+            changed_hosts.append(host)
+
+    if module.check_mode:
+        module.exit_json(changed = bool(changed_hosts), hosts_changed=changed_hosts)
 
-    if key is None and state != "absent":
-        module.fail_json(msg="No key specified when adding a host")
+    #Now do the work, writing every change at once.
+    if changed_hosts:
+        known_hosts.save()
+        params['changed'] = True
+    params['hosts_changed'] = changed_hosts
 
-    sanity_check(module,host,key,sshkeygen)
+    return params
 
-    current,replace=search_for_host_key(module,host,key,path,sshkeygen)
+def hash_host(salt,host):
+    '''Return the base64 HMAC-SHA1 of host keyed with salt, as used in
+    hashed (|1|salt|hash) known_hosts entries'''
+    return base64.b64encode(hmac.new(salt,host,sha1).digest())
 
-    #We will change state if current==True & state!="present"
-    #or current==False & state=="present"
-    #i.e (current) XOR (state=="present")
-    #Alternatively, if replace is true (i.e. key present, and we must change it)
-    if module.check_mode:
-        module.exit_json(changed = replace or ((state=="present") != current))
+def is_pattern(hosts):
+    '''Does the host field of an unhashed entry need pattern matching?'''
+    return '*' in hosts or '?' in hosts or '!' in hosts
 
-    #Now do the work.
+def host_matches(hosts,host):
+    '''host_matches(hosts,host) -> Boolean
 
-    #First, remove an extant entry if required
-    if replace==True or (current==True and state=="absent"):
-        module.run_command([sshkeygen,'-R',host,'-f',path],
-                           check_rc=True)
-        params['changed'] = True
-    #Next, add a new (or replacing) entry
-    if replace==True or (current==False and state=="present"):
+    Does host match the host field of a known_hosts entry? The field may be
+    hashed, a comma separated list of names, or contain ssh style patterns
+    using *, ? and negation with !.
+    '''
+    host=host.lower()
+    if hosts.startswith(HASH_MAGIC):
+        try:
+            salt,digest=hosts[len(HASH_MAGIC):].split('|',1)
+            return hash_host(base64.b64decode(salt),host)==digest
+        except (ValueError,TypeError):
+            return False
+    matched=False
+    for pattern in hosts.lower().split(','):
+        negate=pattern.startswith('!')
+        if negate:
+            pattern=pattern[1:]
+        regex=re.escape(pattern).replace('\\*','.*').replace('\\?','.')
+        if re.match('^%s$' % regex,host):
+            if negate:
+                return False
+            matched=True
+    return matched
+
+def parse_line(line):
+    '''parse_line(line) -> (marker,hosts,keytype,key) or None
+
+    Splits a known_hosts line into its fields. Comments, blank and malformed
+    lines return None and are left untouched in the file.
+    '''
+    fields=line.split()
+    if not fields or fields[0][0]=='#':
+        return None
+    marker=None
+    #The optional "marker" field, used for @cert-authority or @revoked
+    if fields[0][0]=='@':
+        marker=fields.pop(0)
+    if len(fields)<3:
+        return None
+    return marker,fields[0],fields[1],fields[2]
+
+class KnownHosts(object):
+    '''
+    An in-memory known_hosts file, indexed by host name so that a whole
+    list of changes can be made before writing the file back once.
+
+    Unhashed entries naming plain hosts are found with a dictionary lookup;
+    hashed entries are checked by computing the HMAC-SHA1 of the host with
+    each entry's salt, and pattern entries are matched in turn. The result
+    is cached per host and kept up to date as lines are added and removed.
+    '''
+
+    def __init__(self,module,path):
+        self.module=module
+        self.path=path
+        self.lines=[]
+        self.plain={}
+        self.hashed=[]
+        self.patterns=[]
+        self.found={}
         try:
             inf=open(path,"r")
         except IOError, e:
             if e.errno == errno.ENOENT:
-                inf=None
-            else:
-                module.fail_json(msg="Failed to read %s: %s" % \
-                                     (path,str(e)))
+                return
+            module.fail_json(msg="Failed to read %s: %s" % \
+                                 (path,str(e)))
+        try:
+            for line in inf:
+                self._append(line)
+        finally:
+            inf.close()
+
+    def _append(self,line):
+        if line and line[-1]!='\n':
+            line+='\n'
+        index=len(self.lines)
+        self.lines.append(line)
+        entry=parse_line(line)
+        if entry is None:
+            return
+        marker,hosts,keytype,key=entry
+        for host,found in self.found.items():
+            if host_matches(hosts,host):
+                found[index]=(marker,keytype,key)
+        if hosts.startswith(HASH_MAGIC):
+            self.hashed.append(index)
+        elif is_pattern(hosts):
+            self.patterns.append(index)
+        else:
+            for name in hosts.lower().split(','):
+                self.plain.setdefault(name,[]).append(index)
+
+    def lookup(self,host):
+        '''Return the (marker,keytype,key) of every entry for host, keyed
+        by line index'''
+        host=host.lower()
+        if host in self.found:
+            return self.found[host]
+        indexes=set(self.plain.get(host,[]))
+        for index in self.hashed + self.patterns:
+            line=self.lines[index]
+            if line is not None and host_matches(parse_line(line)[1],host):
+                indexes.add(index)
+        found={}
+        for index in indexes:
+            line=self.lines[index]
+            if line is not None:
+                marker,hosts,keytype,key=parse_line(line)
+                found[index]=(marker,keytype,key)
+        self.found[host]=found
+        return found
+
+    def add(self,key,host):
+        '''Append the lines of key that host has no entry for yet; returns
+        whether any line was added'''
+        existing=set(self.lookup(host).values())
+        added=False
+        for line in key.splitlines():
+            entry=parse_line(line)
+            if entry is not None and (entry[0],entry[2],entry[3]) in existing:
+                continue
+            self._append(line)
+            added=True
+        return added
+
+    def remove(self,host):
+        '''Remove the keys of host; returns whether any line was removed.
+        Like ssh-keygen -R, @cert-authority and @revoked lines are kept, and
+        so are wildcard pattern lines, which may cover other hosts too.'''
+        removed=False
+        for index,(marker,keytype,key) in self.lookup(host).items():
+            if marker is not None or index in self.patterns:
+                continue
+            self.lines[index]=None
+            for found in self.found.values():
+                found.pop(index,None)
+            removed=True
+        return removed
+
+    def save(self):
+        path=self.path
         try:
             outf=tempfile.NamedTemporaryFile(dir=os.path.dirname(path))
-            if inf is not None:
-                for line in inf:
+            for line in self.lines:
+                if line is not None:
                     outf.write(line)
-                inf.close()
-            outf.write(key)
             outf.flush()
-            module.atomic_move(outf.name,path)
+            self.module.atomic_move(outf.name,path)
         except (IOError,OSError),e:
-            module.fail_json(msg="Failed to write to file %s: %s" % \
-                                 (path,str(e)))
+            self.module.fail_json(msg="Failed to write to file %s: %s" % \
+                                      (path,str(e)))
 
         try:
             outf.close()
         except:
             pass
 
-        params['changed'] = True
-
-    return params
-
-def sanity_check(module,host,key,sshkeygen):
+def sanity_check(module,host,key):
     '''Check supplied key is sensible
 
     host and key are parameters provided by the user; If the host
     provided is inconsistent with the key supplied, then this function
     quits, providing an error to the user.
-    sshkeygen is the path to ssh-keygen, found earlier with get_bin_path
     '''
     #If no key supplied, we're doing a removal, and have nothing to check here.
     if key is None:
         return
-    #Rather than parsing the key ourselves, get ssh-keygen to do it
-    #(this is essential for hashed keys, but otherwise useful, as the
-    #key question is whether ssh-keygen thinks the key matches the host).
-
-    #The approach is to write the key to a temporary file,
-    #and then attempt to look up the specified host in that file.
-    try:
-        outf=tempfile.NamedTemporaryFile()
-        outf.write(key)
-        outf.flush()
-    except IOError,e:
-        module.fail_json(msg="Failed to write to temporary file %s: %s" % \
-                             (outf.name,str(e)))
-    rc,stdout,stderr=module.run_command([sshkeygen,'-F',host,
-                                         '-f',outf.name],
-                                        check_rc=True)
-    try:
-        outf.close()
-    except:
-        pass
-
-    if stdout=='': #host not found
-        module.fail_json(msg="Host parameter does not match hashed host field in supplied key")
-
-def search_for_host_key(module,host,key,path,sshkeygen):
-    '''search_for_host_key(module,host,key,path,sshkeygen) -> (current,replace)
-
-    Looks up host in the known_hosts file path; if it's there, looks to see
+    #The key question is whether the host field of the key matches the host,
+    #hashing the host for hashed keys.
+    for line in key.splitlines():
+        entry=parse_line(line)
+        if entry is not None and host_matches(entry[1],host):
+            return
+
+    module.fail_json(msg="Host parameter does not match hashed host field in supplied key")
+
+def search_for_host_key(module,host,key,known_hosts):
+    '''search_for_host_key(module,host,key,known_hosts) -> (current,replace)
+
+    Looks up host in the loaded known_hosts file; if it's there, looks to see
     if one of those entries matches key. Returns:
     current (Boolean): is host found in path?
     replace (Boolean): is the key in path different to that supplied by user?
     if current=False, then replace is always False.
-    sshkeygen is the path to ssh-keygen, found earlier with get_bin_path
     '''
-    replace=False
-    if os.path.exists(path)==False:
-        return False, False
-    #openssh >=6.4 has changed ssh-keygen behaviour such that it returns
-    #1 if no host is found, whereas previously it returned 0
-    rc,stdout,stderr=module.run_command([sshkeygen,'-F',host,'-f',path],
-                                 check_rc=False)
-    if stdout=='' and stderr=='' and (rc==0 or rc==1):
-        return False, False #host not found, no other errors
-    if rc!=0: #something went wrong
-        module.fail_json(msg="ssh-keygen failed (rc=%d,stdout='%s',stderr='%s')" % (rc,stdout,stderr))
+    found=known_hosts.lookup(host)
+    if not found:
+        return False, False #host not found
 
 #If user supplied no key, we don't want to try and replace anything with it
     if key is None:
         return True, False
 
-    lines=stdout.split('\n')
-    k=key.strip() #trim trailing newline
-    #ssh-keygen returns only the host we ask about in the host field,
-    #even if the key entry has multiple hosts. Emulate this behaviour here,
-    #otherwise we get false negatives.
-    #Only necessary for unhashed entries.
-    if k[0] !='|':
-        k=k.split()
-        #The optional "marker" field, used for @cert-authority or @revoked
-        if k[0][0] == '@':
-            k[1]=host
-        else:
-            k[0]=host
-        k=' '.join(k)
-    for l in lines:
-        if l=='': 
-            continue
-        if l[0]=='#': #comment
+    #Entries match on their marker, type and key, whatever hosts they
+    #list and whether or not they are hashed, so a plain key never matches
+    #(and never replaces) a @cert-authority or @revoked line.
+    existing=set(found.values())
+    for line in key.splitlines():
+        entry=parse_line(line)
+        if entry is None:
             continue
-        if k==l: #found a match
-            return True, False #current, not-replace
-    #No match found, return current and replace
-    return True, True
+        marker,hosts,keytype,k=entry
+        if (marker,keytype,k) not in existing:
+            #No match found, return current and replace
+            return True, True
+    return True, False #current, not-replace
 
 def main():
 
     module = AnsibleModule(
         argument_spec = dict(
-            name      = dict(required=True,  type='str', aliases=['host']),
+            name      = dict(required=False, type='str', aliases=['host']),
             key       = dict(required=False,  type='str'),
             path      = dict(default="~/.ssh/known_hosts", type='str'),
             state     = dict(default='present', choices=['absent','present']),
+            hosts     = dict(required=False, type='list'),
             ),
+        required_one_of = [['name','hosts']],
+        mutually_exclusive = [['name','hosts'],['key','hosts']],
         supports_check_mode = True
         )
 